@@ -1,20 +1,11 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 import os
+import re
 import sys
 import locale
 from typing import cast
 
-# Configurar locale para português brasileiro
-try:
-    locale.setlocale(locale.LC_ALL, 'pt_BR.utf8')
-except locale.Error:
-    try:
-        locale.setlocale(locale.LC_ALL, 'Portuguese_Brazil.1252')
-    except locale.Error:
-        st.warning("Não foi possível configurar o locale para português brasileiro. Usando o padrão do sistema.")
-
 # Configurações do Streamlit
 st.set_page_config(
     page_title="SITAI - Sistema de Catalogação",
@@ -26,24 +17,99 @@ st.set_page_config(
 # Adiciona o diretório atual ao sys.path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Verifica se os módulos estão disponíveis no caminho diretamente ou na pasta sitai
+# As páginas usam o módulo database da raiz do projeto; o antigo sitai/database.py
+# não possui as funções de paginação, alteração em lote e exportação
 try:
     from sitai.models import ExcavationPoint
     import database as db
-except ModuleNotFoundError:
+except ModuleNotFoundError as e:
+    st.error(
+        f"Não foi possível importar o módulo '{e.name}'. Execute o aplicativo a partir da raiz "
+        "do projeto, onde ficam database.py e a pasta sitai."
+    )
+    st.stop()
+
+# Largura, em pixels, do logotipo exibido no cabeçalho
+LOGO_WIDTH = 120
+# Marcas dos termos encontrados no trecho; a tabela de resultados não
+# interpreta Markdown, então o negrito padrão apareceria como asteriscos
+SNIPPET_MARKERS = ("«", "»")
+
+
+def _configure_locale():
+    """Configura o locale para português brasileiro; retorna False se não for possível."""
+    for name in ('pt_BR.utf8', 'Portuguese_Brazil.1252'):
+        try:
+            locale.setlocale(locale.LC_ALL, name)
+            return True
+        except locale.Error:
+            continue
+    return False
+
+
+def _read_logo():
+    """Lê a imagem do logotipo, distribuída junto com o pacote sitai."""
     try:
-        from sitai.models import ExcavationPoint
-        import sitai.database as db
-    except ModuleNotFoundError:
-        st.error("Não foi possível importar os módulos necessários. Verifique a estrutura do projeto.")
-        st.stop()
+        from importlib.resources import files
+        logo = files("sitai") / "images" / "arqueologo.png"
+        if logo.is_file():
+            return logo.read_bytes()
+    except (ImportError, OSError):
+        pass
+    # Execução a partir do diretório do projeto, sem o pacote instalado
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sitai", "images", "arqueologo.png")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+    return None
+
+
+def _load_logo(width=LOGO_WIDTH * 2):
+    """
+    Carrega o logotipo já reduzido para o tamanho exibido.
+
+    O arquivo original é muito maior que os 120 pixels usados na página;
+    reduzi-lo uma única vez evita que cada interação processe e envie ao
+    navegador a imagem inteira. A largura padrão é o dobro da exibida, para
+    telas de alta densidade.
+    """
+    data = _read_logo()
+    if data is None:
+        return None
+    try:
+        import io
+        from PIL import Image
+    except ImportError:
+        return data
+    image = Image.open(io.BytesIO(data))
+    image.thumbnail((width, width * 4))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+@st.cache_resource(show_spinner=False)
+def initialize_app():
+    """
+    Inicialização feita uma única vez por processo, e não a cada interação.
+
+    Configura o locale, inicializa o banco de dados e carrega o logotipo.
+    Retorna um dicionário com o resultado da configuração do locale e os
+    bytes do logotipo (None se não encontrado).
+    """
+    locale_ok = _configure_locale()
+    db.init_db()
+    return {"locale_ok": locale_ok, "logo": _load_logo()}
 
-# Inicializa o banco de dados
-db.init_db()
 
 # Configuração para formato de data brasileiro
 DATE_FORMAT = "DD/MM/YYYY"
 
+# Quantidade de pontos exibidos por página nas tabelas
+PAGE_SIZE = 50
+# Colunas exibidas nas listagens; os demais campos aparecem nos detalhes do ponto
+LIST_COLUMNS = ["id", "point_type", "latitude", "longitude", "altitude", "discovery_date", "responsible"]
+
 # Função auxiliar para formatação de data
 
 
@@ -53,7 +119,182 @@ def format_date(date_obj):
     return ""
 
 
+def _go_to_page(key, cursor):
+    """Guarda na sessão a posição da página a ser exibida na próxima execução."""
+    st.session_state[f"{key}_cursor"] = cursor
+
+
+# Limite de IDs de uma operação em lote digitada como intervalo
+MAX_BULK_IDS = 10000
+# Campos que podem ser alterados em lote: rótulo exibido -> nome do campo
+BULK_FIELDS = {
+    "Responsável": "responsible",
+    "Tipo de Ponto": "point_type",
+    "Sistema de Referência": "srid",
+    "Data da descoberta": "discovery_date",
+}
+
+
+def parse_id_list(text):
+    """
+    Converte uma lista de IDs digitada, como "1-200, 250 260", em inteiros.
+
+    Intervalos são inclusivos; IDs repetidos aparecem uma única vez. Lança
+    ValueError se algum trecho não for um número ou intervalo válido.
+    """
+    ids = []
+    for part in re.split(r"[\s,;]+", re.sub(r"\s*-\s*", "-", text.strip())):
+        if not part:
+            continue
+        start, sep, end = part.partition("-")
+        if not start.isdigit() or (sep and not end.isdigit()):
+            raise ValueError(f"trecho inválido '{part}'")
+        if sep:
+            first, last = int(start), int(end)
+            if last < first:
+                raise ValueError(f"intervalo invertido '{part}'")
+            ids.extend(range(first, last + 1))
+        else:
+            ids.append(int(part))
+        if len(ids) > MAX_BULK_IDS:
+            raise ValueError(f"informe no máximo {MAX_BULK_IDS} IDs por operação")
+    return list(dict.fromkeys(ids))
+
+
+def select_point_ids(key, page):
+    """
+    Permite escolher vários pontos: os da página exibida e/ou uma lista de IDs.
+
+    Retorna os IDs escolhidos, sem repetições.
+    """
+    chosen = st.multiselect("Pontos da página exibida", page.data["id"].tolist(), key=f"{key}_chosen")
+    typed = st.text_input("Outros IDs ou intervalos (ex.: 10-250, 300)", key=f"{key}_typed")
+    try:
+        typed_ids = parse_id_list(typed)
+    except ValueError as e:
+        st.error(f"Lista de IDs inválida: {e}")
+        typed_ids = []
+    return list(dict.fromkeys(chosen + typed_ids))
+
+
+def bulk_update_points(page):
+    """Alteração de um campo em vários pontos, em uma única operação."""
+    if "bulk_update_result" in st.session_state:
+        st.success(f"✅ {st.session_state.pop('bulk_update_result')} ponto(s) alterado(s) em lote.")
+
+    with st.expander("✏️ Alterar vários pontos de uma vez"):
+        mode = st.radio("Selecionar pontos por", ["IDs", "Responsável atual"], horizontal=True, key="bulk_update_mode")
+        if mode == "IDs":
+            ids = select_point_ids("bulk_update", page)
+            criteria = {"id": ids} if ids else None
+        else:
+            current = st.text_input("Responsável atual (como está cadastrado)", key="bulk_update_responsible").strip()
+            criteria = {"responsible": current} if current else None
+
+        label = st.selectbox("Campo a alterar", list(BULK_FIELDS), key="bulk_update_field")
+        field = BULK_FIELDS[label]
+        if field == "discovery_date":
+            new_date = st.date_input("Nova data", format="DD/MM/YYYY", key="bulk_update_date")
+            value = datetime.combine(new_date, datetime.min.time())
+        else:
+            value = st.text_input("Novo valor", key="bulk_update_value").strip()
+
+        if st.button("Aplicar alteração", key="bulk_update_apply", disabled=not criteria or value == ""):
+            try:
+                count = db.update_points_where(criteria, {field: value})
+            except ValueError as e:
+                st.error(f"❌ Alteração não aplicada: {e}")
+            else:
+                st.session_state.bulk_update_result = count
+                st.rerun()
+
+
+def bulk_delete_points(page):
+    """Remoção de vários pontos, em uma única operação."""
+    if "bulk_delete_result" in st.session_state:
+        st.success(f"✅ {st.session_state.pop('bulk_delete_result')} ponto(s) removido(s) em lote.")
+
+    with st.expander("🗑️ Remover vários pontos de uma vez"):
+        ids = select_point_ids("bulk_delete", page)
+        if not ids:
+            return
+
+        points = db.get_points_by_ids(ids)
+        st.write(f"{len(points)} ponto(s) encontrado(s) entre os {len(ids)} ID(s) informados.")
+        if not points:
+            return
+        st.dataframe([
+            {"id": p.id, "point_type": p.point_type, "responsible": p.responsible,
+             "discovery_date": format_date(p.discovery_date)}
+            for p in points
+        ])
+
+        confirmed = st.checkbox("Confirmo a remoção permanente dos pontos listados", key="bulk_delete_confirm")
+        if st.button("🗑️ Remover pontos selecionados", key="bulk_delete_apply", disabled=not confirmed):
+            st.session_state.bulk_delete_result = db.delete_points([p.id for p in points])
+            for name in ("bulk_delete_chosen", "bulk_delete_typed", "bulk_delete_confirm"):
+                st.session_state.pop(name, None)
+            st.rerun()
+
+
+def render_points_table(data):
+    """Exibe uma página de pontos (DataFrame de get_points_page) com as datas formatadas."""
+    df = data.copy()
+    # A data já vem do banco como datetime64; basta formatá-la
+    df['discovery_date'] = df['discovery_date'].dt.strftime('%d/%m/%Y')
+    st.dataframe(df)
+
+
+def show_points_page(key, order_by="id", descending=False):
+    """
+    Exibe uma página da tabela de pontos com navegação anterior/próxima.
+
+    Apenas as linhas da página visível são buscadas no banco de dados.
+    Retorna a página exibida.
+    """
+    order = (order_by, descending)
+    cursor = st.session_state.get(f"{key}_cursor", {})
+    if cursor.get("order") != order:
+        # A ordenação mudou: as chaves guardadas não valem mais
+        cursor = {}
+
+    page = db.get_points_page(
+        after_key=cursor.get("after"),
+        before_key=cursor.get("before"),
+        limit=PAGE_SIZE,
+        order_by=order_by,
+        descending=descending,
+        columns=LIST_COLUMNS
+    )
+
+    if page.data.empty and cursor:
+        # A página ficou vazia (por exemplo, após exclusões): volta ao início
+        st.session_state.pop(f"{key}_cursor", None)
+        page = db.get_points_page(limit=PAGE_SIZE, order_by=order_by, descending=descending, columns=LIST_COLUMNS)
+
+    if page.data.empty:
+        return page
+
+    render_points_table(page.data)
+
+    col_prev, col_info, col_next = st.columns([1, 3, 1])
+    with col_prev:
+        st.button("◀ Anterior", key=f"{key}_prev", disabled=not page.has_previous,
+                  on_click=_go_to_page, args=(key, {"before": page.first_key, "order": order}))
+    with col_info:
+        st.caption(f"Exibindo {len(page.data)} de {page.total} pontos")
+    with col_next:
+        st.button("Próxima ▶", key=f"{key}_next", disabled=not page.has_next,
+                  on_click=_go_to_page, args=(key, {"after": page.last_key, "order": order}))
+
+    return page
+
+
 def main():
+    resources = initialize_app()
+    if not resources["locale_ok"]:
+        st.warning("Não foi possível configurar o locale para português brasileiro. Usando o padrão do sistema.")
+
     # Layout com logo no canto superior direito
     col1, col2 = st.columns([4, 1])
 
@@ -61,37 +302,17 @@ def main():
         st.title("SITAI - Sistema de Catalogação de Escavações Arqueológicas")
 
     with col2:
-        # Tenta localizar a imagem em diferentes caminhos relativos
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        possible_paths = [
-            os.path.join(current_dir, "arqueologo.png"),  # No mesmo diretório do script
-            os.path.join(current_dir, "images", "arqueologo.png"),  # Em um subdiretório /images
-            os.path.join(os.path.dirname(current_dir), "images", "arqueologo.png"),  # Um nível acima em /images
-            "arqueologo.png",  # No diretório de trabalho atual
-            os.path.join("images", "arqueologo.png"),  # Diretamente no subdiretório /images
-            os.path.join("sitai", "images", "arqueologo.png")  # Em sitai/images
-        ]
-
-        # Tenta cada possível caminho
-        logo_path = None
-        for path in possible_paths:
-            if os.path.exists(path):
-                logo_path = path
-                break
-
-        # Exibe a imagem se encontrada
-        if logo_path:
-            st.image(logo_path, width=120)
+        if resources["logo"] is not None:
+            st.image(resources["logo"], width=LOGO_WIDTH)
         else:
-            st.warning("Imagem não encontrada. Por favor, verifique se arqueologo.png está no diretório atual ou na pasta 'images'.")
-            st.info("Caminhos pesquisados: " + ", ".join(possible_paths))
+            st.warning("Imagem não encontrada. Verifique se sitai/images/arqueologo.png está presente.")
 
     st.sidebar.title("Navegação")
 
     # Menu de navegação
     menu = st.sidebar.radio(
         "Escolha uma opção:",
-        ["Listar Pontos", "Cadastrar Novo Ponto", "Atualizar Ponto", "Remover Ponto", "Pesquisar"]
+        ["Listar Pontos", "Cadastrar Novo Ponto", "Atualizar Ponto", "Remover Ponto", "Pesquisar", "Exportar Dados"]
     )
 
     if menu == "Listar Pontos":
@@ -104,6 +325,8 @@ def main():
         delete_point()
     elif menu == "Pesquisar":
         search_points()
+    elif menu == "Exportar Dados":
+        export_data()
 
     st.sidebar.markdown("---")
     st.sidebar.info("Desenvolvido para o Grupo de Pesquisa Arqueológica da Amazônia")
@@ -122,10 +345,14 @@ def list_points():
     """)
 
     # Opções de ordenação
-    sort_options = st.selectbox(
-        "Ordenar por:",
-        ["ID", "Tipo de Ponto", "Data de Descoberta", "Responsável"]
-    )
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        sort_options = st.selectbox(
+            "Ordenar por:",
+            ["ID", "Tipo de Ponto", "Data de Descoberta", "Responsável"]
+        )
+    with col2:
+        descending = st.checkbox("Ordem decrescente", key="list_descending")
 
     # Mapeamento de opções para colunas do DataFrame
     sort_mapping = {
@@ -135,19 +362,10 @@ def list_points():
         "Responsável": "responsible"
     }
 
-    # Busca todos os pontos
-    df = db.get_all_points()
-
-    if not df.empty:
-        # Ordena o DataFrame
-        df = df.sort_values(by=sort_mapping[sort_options])
-
-        # Formata a data para exibição
-        df['discovery_date'] = pd.to_datetime(df['discovery_date']).dt.strftime('%d/%m/%Y')
-
-        # Exibe a tabela
-        st.dataframe(df)
+    # Busca e exibe apenas a página visível, já ordenada pelo banco
+    page = show_points_page("list", order_by=sort_mapping[sort_options], descending=descending)
 
+    if not page.data.empty:
         # Exibe detalhes de um ponto específico
         point_id = st.number_input("ID do ponto para ver detalhes:", min_value=1, step=1)
         if st.button("Ver Detalhes"):
@@ -269,7 +487,8 @@ def update_point():
     3. Faça as **alterações necessárias** nos campos
     4. Clique em **Atualizar Ponto** para salvar as modificações
     
-    Todos os campos marcados com * são obrigatórios.
+    Todos os campos marcados com * são obrigatórios. Para corrigir muitos pontos de
+    uma vez, use **Alterar vários pontos de uma vez**.
     """)
 
     # Exibe mensagem de sucesso se atualização anterior foi bem-sucedida
@@ -287,15 +506,14 @@ def update_point():
         if 'updated_responsible' in st.session_state:
             del st.session_state.updated_responsible
 
-    # Lista os pontos para seleção
-    df = db.get_all_points()
+    # Lista os pontos para seleção (uma página por vez)
+    page = show_points_page("update")
 
-    if df.empty:
+    if page.data.empty:
         st.info("Nenhum ponto cadastrado para atualizar.")
         return
 
-    # Exibe a tabela para visualização
-    st.dataframe(df)
+    bulk_update_points(page)
 
     # Formulário de atualização
     point_id = st.number_input("ID do ponto a ser atualizado:", min_value=1, step=1)
@@ -390,11 +608,18 @@ def update_point():
                         description=description,
                         discovery_date=datetime.combine(actual_date, datetime.min.time()),
                         responsible=responsible,
-                        srid=srid
+                        srid=srid,
+                        version=point.version
                     )
 
-                    # Atualiza no banco de dados
-                    success = db.update_point(updated_point)
+                    # Atualiza no banco de dados; a versão lida impede que a
+                    # alteração de outra pessoa seja sobrescrita sem aviso
+                    try:
+                        success = db.update_point(updated_point)
+                    except db.VersionConflictError:
+                        st.error("⚠️ Este ponto foi alterado por outra pessoa depois que você carregou os dados. "
+                                 "Clique em **Carregar Dados** para ver a versão atual e refaça as alterações.")
+                        return
 
                     if success:
                         # Armazena informações sobre a atualização bem-sucedida na sessão
@@ -405,12 +630,6 @@ def update_point():
                         # Limpa a sessão do ponto atual
                         del st.session_state.current_point
 
-                        # Exibe um spinner para indicar que a atualização está sendo processada
-                        with st.spinner("Atualizando dados..."):
-                            # Pequena pausa para garantir que o usuário veja o spinner
-                            import time
-                            time.sleep(0.5)
-
                         # Recarrega a página para atualizar os dados e mostrar a mensagem de sucesso
                         st.rerun()
                     else:
@@ -428,20 +647,21 @@ def delete_point():
     2. Clique em **Buscar** para localizar o ponto
     3. Confira os dados para **garantir que é o ponto correto**
     4. Use o botão **Confirmar Exclusão** para remover permanentemente
+
+    Para remover muitos pontos de uma vez, use **Remover vários pontos de uma vez**.
     
     ⚠️ **Atenção**: Esta ação é irreversível! Os dados removidos não poderão ser recuperados.
     """)
 
-    # Lista os pontos para seleção
-    df = db.get_all_points()
+    # Lista os pontos para seleção (uma página por vez)
+    st.write("### Pontos disponíveis para exclusão")
+    page = show_points_page("delete")
 
-    if df.empty:
+    if page.data.empty:
         st.info("Nenhum ponto cadastrado para remover.")
         return
 
-    # Exibe a tabela para visualização
-    st.write("### Pontos disponíveis para exclusão")
-    st.dataframe(df)
+    bulk_delete_points(page)
 
     # Interface de exclusão simplificada
     col1, col2 = st.columns([3, 1])
@@ -485,28 +705,26 @@ def delete_point():
                     with st.spinner("Excluindo ponto..."):
                         # Tenta excluir o ponto
                         if point and point.id:
-                            success = db.delete_point(point.id)
+                            try:
+                                success = db.delete_point(point.id, expected_version=point.version)
+                            except db.VersionConflictError:
+                                st.error("⚠️ Este ponto foi alterado por outra pessoa. Confira os dados atualizados "
+                                         "acima antes de confirmar a exclusão.")
+                                return
 
                             if success:
                                 # Limpa o ponto selecionado
                                 del st.session_state.selected_point_id
                                 st.success(f"✅ Ponto ID: {point.id} foi removido com sucesso!")
+                                st.info("📊 A base de dados foi atualizada.")
 
-                                # Verifica se o ponto realmente sumiu
-                                if point.id:
-                                    check_point = db.get_point_by_id(point.id)
-                                    if check_point:
-                                        st.error("⚠️ Erro: O ponto ainda existe na base de dados após a exclusão.")
-                                    else:
-                                        st.info("📊 A base de dados foi atualizada.")
-
-                                        # Atualiza a lista de pontos
-                                        new_df = db.get_all_points()
-                                        if not new_df.empty:
-                                            st.write("### Lista atualizada de pontos")
-                                            st.dataframe(new_df)
-                                        else:
-                                            st.info("Não há mais pontos cadastrados.")
+                                # Atualiza a lista de pontos (primeira página)
+                                new_page = db.get_points_page(limit=PAGE_SIZE, columns=LIST_COLUMNS)
+                                if not new_page.data.empty:
+                                    st.write("### Lista atualizada de pontos")
+                                    render_points_table(new_page.data)
+                                else:
+                                    st.info("Não há mais pontos cadastrados.")
 
                                 # Opção para retornar
                                 if st.button("↩️ Voltar"):
@@ -532,8 +750,12 @@ def search_points():
     
     - Deixe o campo de pesquisa **vazio** para listar todos os pontos
     - Use o menu **Pesquisar em campo específico** para refinar sua busca
-    - A pesquisa funciona com **partes de palavras** e não diferencia maiúsculas/minúsculas
-    - Você pode **ordenar os resultados** usando diferentes critérios
+    - A pesquisa encontra palavras pelo **início** ("cer" encontra "cerâmica") e ignora acentos e maiúsculas/minúsculas
+    - Marque **Buscar trechos no meio das palavras** para encontrar, por exemplo, "mica" em "cerâmica" (mais lento)
+    - Na coluna **Trecho encontrado**, os termos aparecem entre «»
+    - Com vários termos, são exibidos os pontos que contêm **todos** eles; use aspas para buscar uma expressão exata
+    - Ordene por **Relevância** para ver primeiro os pontos que melhor correspondem ao termo
+    - Use o **filtro por área** para limitar os resultados a um retângulo de coordenadas
     """)
 
     search_term = st.text_input("Termo de pesquisa:")
@@ -548,8 +770,25 @@ def search_points():
     with col2:
         sort_by = st.selectbox(
             "Ordenar resultados por:",
-            ["ID", "Tipo de Ponto", "Data de Descoberta"]
+            ["Relevância", "ID", "Tipo de Ponto", "Data de Descoberta", "Responsável"]
         )
+        descending = st.checkbox("Ordem decrescente", key="search_descending")
+        substring = st.checkbox("Buscar trechos no meio das palavras", key="search_substring")
+
+    # Filtro espacial: limites do retângulo em graus decimais (WGS84)
+    with st.expander("Filtrar por área"):
+        use_bbox = st.checkbox("Limitar resultados a uma área", key="search_use_bbox")
+        col1, col2 = st.columns(2)
+        with col1:
+            min_lat = st.number_input("Latitude mínima (sul)", value=-10.0, format="%.6f",
+                                      min_value=-90.0, max_value=90.0, key="search_min_lat")
+            min_lon = st.number_input("Longitude mínima (oeste)", value=-75.0, format="%.6f",
+                                      min_value=-180.0, max_value=180.0, key="search_min_lon")
+        with col2:
+            max_lat = st.number_input("Latitude máxima (norte)", value=5.0, format="%.6f",
+                                      min_value=-90.0, max_value=90.0, key="search_max_lat")
+            max_lon = st.number_input("Longitude máxima (leste)", value=-45.0, format="%.6f",
+                                      min_value=-180.0, max_value=180.0, key="search_max_lon")
 
     if st.button("Pesquisar"):
         field = None
@@ -561,24 +800,45 @@ def search_points():
             }
             field = field_mapping[search_field]
 
+        # Ordenação feita pelo banco, sobre a data em formato ISO (antes da formatação)
+        sort_mapping = {
+            "ID": "id",
+            "Tipo de Ponto": "point_type",
+            "Data de Descoberta": "discovery_date",
+            "Responsável": "responsible"
+        }
+        # Sem ordenação explícita, os resultados vêm ordenados por relevância
+        sort = None
+        if sort_by in sort_mapping:
+            sort = [(sort_mapping[sort_by], "DESC" if descending else "ASC")]
+
         # Se field for None, a função search_points deve lidar com isso internamente
         # convertendo-o para uma string vazia ou tratando None de forma adequada
-        results = db.search_points(search_term, field if field is not None else "")
+        bbox = None
+        if use_bbox:
+            if min_lat > max_lat or min_lon > max_lon:
+                st.error("Os limites mínimos da área devem ser menores ou iguais aos máximos.")
+                return
+            bbox = (min_lat, min_lon, max_lat, max_lon)
+
+        results = db.search_points(
+            search_term, field if field is not None else "", sort=sort, highlight=True, bbox=bbox,
+            markers=SNIPPET_MARKERS, substring=substring
+        )
 
         if results:
+            import pandas as pd
+
             # Converte para DataFrame para facilitar a exibição
             df = pd.DataFrame(results)
 
             # Formata a data para exibição
             df['discovery_date'] = pd.to_datetime(df['discovery_date']).dt.strftime('%d/%m/%Y')
 
-            # Ordenação
-            sort_mapping = {
-                "ID": "id",
-                "Tipo de Ponto": "point_type",
-                "Data de Descoberta": "discovery_date"
-            }
-            df = df.sort_values(by=sort_mapping[sort_by])
+            # Trecho com os termos encontrados em destaque, quando disponível
+            if 'snippet' in df.columns:
+                df = df[['snippet'] + [c for c in df.columns if c != 'snippet']]
+                df = df.rename(columns={'snippet': 'Trecho encontrado'})
 
             st.subheader(f"Resultados encontrados: {len(results)}")
             st.dataframe(df)
@@ -586,5 +846,48 @@ def search_points():
             st.info("Nenhum resultado encontrado para a pesquisa.")
 
 
+def export_data():
+    from sitai.exporter import export_info
+
+    st.header("Exportar Pontos de Escavação")
+
+    # Box explicativa com instruções
+    st.info("""
+    ### 📤 Exportação de dados
+    
+    - **CSV** abre em planilhas como Excel ou LibreOffice
+    - **GeoJSON** abre em softwares de SIG como QGIS
+    - O arquivo é gerado em disco aos poucos, mas o botão de download o envia
+      a partir da memória do servidor; para catálogos grandes, use
+      `sitai export --format csv --output pontos.csv` na linha de comando
+    """)
+
+    fmt = st.radio("Formato:", ["CSV", "GeoJSON"], horizontal=True).lower()
+    info = export_info(fmt)
+
+    if st.button("Gerar Arquivo"):
+        import tempfile
+
+        fd, path = tempfile.mkstemp(prefix="sitai_export_", suffix=f".{info['extension']}")
+        os.close(fd)
+        try:
+            with st.spinner("Gerando arquivo..."):
+                db.export_points(path, fmt=fmt)
+
+            size_kb = os.path.getsize(path) / 1024
+            st.success(f"Arquivo pronto ({size_kb:,.1f} KB)")
+            # O Streamlit lê o arquivo inteiro para servir o download; depois
+            # disso o arquivo temporário não é mais necessário
+            with open(path, "rb") as f:
+                st.download_button(
+                    "⬇️ Baixar Arquivo",
+                    data=f,
+                    file_name=f"pontos_escavacao_{datetime.now().strftime('%Y%m%d_%H%M')}.{info['extension']}",
+                    mime=info["mime"]
+                )
+        finally:
+            os.remove(path)
+
+
 if __name__ == "__main__":
     main()
@@ -8,10 +8,16 @@ CRUD (Create, Read, Update, Delete) e funções de busca.
 
 import sqlite3
 import os
-import pandas as pd
+import json
+import atexit
+import functools
 from datetime import datetime
 import logging
-from typing import Optional, List, Dict, Any, Union, TYPE_CHECKING
+from dataclasses import dataclass, field as dataclass_field
+from concurrent.futures import Future
+from itertools import islice
+from typing import Optional, List, Dict, Any, Union, Iterable, Iterator, Sequence, Tuple, ContextManager, TYPE_CHECKING
+from urllib.request import pathname2url
 
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
@@ -20,11 +26,83 @@ logger = logging.getLogger(__name__)
 # Constantes
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
 DB_PATH = os.path.join(DATA_DIR, 'database.db')
+SLOW_QUERY_LOG_PATH = os.path.join(DATA_DIR, 'slow_queries.log')
 TABLE_NAME = "excavation_points"
+POINT_COLUMNS = ["id", "point_type", "latitude", "longitude", "altitude", "description", "discovery_date", "responsible", "srid"]
+# Versão da linha, incrementada a cada alteração (controle de concorrência otimista)
+VERSION_COLUMN = "version"
+DEFAULT_CHUNK_SIZE = 1000
+# Linhas por executemany na carga rápida (load_point_rows)
+LOAD_CHUNK_SIZE = 10000
+DEFAULT_PAGE_SIZE = 50
+# Raio inicial (metros) da busca dos vizinhos mais próximos, dobrado a cada rodada
+NEAREST_INITIAL_RADIUS_M = 500.0
+# UPDATE ... RETURNING existe a partir do SQLite 3.35; em versões anteriores a
+# nova versão da linha é lida por um SELECT na mesma transação
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+# Marcas dos termos destacados nos trechos da pesquisa (negrito em Markdown)
+HIGHLIGHT_MARKERS = ("**", "**")
+
+# Colunas textuais com poucos valores distintos, carregadas como categorias
+CATEGORICAL_COLUMNS = ["point_type", "responsible", "srid"]
+# Tolerância para guardar coordenadas (graus) e altitude (metros) em float32
+FLOAT32_TOLERANCE = {"latitude": 1e-6, "longitude": 1e-6, "altitude": 1e-3}
+
+# Colunas que podem ser usadas para ordenar consultas; todas possuem índice
+SORTABLE_COLUMNS = ["id", "point_type", "discovery_date", "responsible"]
+
+# Especificação de ordenação: "coluna", "-coluna", "coluna DESC", "a, -b"
+# ou uma sequência de strings e/ou tuplas (coluna, "ASC"/"DESC")
+SortSpec = Union[str, Sequence[Union[str, Tuple[str, Any]]]]
+
+INSERT_SQL = f'''
+    INSERT INTO {TABLE_NAME} 
+    (point_type, latitude, longitude, altitude, description, discovery_date, responsible, srid)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    '''
 
 # Definição de classe fallback para quando ExcavationPoint não puder ser importado
 
 
+class BulkInsertError(Exception):
+    """Erro em uma inserção em lote, com os IDs que já haviam sido confirmados."""
+
+    def __init__(self, message: str, inserted_ids: List[int]):
+        super().__init__(message)
+        self.inserted_ids = inserted_ids
+
+
+class VersionConflictError(Exception):
+    """Alteração recusada porque o ponto foi modificado por outra pessoa desde a leitura."""
+
+    def __init__(self, point_id: int, expected_version: int, current_version: int):
+        super().__init__(
+            f"O ponto {point_id} foi alterado por outra pessoa "
+            f"(versão lida: {expected_version}, versão atual: {current_version})"
+        )
+        self.point_id = point_id
+        self.expected_version = expected_version
+        self.current_version = current_version
+
+
+@dataclass
+class PointsPage:
+    """
+    Página de pontos obtida por paginação por chave (keyset).
+
+    `first_key` e `last_key` são as chaves de ordenação da primeira e da última
+    linha da página, usadas como `before_key` e `after_key` para navegar para a
+    página anterior e para a próxima.
+    """
+    data: "pd.DataFrame"
+    first_key: Optional[tuple] = None
+    last_key: Optional[tuple] = None
+    has_next: bool = False
+    has_previous: bool = False
+    total: int = 0
+    sort: List[Tuple[str, bool]] = dataclass_field(default_factory=lambda: [("id", False)])
+
+
 class ExcavationPointFallback:
     """Classe de fallback para quando ExcavationPoint não puder ser importado."""
     id: Optional[int] = None
@@ -36,6 +114,7 @@ class ExcavationPointFallback:
     discovery_date: datetime = datetime.now()
     responsible: str = ""
     srid: str = ""
+    version: Optional[int] = None
 
     def __init__(self, **kwargs):
         for key, value in kwargs.items():
@@ -44,20 +123,152 @@ class ExcavationPointFallback:
 
 # Tenta importar o modelo de diferentes locais
 try:
-    from sitai.models import ExcavationPoint
+    from sitai.models import ExcavationPoint, row_mapper, validate_changes, validate_points
 except ImportError:
     logger.error("Não foi possível importar o modelo ExcavationPoint")
     # Definindo uma classe substituta para evitar erros de execução
     ExcavationPoint = ExcavationPointFallback
     logger.warning("Usando classe de fallback para ExcavationPoint")
 
-# Para uso em anotações de tipo
+    def row_mapper(columns: Sequence[str]) -> Any:
+        return lambda rows: [ExcavationPoint(**dict(zip(columns, row))) for row in rows]
+
+    def validate_points(items: Sequence[Any]) -> List[Any]:
+        return [p if isinstance(p, ExcavationPoint) else ExcavationPoint(**p) for p in items]
+
+    def validate_changes(changes: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(changes)
+
+from sitai.aio import DEFAULT_MAX_PENDING, DEFAULT_WORKERS, AsyncExecutor, ExecutorClosedError
+from sitai.connection import ConnectionManager, PoolStats
+from sitai.metrics import MetricsRegistry, no_rows
+from sitai.slowlog import DEFAULT_THRESHOLD_MS as DEFAULT_SLOW_QUERY_MS, SlowQueryTracer
+from sitai.cache import CacheStats, ResultCache
+from sitai.storage import StorageProfile, checkpoint, retry_on_busy
+from sitai.writer import DEFAULT_MAX_BATCH, DEFAULT_WINDOW_MS, GroupCommitWriter, WriterStats
+from sitai.migrations import BatchStep, Migration, MigrationRunner, get_schema_version
+from sitai.search import (
+    FTS_COLUMNS, backfill_sql, build_match_query, create_search_index, fts_table, search_index_exists
+)
+from sitai.spatial import (
+    BoundingBox, bbox_condition, create_spatial_index, haversine_distances, radius_bbox,
+    rtree_table, spatial_backfill_sql, spatial_index_exists, validate_bbox
+)
+
+# Para uso em anotações de tipo; o pandas e o NumPy (e, com ele, o
+# armazenamento colunar) só são importados pelas funções que os usam, para
+# não pesar na inicialização da linha de comando
 if TYPE_CHECKING:
     from typing import Type
+    import numpy as np
+    import pandas as pd
+    from sitai.columnar import PointStore, RefreshResult
     EP = ExcavationPoint
 else:
     EP = Any
 
+# Perfil de armazenamento ativo (WAL, sincronização, espera por bloqueios)
+_storage_profile = StorageProfile()
+
+
+def _configure_connection(conn: sqlite3.Connection) -> None:
+    """Aplica as configurações por conexão do perfil ativo a cada nova conexão."""
+    _storage_profile.apply_connection_settings(conn)
+
+
+# Gerenciador de conexões compartilhado por todas as funções deste módulo
+_pool = ConnectionManager(on_connect=_configure_connection)
+
+# Cache de resultados de get_all_points, search_points e get_point_by_id,
+# invalidado pelas funções de escrita e por escritas de outras conexões
+_result_cache = ResultCache()
+
+# Métricas de latência, linhas e erros por operação; desativadas por padrão
+# (ver enable_metrics) ou ativadas pela variável de ambiente SITAI_METRICS=1
+_metrics = MetricsRegistry(enabled=os.environ.get("SITAI_METRICS") == "1")
+
+# Registro de consultas lentas, ativado por enable_slow_query_log
+_slow_query_tracer: Optional[SlowQueryTracer] = None
+
+# Fila de escrita com confirmação em grupo, ativada por enable_write_queue
+_write_queue: Optional[GroupCommitWriter] = None
+
+
+def _create_change_log(conn: sqlite3.Connection) -> None:
+    """Cria o registro de alterações lido pelo armazenamento colunar."""
+    from sitai.columnar import create_change_log
+
+    create_change_log(conn, TABLE_NAME)
+
+
+def _add_version_column(conn: sqlite3.Connection) -> None:
+    """Acrescenta a coluna de versão das linhas, se ela ainda não existir."""
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({TABLE_NAME})")}
+    if VERSION_COLUMN not in columns:
+        # Com um valor padrão constante, o SQLite não reescreve as linhas existentes
+        conn.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN {VERSION_COLUMN} INTEGER NOT NULL DEFAULT 1")
+
+
+# Migrações do esquema, aplicadas em ordem por init_db. A tabela base é criada
+# diretamente por init_db (versão 0); novas alterações devem ser acrescentadas
+# ao final desta lista, nunca editadas depois de publicadas.
+MIGRATIONS = [
+    Migration(
+        version=1,
+        description="Índices para ordenação, listagem e pesquisa",
+        steps=[
+            # O rowid (id) é incluído implicitamente em cada índice e serve de
+            # desempate nas consultas ordenadas e na paginação por chave
+            f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_point_type ON {TABLE_NAME} (point_type)",
+            f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_responsible ON {TABLE_NAME} (responsible)",
+            f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_discovery_date ON {TABLE_NAME} (discovery_date)",
+            f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_coordinates ON {TABLE_NAME} (latitude, longitude)",
+        ]
+    ),
+    Migration(
+        version=2,
+        description="Índice de texto completo (FTS5) para a pesquisa",
+        steps=[
+            # Os gatilhos são criados antes do preenchimento, de modo que pontos
+            # gravados durante a migração também entram no índice
+            lambda conn: create_search_index(conn, TABLE_NAME),
+            BatchStep(
+                TABLE_NAME,
+                backfill_sql(TABLE_NAME),
+                when=lambda conn: search_index_exists(conn, TABLE_NAME)
+            ),
+        ]
+    ),
+    Migration(
+        version=3,
+        description="Índice espacial (R*Tree) das coordenadas",
+        steps=[
+            lambda conn: create_spatial_index(conn, TABLE_NAME),
+            BatchStep(
+                TABLE_NAME,
+                spatial_backfill_sql(TABLE_NAME),
+                when=lambda conn: spatial_index_exists(conn, TABLE_NAME)
+            ),
+        ]
+    ),
+    Migration(
+        version=4,
+        description="Registro de alterações e exclusões para atualização incremental",
+        steps=[_create_change_log]
+    ),
+    Migration(
+        version=5,
+        description="Versão das linhas para detectar alterações concorrentes",
+        steps=[_add_version_column]
+    ),
+]
+
+_migration_runner = MigrationRunner(MIGRATIONS)
+
+# Converte lotes de linhas lidas do banco (na ordem de POINT_COLUMNS) em
+# ExcavationPoint, com uma única validação por lote
+_rows_to_points = row_mapper(POINT_COLUMNS + [VERSION_COLUMN])
+
 
 def ensure_data_dir() -> None:
     """
@@ -71,40 +282,346 @@ def ensure_data_dir() -> None:
         logger.info(f"Diretório de dados criado: {DATA_DIR}")
 
 
-def init_db() -> None:
+def get_connection() -> ContextManager[sqlite3.Connection]:
+    """
+    Obtém a conexão reutilizável da thread atual com o banco de dados.
+
+    Deve ser usada como gerenciador de contexto: a transação é confirmada ao
+    final do bloco e desfeita caso ocorra uma exceção.
+
+    Returns:
+        ContextManager[sqlite3.Connection]: Gerenciador de contexto da conexão.
+    """
+    return _pool.connection(DB_PATH)
+
+
+def get_pool_stats() -> PoolStats:
+    """
+    Retorna as estatísticas de uso do gerenciador de conexões.
+
+    Returns:
+        PoolStats: Contadores de conexões criadas, reutilizadas e recicladas.
+    """
+    return _pool.stats()
+
+
+def close_connections() -> None:
+    """
+    Fecha todas as conexões mantidas pelo gerenciador.
+
+    Útil antes de mover ou remover o arquivo do banco de dados. Também descarta
+    o cache de resultados, que mantém uma conexão própria com o arquivo.
+    """
+    # A sonda do cache é somente leitura e não consegue fazer o checkpoint nem
+    # remover os arquivos -wal e -shm; por isso é fechada antes das conexões
+    # do gerenciador, para que a última conexão fechada seja de escrita
+    _result_cache.clear()
+    _pool.close_all()
+
+
+def get_cache_stats() -> CacheStats:
+    """
+    Retorna as estatísticas do cache de resultados.
+
+    Returns:
+        CacheStats: Acertos, faltas, descartes e memória estimada em uso.
+    """
+    return _result_cache.stats()
+
+
+def clear_cache() -> None:
+    """Descarta todos os resultados guardados no cache e zera seus contadores."""
+    _result_cache.clear()
+
+
+def enable_metrics(enabled: bool = True) -> None:
+    """
+    Ativa ou desativa a coleta de métricas das operações do banco de dados.
+
+    Args:
+        enabled: Se True, cada chamada passa a registrar latência, linhas e erros.
+    """
+    _metrics.enable(enabled)
+
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Retorna o registro de métricas das operações do banco de dados.
+
+    Returns:
+        MetricsRegistry: Registro compartilhado, que também permite medir
+        blocos de código com `timer`.
+    """
+    return _metrics
+
+
+def export_metrics(path: Optional[str] = None) -> str:
+    """
+    Exporta as métricas no formato de texto do Prometheus.
+
+    Args:
+        path: Arquivo de destino (opcional), substituído de forma atômica; útil
+            para o coletor "textfile" do node_exporter.
+
+    Returns:
+        str: Métricas no formato de texto do Prometheus.
+    """
+    if path is None:
+        return _metrics.render_prometheus()
+    text = _metrics.write_prometheus(path)
+    logger.info(f"Métricas gravadas em {path}")
+    return text
+
+
+def serve_metrics(port: int = 9464, host: str = "127.0.0.1") -> Any:
+    """
+    Serve as métricas por HTTP em /metrics e ativa a coleta.
+
+    Args:
+        port: Porta do servidor (0 escolhe uma porta livre).
+        host: Endereço do servidor; por padrão, apenas a máquina local.
+
+    Returns:
+        ThreadingHTTPServer: Servidor em execução; encerre com `shutdown()`.
+    """
+    _metrics.enable()
+    return _metrics.serve(port, host)
+
+
+@_metrics.instrument()
+def init_db(profile: Optional[StorageProfile] = None) -> None:
     """
     Inicializa o banco de dados com a tabela necessária.
 
     Cria a tabela de pontos de escavação se não existir, definindo
-    a estrutura adequada para armazenar todos os atributos necessários.
+    a estrutura adequada para armazenar todos os atributos necessários,
+    e aplica o perfil de armazenamento (por padrão, WAL com sincronização
+    NORMAL), permitindo leituras concorrentes com um escritor.
+
+    Args:
+        profile: Perfil de armazenamento a ser aplicado (opcional).
     """
+    global _storage_profile
+    if profile is not None:
+        _storage_profile = profile
+
     ensure_data_dir()
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute(f'''
-    CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        point_type TEXT NOT NULL,
-        latitude REAL NOT NULL,
-        longitude REAL NOT NULL,
-        altitude REAL NOT NULL,
-        description TEXT,
-        discovery_date TEXT NOT NULL,
-        responsible TEXT NOT NULL,
-        srid TEXT NOT NULL
+    with get_connection() as conn:
+        journal_mode = _storage_profile.apply(conn)
+        cursor = conn.cursor()
+
+        cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            point_type TEXT NOT NULL,
+            latitude REAL NOT NULL,
+            longitude REAL NOT NULL,
+            altitude REAL NOT NULL,
+            description TEXT,
+            discovery_date TEXT NOT NULL,
+            responsible TEXT NOT NULL,
+            srid TEXT NOT NULL
+        )
+        ''')
+
+        schema_version = _migration_runner.migrate(conn)
+
+    logger.info(
+        f"Banco de dados inicializado com sucesso (journal: {journal_mode}, esquema: v{schema_version})"
+    )
+
+
+def enable_slow_query_log(
+    path: Optional[str] = None,
+    threshold_ms: float = DEFAULT_SLOW_QUERY_MS,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 3
+) -> SlowQueryTracer:
+    """
+    Ativa o registro dos comandos SQL mais lentos que o limite.
+
+    Cada comando lento é gravado com a duração, o formato dos parâmetros e o
+    plano (EXPLAIN QUERY PLAN). As conexões abertas são fechadas, para que as
+    próximas já sejam criadas com a medição; por isso, ative o registro antes
+    de iniciar operações em outras threads.
+
+    Args:
+        path: Arquivo do log (padrão: data/slow_queries.log).
+        threshold_ms: Duração mínima, em milissegundos, de um comando gravado.
+        max_bytes: Tamanho do arquivo que dispara a rotação do log.
+        backup_count: Quantidade de cópias rotacionadas mantidas.
+
+    Returns:
+        SlowQueryTracer: Registro ativo.
+    """
+    global _slow_query_tracer
+
+    disable_slow_query_log()
+    _slow_query_tracer = SlowQueryTracer(
+        path or SLOW_QUERY_LOG_PATH, threshold_ms=threshold_ms, max_bytes=max_bytes, backup_count=backup_count
+    )
+    _pool.factory = _slow_query_tracer.connection_factory()
+    close_connections()
+    logger.info(f"Registro de consultas lentas (>= {threshold_ms} ms) em {_slow_query_tracer.path}")
+    return _slow_query_tracer
+
+
+def disable_slow_query_log() -> None:
+    """Desativa o registro de consultas lentas e volta às conexões comuns."""
+    global _slow_query_tracer
+
+    if _slow_query_tracer is None:
+        return
+    _pool.factory = None
+    close_connections()
+    _slow_query_tracer.close()
+    _slow_query_tracer = None
+
+
+def enable_write_queue(
+    window_ms: float = DEFAULT_WINDOW_MS,
+    max_batch: int = DEFAULT_MAX_BATCH
+) -> GroupCommitWriter:
+    """
+    Ativa a fila de escrita com confirmação em grupo para create_point.
+
+    Com a fila ativa, os pontos criados por várias threads (por exemplo, várias
+    sessões do aplicativo) são gravados por uma única thread, que reúne os
+    pedidos recebidos dentro da janela em uma só transação. Cada chamada de
+    create_point continua recebendo o próprio ID ou a própria exceção.
+
+    Args:
+        window_ms: Tempo máximo, em milissegundos, de espera por novos pedidos
+            depois do primeiro pedido do lote.
+        max_batch: Quantidade máxima de pontos por transação.
+
+    Returns:
+        GroupCommitWriter: Fila ativa.
+    """
+    global _write_queue
+
+    disable_write_queue()
+    _write_queue = GroupCommitWriter(
+        get_connection,
+        window_ms=window_ms,
+        max_batch=max_batch,
+        on_commit=lambda count: _result_cache.invalidate(),
+        metrics=_metrics,
     )
-    ''')
+    logger.info(f"Fila de escrita ativada (janela: {window_ms} ms, lote máximo: {max_batch})")
+    return _write_queue
+
+
+def disable_write_queue() -> None:
+    """Grava os pedidos pendentes e desativa a fila de escrita."""
+    global _write_queue
+
+    writer, _write_queue = _write_queue, None
+    if writer is not None:
+        writer.shutdown()
+
+
+def get_write_queue_stats() -> Optional[WriterStats]:
+    """
+    Retorna os contadores da fila de escrita.
 
-    conn.commit()
-    conn.close()
-    logger.info("Banco de dados inicializado com sucesso")
+    Returns:
+        WriterStats | None: Pedidos, lotes e erros, ou None se a fila não
+        estiver ativa.
+    """
+    writer = _write_queue
+    return writer.stats() if writer is not None else None
+
+
+# Os pedidos ainda na fila são gravados antes de o processo terminar
+atexit.register(disable_write_queue)
 
 
+def get_db_schema_version() -> int:
+    """
+    Retorna a versão do esquema do banco de dados (PRAGMA user_version).
+
+    Returns:
+        int: Versão do esquema; 0 indica um banco sem migrações aplicadas.
+    """
+    with get_connection() as conn:
+        return get_schema_version(conn)
+
+
+@_metrics.instrument(rows=no_rows)
+def checkpoint_db(mode: str = "PASSIVE") -> tuple:
+    """
+    Transfere o conteúdo do arquivo WAL para o banco de dados.
+
+    Args:
+        mode: Modo do checkpoint (PASSIVE, FULL, RESTART ou TRUNCATE).
+
+    Returns:
+        tuple: (ocupado, páginas no WAL, páginas transferidas).
+    """
+    with get_connection() as conn:
+        result = checkpoint(conn, mode)
+    logger.info(f"Checkpoint {mode.upper()} executado: {result}")
+    return result
+
+
+@_metrics.instrument(rows=no_rows)
+def vacuum_db() -> Tuple[int, int]:
+    """
+    Compacta o arquivo do banco de dados.
+
+    Descarta o registro de mudanças do armazenamento colunar (os
+    armazenamentos que ainda não o tinham lido se recarregam por completo na
+    próxima atualização), transfere o WAL para o banco, reconstrói o arquivo
+    com VACUUM (liberando as páginas de registros removidos) e atualiza as
+    estatísticas do planejador de consultas com `PRAGMA optimize`.
+
+    Returns:
+        tuple: Tamanho do arquivo, em bytes, antes e depois da compactação.
+    """
+    from sitai.columnar import prune_change_log
+
+    before = os.path.getsize(DB_PATH)
+    with get_connection() as conn:
+        pruned = prune_change_log(conn, TABLE_NAME)
+        conn.commit()
+        logger.info(f"{pruned} mudanças descartadas do registro do armazenamento colunar")
+        checkpoint(conn, "TRUNCATE")
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA optimize")
+        checkpoint(conn, "TRUNCATE")
+    after = os.path.getsize(DB_PATH)
+    logger.info(f"Banco de dados compactado: {before} -> {after} bytes")
+    return before, after
+
+
+def _point_to_row(point: Any) -> tuple:
+    """Converte um ponto na tupla de valores usada nos comandos INSERT e UPDATE."""
+    return (
+        point.point_type,
+        point.latitude,
+        point.longitude,
+        point.altitude,
+        point.description,
+        point.discovery_date.isoformat(),
+        point.responsible,
+        point.srid
+    )
+
+
+@_metrics.instrument()
 def create_point(point: Any) -> int:
     """
     Cria um novo ponto de escavação no banco de dados.
 
+    Com a fila de escrita ativa (ver enable_write_queue), o ponto é gravado
+    pela thread de escrita, junto com os pedidos de outras threads, e a
+    chamada aguarda a confirmação. Se a thread atual já estiver usando a sua
+    conexão (por exemplo, dentro de `with get_connection()`), o ponto é
+    gravado nessa conexão, dentro da transação em andamento: esperar pela
+    fila, nesse caso, travaria, pois a thread de escrita aguardaria o
+    bloqueio de escrita retido pela própria chamadora.
+
     Args:
         point: Objeto ExcavationPoint contendo os dados do ponto a ser criado.
 
@@ -114,53 +631,619 @@ def create_point(point: Any) -> int:
     Raises:
         ValueError: Se não for possível obter o ID após a inserção.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute(
-        f'''
-        INSERT INTO {TABLE_NAME} 
-        (point_type, latitude, longitude, altitude, description, discovery_date, responsible, srid)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''',
-        (
-            point.point_type,
-            point.latitude,
-            point.longitude,
-            point.altitude,
-            point.description,
-            point.discovery_date.isoformat(),
-            point.responsible,
-            point.srid
-        )
-    )
+    writer = _queue_for_caller()
+    if writer is not None:
+        point_id = writer.submit(functools.partial(_insert_row, _point_to_row(point))).result()
+    else:
+        point_id = _create_point_now(_point_to_row(point))
+
+    logger.info(f"Ponto criado com ID: {point_id}")
+    return point_id
 
-    conn.commit()
-    point_id = cursor.lastrowid
-    conn.close()
 
+def submit_point(point: Any) -> "Future[int]":
+    """
+    Enfileira a criação de um ponto sem aguardar a gravação.
+
+    Sem a fila de escrita ativa, ou se a thread atual já estiver usando a sua
+    conexão (ver create_point), o ponto é gravado imediatamente e o Future já
+    é devolvido concluído.
+
+    Args:
+        point: Objeto ExcavationPoint contendo os dados do ponto a ser criado.
+
+    Returns:
+        Future: ID do ponto criado, ou a exceção da gravação.
+    """
+    row = _point_to_row(point)
+    writer = _queue_for_caller()
+    if writer is not None:
+        return writer.submit(functools.partial(_insert_row, row))
+
+    future: "Future[int]" = Future()
+    try:
+        future.set_result(_create_point_now(row))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def _queue_for_caller() -> Optional[GroupCommitWriter]:
+    """Retorna a fila de escrita, se ativa e se a thread atual não estiver usando a sua conexão."""
+    writer = _write_queue
+    if writer is None or _pool.in_use(DB_PATH):
+        return None
+    return writer
+
+
+def _insert_row(row: tuple, conn: sqlite3.Connection) -> int:
+    """Insere a linha de um ponto e retorna o ID atribuído."""
+    point_id = conn.execute(INSERT_SQL, row).lastrowid
     if point_id is None:
         logger.error("Falha ao obter ID do ponto após inserção")
         raise ValueError("Não foi possível obter o ID do ponto após a inserção")
-
-    logger.info(f"Ponto criado com ID: {point_id}")
     return point_id
 
 
-def get_all_points() -> pd.DataFrame:
+@retry_on_busy()
+def _create_point_now(row: tuple) -> int:
+    """Grava um ponto em uma transação própria, na thread atual."""
+    try:
+        with get_connection() as conn:
+            return _insert_row(row, conn)
+    finally:
+        _result_cache.invalidate()
+
+
+@_metrics.instrument()
+def create_points_bulk(
+    points: Iterable[Any],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    atomic: bool = True
+) -> List[int]:
+    """
+    Cria vários pontos de escavação usando inserções em lote.
+
+    Os pontos são consumidos do iterável em blocos de `chunk_size` e gravados com
+    `executemany`, sem materializar a entrada inteira em memória. Com `atomic=True`
+    todos os blocos fazem parte de uma única transação (tudo ou nada); com
+    `atomic=False` cada bloco é confirmado separadamente, reduzindo o tempo em que
+    o bloqueio de escrita fica retido.
+
+    Args:
+        points: Iterável de objetos ExcavationPoint ou de dicionários com os
+            campos do ponto, validados em lote a cada bloco.
+        chunk_size: Quantidade de pontos gravados por bloco.
+        atomic: Se True, usa uma única transação para todos os pontos.
+
+    Returns:
+        list: IDs atribuídos aos pontos, na mesma ordem da entrada.
+
+    Raises:
+        ValueError: Se chunk_size não for positivo.
+        BulkInsertError: Se um bloco falhar (inclusive por um dicionário
+            inválido); contém os IDs já confirmados.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size deve ser maior que zero")
+
+    iterator = iter(points)
+    inserted_ids: List[int] = []
+    # Quantidade de IDs já confirmados (início de inserted_ids)
+    committed = 0
+
+    with get_connection() as conn:
+        try:
+            while True:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+
+                if not conn.in_transaction:
+                    # BEGIN IMMEDIATE obtém o bloqueio de escrita antes do primeiro
+                    # INSERT, evitando o impasse de promover uma leitura a escrita
+                    conn.execute("BEGIN IMMEDIATE")
+
+                if not all(isinstance(point, ExcavationPoint) for point in chunk):
+                    # Dicionários são validados em lote, por um único validador
+                    chunk = validate_points(chunk)
+
+                cursor = conn.cursor()
+                cursor.executemany(INSERT_SQL, map(_point_to_row, chunk))
+
+                # Com o bloqueio de escrita retido, AUTOINCREMENT atribui IDs
+                # consecutivos às linhas de um mesmo executemany
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                inserted_ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
+
+                if not atomic:
+                    conn.commit()
+                    committed = len(inserted_ids)
+
+            if conn.in_transaction:
+                conn.commit()
+        except Exception as e:
+            conn.rollback()
+            committed_ids = inserted_ids[:committed]
+            logger.error(f"Falha na inserção em lote após {len(committed_ids)} pontos confirmados: {str(e)}")
+            raise BulkInsertError(f"Falha na inserção em lote: {str(e)}", committed_ids) from e
+        finally:
+            _result_cache.invalidate()
+
+    logger.info(f"Inseridos {len(inserted_ids)} pontos em lote")
+    return inserted_ids
+
+
+@_metrics.instrument(rows=lambda count: count)
+def load_point_rows(rows: Iterable[tuple], chunk_size: int = LOAD_CHUNK_SIZE) -> int:
+    """
+    Carrega rapidamente um grande volume de linhas já validadas.
+
+    Destinada a cargas de milhões de linhas (dados sintéticos, restaurações).
+    Em vez de atualizar os índices de texto e espacial linha a linha pelos
+    gatilhos de inserção, os gatilhos são removidos, as linhas são inseridas e
+    os índices são preenchidos de uma só vez para o intervalo de IDs novos;
+    por fim, os gatilhos são recriados. Tudo ocorre em uma única transação, de
+    modo que outras conexões nunca veem o banco sem os gatilhos.
+
+    Args:
+        rows: Tuplas de valores na ordem de INSERT_SQL (tipo, latitude,
+            longitude, altitude, descrição, data ISO, responsável, SRID).
+        chunk_size: Quantidade de linhas por executemany.
+
+    Returns:
+        int: Quantidade de linhas inseridas.
+
+    Raises:
+        ValueError: Se chunk_size não for positivo.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size deve ser maior que zero")
+
+    # Gatilhos de inserção substituídos pelo preenchimento em bloco
+    backfills = {
+        f"trg_{fts_table(TABLE_NAME)}_insert": backfill_sql(TABLE_NAME),
+        f"trg_{rtree_table(TABLE_NAME)}_insert": spatial_backfill_sql(TABLE_NAME),
+    }
+    iterator = iter(rows)
+    count = 0
+
+    with get_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            triggers = conn.execute(
+                f"SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ? "
+                f"AND name IN ({', '.join('?' * len(backfills))})",
+                (TABLE_NAME, *backfills)
+            ).fetchall()
+            for name, _ in triggers:
+                conn.execute(f"DROP TRIGGER {name}")
+
+            # Com AUTOINCREMENT, os IDs novos são maiores que o último já atribuído
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (TABLE_NAME,)).fetchone()
+            first_id = (row[0] if row else 0) + 1
+
+            while True:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                conn.executemany(INSERT_SQL, chunk)
+                count += len(chunk)
+
+            if count:
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                for name, _ in triggers:
+                    conn.execute(backfills[name], (first_id, last_id + 1))
+            for _, sql in triggers:
+                conn.execute(sql)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Falha na carga rápida de pontos: {str(e)}")
+            raise
+        finally:
+            _result_cache.invalidate()
+
+    logger.info(f"Carregados {count} pontos")
+    return count
+
+
+@_metrics.instrument(rows=lambda result: result.imported)
+def import_points_file(
+    path: str,
+    error_report: Optional[str] = None,
+    batch_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None
+) -> Any:
+    """
+    Importa pontos de uma planilha CSV ou XLSX para o banco de dados.
+
+    As linhas são validadas em paralelo e os pontos válidos são gravados por
+    `create_points_bulk`, um lote por transação. Linhas rejeitadas vão para o
+    relatório de erros, com o número da linha no arquivo de origem.
+
+    Args:
+        path: Caminho do arquivo CSV ou XLSX.
+        error_report: Caminho do relatório CSV de linhas rejeitadas (opcional).
+        batch_size: Quantidade de linhas por lote.
+        workers: Número de processos de validação (0 valida sem pool de processos).
+
+    Returns:
+        ImportResult: Totais de linhas lidas, importadas e rejeitadas.
+    """
+    from sitai.importer import import_points
+
+    return import_points(
+        path,
+        writer=lambda points: create_points_bulk(points, chunk_size=batch_size),
+        error_report=error_report,
+        batch_size=batch_size,
+        workers=workers
+    )
+
+
+def iter_point_rows(batch_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple]:
+    """
+    Percorre todos os pontos de escavação sem materializar a tabela em memória.
+
+    Usa uma conexão dedicada somente leitura, de modo que a leitura longa enxerga
+    um instantâneo consistente do banco (WAL) sem interferir nas transações da
+    conexão reutilizável da thread. As linhas são buscadas em blocos com
+    `fetchmany`.
+
+    Args:
+        batch_size: Quantidade de linhas buscadas por vez.
+
+    Yields:
+        tuple: Valores de cada ponto, na ordem de POINT_COLUMNS.
+    """
+    conn = sqlite3.connect(f"file:{pathname2url(os.path.abspath(DB_PATH))}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(f"SELECT {', '.join(POINT_COLUMNS)} FROM {TABLE_NAME} ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        conn.close()
+
+
+def iter_export(fmt: str = "csv", batch_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Gera a exportação de todos os pontos em pedaços de texto.
+
+    Args:
+        fmt: Formato da exportação ("csv" ou "geojson").
+        batch_size: Quantidade de linhas lidas do banco por vez.
+
+    Returns:
+        Iterator[str]: Pedaços consecutivos do arquivo exportado.
+    """
+    from sitai.exporter import get_exporter
+
+    exporter = get_exporter(fmt)
+    return exporter(POINT_COLUMNS, iter_point_rows(batch_size), chunk_rows=batch_size)
+
+
+@_metrics.instrument(rows=no_rows)
+def export_points(target: Any, fmt: str = "csv", batch_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Exporta todos os pontos para um arquivo CSV ou GeoJSON, em fluxo.
+
+    Args:
+        target: Caminho do arquivo de destino ou objeto de arquivo aberto.
+        fmt: Formato da exportação ("csv" ou "geojson").
+        batch_size: Quantidade de linhas lidas do banco por vez.
+
+    Returns:
+        int: Quantidade de caracteres gravados.
+    """
+    from sitai.exporter import write_chunks
+
+    written = write_chunks(iter_export(fmt, batch_size), target)
+    logger.info(f"Exportação {fmt} concluída ({written} caracteres)")
+    return written
+
+
+def _project_columns(columns: Optional[Sequence[str]]) -> List[str]:
+    """Valida a projeção de colunas; None seleciona todas, na ordem da tabela."""
+    if columns is None:
+        return list(POINT_COLUMNS)
+    invalid = [c for c in columns if c not in POINT_COLUMNS]
+    if invalid:
+        raise ValueError(f"Colunas inválidas: {', '.join(invalid)}")
+    if not columns:
+        raise ValueError("Informe ao menos uma coluna")
+    return list(dict.fromkeys(columns))
+
+
+def _apply_point_dtypes(df: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Converte as colunas lidas do banco para tipos compactos.
+
+    Textos repetitivos viram categorias, a data vira datetime64 e coordenadas
+    e altitude passam a float32 quando essa precisão preserva os valores
+    dentro da tolerância (FLOAT32_TOLERANCE).
+    """
+    import numpy as np
+    import pandas as pd
+
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    if "discovery_date" in df.columns:
+        df["discovery_date"] = pd.to_datetime(df["discovery_date"], format="ISO8601")
+    for column, tolerance in FLOAT32_TOLERANCE.items():
+        if column in df.columns and len(df):
+            values = df[column].to_numpy(dtype=np.float64)
+            compact = values.astype(np.float32)
+            if np.nanmax(np.abs(compact - values), initial=0.0) <= tolerance:
+                df[column] = compact
+    return df
+
+
+@_metrics.instrument()
+def get_all_points(columns: Optional[Sequence[str]] = None) -> "pd.DataFrame":
     """
     Busca todos os pontos de escavação no banco de dados.
 
+    O DataFrame já vem tipado: `point_type`, `responsible` e `srid` como
+    categorias, `discovery_date` como datetime64 e coordenadas em float32
+    quando a precisão permite.
+
+    Args:
+        columns: Colunas a serem lidas (opcional); por padrão, todas.
+
     Returns:
         pandas.DataFrame: DataFrame contendo todos os pontos de escavação.
+
+    Raises:
+        ValueError: Se alguma coluna não existir na tabela.
     """
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql_query(f"SELECT * FROM {TABLE_NAME}", conn)
-    conn.close()
+    import pandas as pd
+
+    selected = _project_columns(columns)
+    cache_key = ("all", tuple(selected))
+    with get_connection() as conn:
+        version = _result_cache.version(DB_PATH)
+        hit, df = _result_cache.get(cache_key, version)
+        if not hit:
+            df = pd.read_sql_query(f"SELECT {', '.join(selected)} FROM {TABLE_NAME}", conn)
+            df = _apply_point_dtypes(df)
+            _result_cache.put(cache_key, df, version)
     logger.info(f"Consultados {len(df)} pontos do banco de dados")
-    return df
+    return df.copy()
+
+
+@_metrics.instrument()
+def load_point_store(batch_size: Optional[int] = None) -> "PointStore":
+    """
+    Carrega todo o catálogo em um armazenamento colunar em memória.
+
+    Indicado para análises sobre o catálogo inteiro: as colunas ficam em arrays
+    NumPy e os textos codificados por dicionário, sem um objeto por linha.
+
+    Args:
+        batch_size: Quantidade de linhas lidas do banco por vez (padrão:
+            sitai.columnar.DEFAULT_BATCH_SIZE).
+
+    Returns:
+        PointStore: Armazenamento com todos os pontos.
+    """
+    from sitai.columnar import DEFAULT_BATCH_SIZE, PointStore
+
+    with get_connection() as conn:
+        return PointStore.load(conn, TABLE_NAME, batch_size=batch_size or DEFAULT_BATCH_SIZE)
+
+
+@_metrics.instrument(rows=lambda result: result.added + result.updated + result.deleted)
+def refresh_point_store(store: "PointStore") -> "RefreshResult":
+    """
+    Atualiza um armazenamento colunar apenas com as linhas alteradas.
+
+    Args:
+        store: Armazenamento obtido com load_point_store.
+
+    Returns:
+        RefreshResult: Quantidade de linhas acrescentadas, alteradas e removidas.
+    """
+    with get_connection() as conn:
+        return store.refresh(conn)
+
 
+@_metrics.instrument()
+def count_points(estimate: bool = True) -> int:
+    """
+    Conta os pontos de escavação cadastrados.
+
+    Args:
+        estimate: Se True, usa a estatística mantida pelo ANALYZE (sqlite_stat1)
+            quando disponível, evitando percorrer a tabela. O primeiro número de
+            qualquer linha da tabela (inclusive as dos índices) é a quantidade
+            de linhas.
+
+    Returns:
+        int: Quantidade (exata ou estimada) de pontos.
+    """
+    with get_connection() as conn:
+        if estimate:
+            try:
+                row = conn.execute(
+                    "SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1",
+                    (TABLE_NAME,)
+                ).fetchone()
+            except sqlite3.OperationalError:
+                row = None  # ANALYZE nunca foi executado
+            if row and row[0]:
+                return int(str(row[0]).split()[0])
+        return conn.execute(f"SELECT COUNT(*) FROM {TABLE_NAME}").fetchone()[0]
+
+
+def normalize_sort(sort: Optional[SortSpec] = None) -> List[Tuple[str, bool]]:
+    """
+    Valida uma especificação de ordenação e a converte em pares (coluna, decrescente).
+
+    O id é acrescentado ao final como critério de desempate, no mesmo sentido da
+    última chave, garantindo uma ordem total e estável.
+
+    Args:
+        sort: Especificação de ordenação (ver SortSpec). None ordena por id.
+
+    Returns:
+        list: Pares (coluna, True se decrescente), sem colunas repetidas.
+
+    Raises:
+        ValueError: Se alguma coluna ou direção for inválida.
+    """
+    if sort is None:
+        sort = []
+    elif isinstance(sort, str):
+        sort = [part for part in sort.split(",") if part.strip()]
+
+    keys: List[Tuple[str, bool]] = []
+    for item in sort:
+        if isinstance(item, str):
+            parts = item.split()
+            if len(parts) == 1 and parts[0].startswith("-"):
+                column, direction = parts[0][1:], "DESC"
+            elif len(parts) in (1, 2):
+                column, direction = parts[0], parts[1] if len(parts) == 2 else "ASC"
+            else:
+                raise ValueError(f"Ordenação inválida: {item}")
+        else:
+            column, direction = item
+            if isinstance(direction, bool):
+                direction = "DESC" if direction else "ASC"
+
+        direction = str(direction).upper()
+        if column not in SORTABLE_COLUMNS:
+            raise ValueError(f"Coluna de ordenação inválida: {column}")
+        if direction not in ("ASC", "DESC"):
+            raise ValueError(f"Direção de ordenação inválida: {direction}")
+        if column not in (k for k, _ in keys):
+            keys.append((column, direction == "DESC"))
+
+    if "id" not in (k for k, _ in keys):
+        keys.append(("id", keys[-1][1] if keys else False))
+    return keys
+
+
+def _order_clause(keys: List[Tuple[str, bool]], reverse: bool = False, alias: str = "") -> str:
+    """Monta a cláusula ORDER BY; com reverse=True inverte todas as direções."""
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(f"{prefix}{column} {'DESC' if desc != reverse else 'ASC'}" for column, desc in keys)
+
+
+def _keyset_condition(keys: List[Tuple[str, bool]], reverse: bool = False) -> Tuple[str, int]:
+    """
+    Monta a condição que seleciona as linhas posteriores à chave informada.
+
+    Quando todas as chaves têm o mesmo sentido, usa a comparação de valores de
+    linha, que o SQLite resolve diretamente pelo índice. Com sentidos mistos,
+    expande a comparação em (a > ?) OR (a = ? AND b < ?) OR ...
+
+    Returns:
+        tuple: A condição SQL e a lista de índices da chave para cada parâmetro.
+    """
+    directions = {desc != reverse for _, desc in keys}
+    if len(directions) == 1:
+        operator = "<" if directions.pop() else ">"
+        columns = ", ".join(column for column, _ in keys)
+        placeholders = ", ".join("?" for _ in keys)
+        return f"({columns}) {operator} ({placeholders})", list(range(len(keys)))
+
+    clauses = []
+    positions: List[int] = []
+    for i, (column, desc) in enumerate(keys):
+        terms = [f"{keys[j][0]} = ?" for j in range(i)]
+        terms.append(f"{column} {'<' if desc != reverse else '>'} ?")
+        clauses.append(f"({' AND '.join(terms)})")
+        positions.extend(range(i + 1))
+    return f"({' OR '.join(clauses)})", positions
+
+
+@_metrics.instrument()
+def get_points_page(
+    after_key: Optional[tuple] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    order_by: SortSpec = "id",
+    descending: bool = False,
+    before_key: Optional[tuple] = None,
+    columns: Optional[Sequence[str]] = None
+) -> PointsPage:
+    """
+    Busca uma página de pontos usando paginação por chave (keyset/seek).
 
+    Em vez de OFFSET, que percorre e descarta todas as linhas anteriores, a
+    consulta continua a partir da chave (valores das colunas de ordenação e id)
+    da última linha já exibida. O id desempata valores repetidos, de modo que
+    cada linha aparece em exatamente uma página.
+
+    Args:
+        after_key: Chave da última linha da página anterior (próxima página).
+        limit: Quantidade máxima de linhas na página.
+        order_by: Especificação de ordenação (ver normalize_sort).
+        descending: Se True e order_by for uma única coluna, ordena de forma decrescente.
+        before_key: Chave da primeira linha da página atual (página anterior).
+        columns: Colunas a serem exibidas (opcional); por padrão, todas.
+
+    Returns:
+        PointsPage: Linhas da página, já tipadas, e chaves para navegação.
+
+    Raises:
+        ValueError: Se a ordenação, o limite ou as colunas forem inválidos.
+    """
+    if isinstance(order_by, str) and descending and "," not in order_by:
+        order_by = [(order_by.strip(), "DESC")]
+    keys = normalize_sort(order_by)
+    if limit <= 0:
+        raise ValueError("limit deve ser maior que zero")
+    selected = _project_columns(columns)
+    # As colunas de ordenação são lidas mesmo fora da projeção, para as chaves
+    fetched = selected + [column for column, _ in keys if column not in selected]
+
+    # Para voltar uma página, percorre a ordem inversa a partir da primeira linha
+    backwards = before_key is not None
+
+    sql = f"SELECT {', '.join(fetched)} FROM {TABLE_NAME}"
+    params: List[Any] = []
+    start_key = before_key if backwards else after_key
+    if start_key is not None:
+        condition, positions = _keyset_condition(keys, reverse=backwards)
+        sql += f" WHERE {condition}"
+        params.extend(start_key[i] for i in positions)
+    sql += f" ORDER BY {_order_clause(keys, reverse=backwards)} LIMIT ?"
+    params.append(limit + 1)
+
+    with get_connection() as conn:
+        rows = conn.execute(sql, params).fetchall()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+
+    import pandas as pd
+
+    df = pd.DataFrame.from_records(rows, columns=fetched, exclude=fetched[len(selected):])
+    df = _apply_point_dtypes(df)
+    key_positions = [fetched.index(column) for column, _ in keys]
+    first_key = tuple(rows[0][i] for i in key_positions) if rows else None
+    last_key = tuple(rows[-1][i] for i in key_positions) if rows else None
+
+    return PointsPage(
+        data=df,
+        first_key=first_key,
+        last_key=last_key,
+        has_next=has_more if not backwards else True,
+        has_previous=(after_key is not None) if not backwards else has_more,
+        total=count_points(),
+        sort=keys
+    )
+
+
+@_metrics.instrument()
 def get_point_by_id(point_id: int) -> Optional[Any]:
     """
     Busca um ponto específico pelo ID.
@@ -171,37 +1254,49 @@ def get_point_by_id(point_id: int) -> Optional[Any]:
     Returns:
         ExcavationPoint: Objeto com os dados do ponto encontrado ou None se não existir.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute(f"SELECT * FROM {TABLE_NAME} WHERE id = ?", (point_id,))
-    result = cursor.fetchone()
-
-    if result:
-        columns = [col[0] for col in cursor.description]
-        data = dict(zip(columns, result))
-        data['discovery_date'] = datetime.fromisoformat(data['discovery_date'])
-        conn.close()
+    cache_key = ("point", point_id)
+    with get_connection() as conn:
+        version = _result_cache.version(DB_PATH)
+        hit, point = _result_cache.get(cache_key, version)
+        if not hit:
+            row = conn.execute(
+                f"SELECT {', '.join(POINT_COLUMNS)}, {VERSION_COLUMN} FROM {TABLE_NAME} WHERE id = ?", (point_id,)
+            ).fetchone()
+            point = _rows_to_points([row])[0] if row else None
+            _result_cache.put(cache_key, point, version)
+
+    if point is not None:
         logger.info(f"Ponto encontrado com ID: {point_id}")
-        return ExcavationPoint(**data)
+        # Cópia, para que alterações feitas pelo chamador não cheguem ao cache
+        return point.model_copy() if hasattr(point, "model_copy") else point
 
-    conn.close()
     logger.warning(f"Ponto não encontrado com ID: {point_id}")
     return None
 
 
+@_metrics.instrument()
+@retry_on_busy()
 def update_point(point: Any) -> bool:
     """
     Atualiza um ponto de escavação existente.
 
+    A alteração é feita por um único comando UPDATE ... RETURNING (ou, no
+    SQLite anterior ao 3.35, por UPDATE seguido de SELECT na mesma transação),
+    que também incrementa a versão da linha. Se o ponto trouxer a versão lida do banco
+    (`point.version`, preenchida por get_point_by_id), a alteração só é
+    aplicada se ninguém tiver alterado o ponto desde então; caso contrário,
+    VersionConflictError é lançada em vez de sobrescrever a alteração alheia.
+    Em caso de sucesso, `point.version` recebe a nova versão.
+
     Args:
         point: Objeto ExcavationPoint com os dados atualizados e ID válido.
 
     Returns:
-        bool: True se a atualização foi bem-sucedida, False caso contrário.
+        bool: True se a atualização foi bem-sucedida, False se o ponto não existir.
 
     Raises:
         ValueError: Se o ID do ponto não for especificado.
+        VersionConflictError: Se o ponto tiver sido alterado desde a leitura.
     """
     if point.id is None:  # Verificação explícita contra None
         logger.error("Tentativa de atualização sem ID")
@@ -214,146 +1309,558 @@ def update_point(point: Any) -> bool:
         logger.error(f"ID inválido: {point.id} não é um inteiro válido")
         return False
 
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    # Primeiro verificamos se o ponto existe
-    cursor.execute(f"SELECT id FROM {TABLE_NAME} WHERE id = ?", (point_id,))
-    if not cursor.fetchone():
-        conn.close()
+    expected_version = getattr(point, VERSION_COLUMN, None)
+    sql = f'''
+        UPDATE {TABLE_NAME}
+        SET point_type = ?, latitude = ?, longitude = ?, altitude = ?,
+            description = ?, discovery_date = ?, responsible = ?, srid = ?,
+            {VERSION_COLUMN} = {VERSION_COLUMN} + 1
+        WHERE id = ?
+        '''
+    params = _point_to_row(point) + (point_id,)
+    if expected_version is not None:
+        sql += f" AND {VERSION_COLUMN} = ?"
+        params += (expected_version,)
+
+    current = None
+    with get_connection() as conn:
+        if HAS_RETURNING:
+            rows = conn.execute(sql + f" RETURNING {VERSION_COLUMN}", params).fetchall()
+        elif conn.execute(sql, params).rowcount:
+            rows = conn.execute(f"SELECT {VERSION_COLUMN} FROM {TABLE_NAME} WHERE id = ?", (point_id,)).fetchall()
+        else:
+            rows = []
+        if not rows and expected_version is not None:
+            # Só no caminho de falha: distingue ponto inexistente de conflito
+            current = conn.execute(
+                f"SELECT {VERSION_COLUMN} FROM {TABLE_NAME} WHERE id = ?", (point_id,)
+            ).fetchone()
+
+    if not rows:
+        if current is not None:
+            logger.warning(f"Conflito ao atualizar ponto com ID {point_id}: versão {expected_version} != {current[0]}")
+            raise VersionConflictError(point_id, expected_version, current[0])
         logger.warning(f"Tentativa de atualizar ponto inexistente com ID: {point_id}")
         return False
 
-    cursor.execute(
-        f'''
-        UPDATE {TABLE_NAME} 
-        SET point_type = ?, latitude = ?, longitude = ?, altitude = ?, 
-            description = ?, discovery_date = ?, responsible = ?, srid = ?
-        WHERE id = ?
-        ''',
-        (
-            point.point_type,
-            point.latitude,
-            point.longitude,
-            point.altitude,
-            point.description,
-            point.discovery_date.isoformat(),
-            point.responsible,
-            point.srid,
-            point_id
-        )
-    )
-
-    conn.commit()
-    updated = cursor.rowcount > 0
-    conn.close()
-
-    if updated:
-        logger.info(f"Ponto atualizado com ID: {point_id}")
-    else:
-        logger.warning(f"Falha ao atualizar ponto com ID: {point_id}")
-
-    return updated
+    _result_cache.invalidate()
+    point.version = rows[0][0]
+    return True
 
 
-def delete_point(point_id: int) -> bool:
+@_metrics.instrument()
+def delete_point(point_id: int, expected_version: Optional[int] = None) -> bool:
     """
-    Remove um ponto de escavação pelo ID.
+    Remove um ponto de escavação pelo ID, com um único comando DELETE.
 
     Args:
         point_id: ID do ponto a ser removido.
+        expected_version: Versão lida do ponto (opcional); se informada, a
+            exclusão só ocorre se o ponto não tiver sido alterado desde então.
 
     Returns:
         bool: True se a exclusão foi bem-sucedida, False caso contrário.
+
+    Raises:
+        VersionConflictError: Se o ponto tiver sido alterado desde a leitura.
     """
-    logger.info(f"Tentando excluir ponto com ID: {point_id}")
+    sql = f"DELETE FROM {TABLE_NAME} WHERE id = ?"
+    params: Tuple[Any, ...] = (point_id,)
+    if expected_version is not None:
+        sql += f" AND {VERSION_COLUMN} = ?"
+        params += (expected_version,)
+
+    @retry_on_busy()
+    def _delete() -> Tuple[bool, Optional[tuple]]:
+        with get_connection() as conn:
+            if conn.execute(sql, params).rowcount > 0:
+                return True, None
+            if expected_version is None:
+                return False, None
+            return False, conn.execute(
+                f"SELECT {VERSION_COLUMN} FROM {TABLE_NAME} WHERE id = ?", (point_id,)
+            ).fetchone()
 
     try:
-        # Conecta ao banco de dados com pragma de isolation_level None para auto-commit
-        conn = sqlite3.connect(DB_PATH, isolation_level=None)
-        cursor = conn.cursor()
+        deleted, current = _delete()
+    except sqlite3.Error as e:
+        logger.error(f"Erro ao excluir ponto com ID {point_id}: {str(e)}")
+        _metrics.record_error("delete_point")
+        return False
 
-        # Verifica se o ponto existe
-        cursor.execute(f"SELECT COUNT(*) FROM {TABLE_NAME} WHERE id = ?", (point_id,))
-        count = cursor.fetchone()[0]
+    if deleted:
+        _result_cache.invalidate()
+        return True
+    if current is not None:
+        logger.warning(f"Conflito ao excluir ponto com ID {point_id}: versão {expected_version} != {current[0]}")
+        raise VersionConflictError(point_id, expected_version, current[0])
+    logger.warning(f"Ponto com ID {point_id} não existe para exclusão")
+    return False
 
-        if count == 0:
-            logger.warning(f"Ponto com ID {point_id} não existe para exclusão")
-            conn.close()
-            return False
 
-        # Log para ajudar a debug
-        logger.info(f"Encontrado ponto com ID {point_id} para exclusão")
+def _id_list(ids: Iterable[int]) -> List[int]:
+    """Converte os IDs informados em inteiros, sem repetições, mantendo a ordem."""
+    return list(dict.fromkeys(int(point_id) for point_id in ids))
 
-        # Executa a exclusão diretamente
-        cursor.execute(f"DELETE FROM {TABLE_NAME} WHERE id = ?", (point_id,))
 
-        # Forçar commit (embora isolation_level=None já faça isso)
-        conn.commit()
+# Condição que compara uma coluna com uma lista de valores enviada como um único
+# parâmetro JSON: não há limite de parâmetros, e o índice da coluna é usado
+IN_JSON_LIST = "{} IN (SELECT value FROM json_each(?))"
 
-        # Verifica se a exclusão foi bem-sucedida
-        cursor.execute(f"SELECT COUNT(*) FROM {TABLE_NAME} WHERE id = ?", (point_id,))
-        remaining = cursor.fetchone()[0]
 
-        # Fecha a conexão
-        conn.close()
+def _filter_condition(filter: Dict[str, Any]) -> Tuple[str, List[Any]]:
+    """
+    Monta a condição WHERE de um filtro por igualdade de colunas.
 
-        if remaining == 0:
-            logger.info(f"Ponto com ID {point_id} excluído com sucesso")
-            return True
+    Valores em lista, tupla ou conjunto selecionam qualquer um dos valores;
+    None seleciona valores nulos.
+    """
+    if not filter:
+        raise ValueError("Informe ao menos um critério de filtro")
+    invalid = [column for column in filter if column not in POINT_COLUMNS]
+    if invalid:
+        raise ValueError(f"Colunas inválidas no filtro: {', '.join(invalid)}")
+
+    conditions: List[str] = []
+    params: List[Any] = []
+    for column, value in filter.items():
+        if isinstance(value, (list, tuple, set, frozenset)):
+            values = _id_list(value) if column == "id" else list(value)
+            conditions.append(IN_JSON_LIST.format(column))
+            params.append(json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values]))
+        elif value is None:
+            conditions.append(f"{column} IS NULL")
         else:
-            logger.error(f"Falha ao excluir: ponto com ID {point_id} ainda existe")
-            return False
+            conditions.append(f"{column} = ?")
+            params.append(value.isoformat() if isinstance(value, datetime) else value)
+    return " AND ".join(conditions), params
+
+
+@_metrics.instrument()
+def get_points_by_ids(ids: Iterable[int]) -> List[Any]:
+    """
+    Busca vários pontos pelos IDs, em uma única consulta.
+
+    Args:
+        ids: IDs dos pontos.
+
+    Returns:
+        list: Objetos ExcavationPoint na ordem dos IDs informados; IDs
+        inexistentes são omitidos.
+    """
+    id_list = _id_list(ids)
+    if not id_list:
+        return []
+    with get_connection() as conn:
+        rows = conn.execute(
+            f"SELECT {', '.join(POINT_COLUMNS)}, {VERSION_COLUMN} FROM {TABLE_NAME} "
+            f"WHERE {IN_JSON_LIST.format('id')}",
+            (json.dumps(id_list),)
+        ).fetchall()
+    found = {point.id: point for point in _rows_to_points(rows)}
+    return [found[point_id] for point_id in id_list if point_id in found]
+
+
+@_metrics.instrument(rows=lambda count: count)
+@retry_on_busy()
+def update_points_where(filter: Dict[str, Any], changes: Dict[str, Any]) -> int:
+    """
+    Altera de uma só vez os pontos que atendem a um filtro.
+
+    Indicada para correções em massa, como trocar o responsável de toda uma
+    campanha. As alterações são validadas com as regras do modelo e gravadas
+    por um único comando UPDATE, em uma transação; a versão de cada linha
+    alterada é incrementada.
+
+    Exemplo:
+        update_points_where({"responsible": "Dr. Ana"}, {"responsible": "Dra. Ana Silva"})
+        update_points_where({"id": [3, 5, 8]}, {"srid": "SIRGAS2000"})
+
+    Args:
+        filter: Critérios por coluna (igualdade); listas selecionam qualquer
+            um dos valores, por exemplo {"id": [1, 2, 3]}.
+        changes: Novos valores por campo.
+
+    Returns:
+        int: Quantidade de pontos alterados.
+
+    Raises:
+        ValueError: Se o filtro estiver vazio ou as colunas forem inválidas.
+        ValidationError: Se algum dos novos valores for inválido.
+    """
+    if not changes:
+        raise ValueError("Informe ao menos um campo a alterar")
+    values = validate_changes(changes)
+    where, params = _filter_condition(filter)
+    assignments = [f"{column} = ?" for column in values] + [f"{VERSION_COLUMN} = {VERSION_COLUMN} + 1"]
+    new_values = [value.isoformat() if isinstance(value, datetime) else value for value in values.values()]
+
+    with get_connection() as conn:
+        updated = conn.execute(
+            f"UPDATE {TABLE_NAME} SET {', '.join(assignments)} WHERE {where}", new_values + params
+        ).rowcount
+
+    if updated:
+        _result_cache.invalidate()
+    logger.info(f"Alterados {updated} pontos em lote")
+    return updated
+
+
+@_metrics.instrument(rows=lambda count: count)
+@retry_on_busy()
+def delete_points(ids: Iterable[int]) -> int:
+    """
+    Remove vários pontos pelos IDs, com um único comando DELETE.
+
+    Args:
+        ids: IDs dos pontos a remover.
+
+    Returns:
+        int: Quantidade de pontos removidos (IDs inexistentes são ignorados).
+    """
+    id_list = _id_list(ids)
+    if not id_list:
+        return 0
+    with get_connection() as conn:
+        deleted = conn.execute(
+            f"DELETE FROM {TABLE_NAME} WHERE {IN_JSON_LIST.format('id')}", (json.dumps(id_list),)
+        ).rowcount
+
+    if deleted:
+        _result_cache.invalidate()
+    logger.info(f"Removidos {deleted} pontos em lote")
+    return deleted
+
+
+def _bbox_filter(conn: sqlite3.Connection, bbox: BoundingBox, alias: str = "") -> Tuple[str, List[float]]:
+    """Condição de retângulo, usando o índice R*Tree quando ele existir."""
+    return bbox_condition(TABLE_NAME, bbox, alias=alias, use_index=spatial_index_exists(conn, TABLE_NAME))
+
+
+@_metrics.instrument()
+def get_points_in_bbox(
+    min_lat: float,
+    min_lon: float,
+    max_lat: float,
+    max_lon: float,
+    sort: Optional[SortSpec] = None
+) -> List[Dict[str, Any]]:
+    """
+    Busca os pontos de escavação dentro de um retângulo geográfico.
+
+    Com o índice R*Tree, apenas as regiões da árvore que intersectam o
+    retângulo são percorridas; sem ele, a consulta usa o índice de coordenadas.
+    Os limites são inclusivos.
+
+    Args:
+        min_lat: Latitude mínima (sul).
+        min_lon: Longitude mínima (oeste).
+        max_lat: Latitude máxima (norte).
+        max_lon: Longitude máxima (leste).
+        sort: Especificação de ordenação dos resultados (ver normalize_sort).
+
+    Returns:
+        list: Lista de dicionários contendo os pontos encontrados, já ordenados.
+
+    Raises:
+        ValueError: Se o retângulo ou a ordenação forem inválidos.
+    """
+    bbox = validate_bbox(min_lat, min_lon, max_lat, max_lon)
+    order_clause = _order_clause(normalize_sort(sort))
+
+    with get_connection() as conn:
+        condition, params = _bbox_filter(conn, bbox)
+        cursor = conn.execute(
+            f"SELECT {', '.join(POINT_COLUMNS)} FROM {TABLE_NAME} WHERE {condition} ORDER BY {order_clause}",
+            params
+        )
+        columns = [col[0] for col in cursor.description]
+        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    logger.info(f"Encontrados {len(results)} pontos na área ({min_lat}, {min_lon}) - ({max_lat}, {max_lon})")
+    return results
 
-    except Exception as e:
-        logger.error(f"Erro ao excluir ponto com ID {point_id}: {str(e)}")
-        # Tenta fechar a conexão se ainda estiver aberta
-        try:
-            if 'conn' in locals() and conn:
-                conn.close()
-        except:
-            pass
-        return False
 
+def _spatial_candidates(conn: sqlite3.Connection, bbox: BoundingBox) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Lê os IDs e as coordenadas dos pontos dentro do retângulo.
+
+    Returns:
+        tuple: Array de IDs e matriz (n, 2) com latitude e longitude.
+    """
+    import numpy as np
+
+    condition, params = _bbox_filter(conn, bbox)
+    rows = conn.execute(
+        f"SELECT id, latitude, longitude FROM {TABLE_NAME} WHERE {condition}", params
+    ).fetchall()
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty((0, 2), dtype=np.float64)
+    ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    coordinates = np.array([(r[1], r[2]) for r in rows], dtype=np.float64)
+    return ids, coordinates
+
+
+def _points_with_distance(conn: sqlite3.Connection, ids: "np.ndarray", distances: "np.ndarray") -> List[Dict[str, Any]]:
+    """Lê os pontos informados, na mesma ordem, acrescentando o campo "distance_m"."""
+    rows: Dict[int, Dict[str, Any]] = {}
+    id_list = ids.tolist()
+    # Lotes abaixo do limite de parâmetros por comando do SQLite
+    for start in range(0, len(id_list), 500):
+        chunk = id_list[start:start + 500]
+        cursor = conn.execute(
+            f"SELECT {', '.join(POINT_COLUMNS)} FROM {TABLE_NAME} WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+        )
+        columns = [col[0] for col in cursor.description]
+        for row in cursor.fetchall():
+            rows[row[0]] = dict(zip(columns, row))
+
+    results = []
+    for point_id, distance in zip(id_list, distances.tolist()):
+        if point_id in rows:
+            rows[point_id]["distance_m"] = distance
+            results.append(rows[point_id])
+    return results
+
+
+@_metrics.instrument()
+def find_within_radius(lat: float, lon: float, meters: float) -> List[Dict[str, Any]]:
+    """
+    Busca os pontos a até `meters` metros de uma coordenada.
+
+    O índice espacial seleciona os candidatos no menor retângulo que contém o
+    círculo; as distâncias (haversine) são calculadas em bloco com NumPy.
+
+    Args:
+        lat: Latitude do centro, em graus decimais.
+        lon: Longitude do centro, em graus decimais.
+        meters: Raio da busca, em metros.
 
-def search_points(query: str = "", field: Optional[str] = None) -> List[Dict[str, Any]]:
+    Returns:
+        list: Dicionários dos pontos encontrados, do mais próximo ao mais
+        distante, cada um com o campo adicional "distance_m".
+
+    Raises:
+        ValueError: Se a coordenada ou o raio forem inválidos.
+    """
+    import numpy as np
+
+    validate_bbox(lat, lon, lat, lon)
+    bbox = radius_bbox(lat, lon, meters)
+
+    with get_connection() as conn:
+        ids, coordinates = _spatial_candidates(conn, bbox)
+        distances = haversine_distances(lat, lon, coordinates[:, 0], coordinates[:, 1])
+        inside = distances <= meters
+        order = np.argsort(distances[inside], kind="stable")
+        results = _points_with_distance(conn, ids[inside][order], distances[inside][order])
+
+    logger.info(f"Encontrados {len(results)} pontos a até {meters} m de ({lat}, {lon})")
+    return results
+
+
+@_metrics.instrument()
+def find_nearest(lat: float, lon: float, k: int = 10, max_distance: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Busca os `k` pontos mais próximos de uma coordenada.
+
+    A busca começa em um raio pequeno e dobra o raio até encontrar `k` pontos
+    dentro dele (ou alcançar `max_distance`); como o raio sempre contém os
+    candidatos aceitos, o resultado é exato.
+
+    Args:
+        lat: Latitude da coordenada, em graus decimais.
+        lon: Longitude da coordenada, em graus decimais.
+        k: Quantidade de pontos desejada.
+        max_distance: Distância máxima, em metros (opcional).
+
+    Returns:
+        list: Até `k` dicionários de pontos, do mais próximo ao mais distante,
+        cada um com o campo adicional "distance_m".
+
+    Raises:
+        ValueError: Se a coordenada, `k` ou `max_distance` forem inválidos.
+    """
+    import numpy as np
+
+    validate_bbox(lat, lon, lat, lon)
+    if k <= 0:
+        raise ValueError("k deve ser maior que zero")
+    if max_distance is not None and max_distance < 0:
+        raise ValueError("A distância máxima não pode ser negativa")
+
+    # Meia circunferência da Terra: a partir daí o retângulo cobre o globo inteiro
+    limit = max_distance if max_distance is not None else 2.0e7
+    radius = min(NEAREST_INITIAL_RADIUS_M, limit)
+
+    with get_connection() as conn:
+        while True:
+            ids, coordinates = _spatial_candidates(conn, radius_bbox(lat, lon, radius))
+            distances = haversine_distances(lat, lon, coordinates[:, 0], coordinates[:, 1])
+            inside = distances <= radius
+            if inside.sum() >= k or radius >= limit:
+                break
+            radius = min(radius * 2, limit)
+
+        ids, distances = ids[inside], distances[inside]
+        if len(ids) > k:
+            nearest = np.argpartition(distances, k - 1)[:k]
+            ids, distances = ids[nearest], distances[nearest]
+        order = np.argsort(distances, kind="stable")
+        results = _points_with_distance(conn, ids[order], distances[order])
+
+    logger.info(f"Encontrados {len(results)} pontos próximos de ({lat}, {lon})")
+    return results
+
+
+def _search_fts(
+    conn: sqlite3.Connection,
+    query: str,
+    field: Optional[str],
+    keys: Optional[List[Tuple[str, bool]]],
+    highlight: bool,
+    bbox: Optional[BoundingBox] = None,
+    markers: Tuple[str, str] = HIGHLIGHT_MARKERS
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Executa a pesquisa pelo índice FTS5.
+
+    Returns:
+        list: Resultados encontrados, ou None se a pesquisa deve recorrer ao LIKE.
+    """
+    match = build_match_query(query, [field] if field else None)
+    if match is None:
+        return None
+
+    fts = fts_table(TABLE_NAME)
+    columns = ", ".join(f"p.{c}" for c in POINT_COLUMNS)
+    if highlight:
+        columns += f", snippet({fts}, -1, ?, ?, '…', 12) AS snippet"
+    # Sem ordenação explícita, os resultados mais relevantes (bm25) vêm primeiro
+    order = f"{fts}.rank" if keys is None else _order_clause(keys, alias="p")
+    where, params = f"{fts} MATCH ?", [match]
+    if highlight:
+        params = list(markers) + params
+    if bbox is not None:
+        condition, bbox_params = _bbox_filter(conn, bbox, alias="p")
+        where += f" AND {condition}"
+        params += bbox_params
+
+    try:
+        cursor = conn.execute(
+            f"SELECT {columns} FROM {fts} JOIN {TABLE_NAME} p ON p.id = {fts}.rowid "
+            f"WHERE {where} ORDER BY {order}",
+            params
+        )
+    except sqlite3.OperationalError as e:
+        logger.warning(f"Pesquisa FTS5 falhou, usando LIKE: {str(e)}")
+        return None
+
+    names = [col[0] for col in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+@_metrics.instrument()
+def search_points(
+    query: str = "",
+    field: Optional[str] = None,
+    sort: Optional[SortSpec] = None,
+    highlight: bool = False,
+    bbox: Optional[BoundingBox] = None,
+    markers: Tuple[str, str] = HIGHLIGHT_MARKERS,
+    substring: bool = False
+) -> List[Dict[str, Any]]:
     """
     Busca pontos de escavação com base em um termo de pesquisa.
 
+    Quando o índice de texto completo (FTS5) está disponível, os campos textuais
+    são pesquisados por ele: cada palavra digitada é tratada como prefixo, os
+    acentos são ignorados e, sem ordenação explícita, os resultados vêm por
+    relevância (bm25). Sem o índice, ou para campos que ele não cobre, a busca
+    usa LIKE sobre os campos, que percorre a tabela inteira.
+
     Args:
         query: Termo de pesquisa a ser buscado nos campos.
         field: Campo específico para limitar a busca (opcional).
+        sort: Especificação de ordenação dos resultados (ver normalize_sort).
+            Se None, ordena por relevância (FTS5) ou por ID (LIKE).
+        highlight: Se True, inclui em cada resultado o campo "snippet", com os
+            termos encontrados destacados (apenas com FTS5).
+        bbox: Retângulo (lat. mínima, lon. mínima, lat. máxima, lon. máxima)
+            ao qual os resultados devem se limitar (opcional).
+        markers: Marcas de início e fim dos termos destacados no trecho
+            (padrão: negrito em Markdown).
+        substring: Se True, usa LIKE mesmo com o índice disponível, para
+            encontrar o termo também no meio das palavras ("mica" em
+            "cerâmica"), ao custo de percorrer a tabela.
 
     Returns:
-        list: Lista de dicionários contendo os pontos encontrados.
+        list: Lista de dicionários contendo os pontos encontrados, já ordenados.
+
+    Raises:
+        ValueError: Se a especificação de ordenação ou o retângulo forem inválidos.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    keys = normalize_sort(sort) if sort is not None else None
+    order_clause = _order_clause(keys or normalize_sort(None))
+    if bbox is not None:
+        bbox = validate_bbox(*bbox)
 
     try:
-        allowed_fields = ["point_type", "latitude", "longitude", "altitude", "description", "discovery_date", "responsible", "srid"]
-        if field and query:
-            if field not in allowed_fields:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+
+            allowed_fields = ["point_type", "latitude", "longitude", "altitude", "description", "discovery_date", "responsible", "srid"]
+            if field and field not in allowed_fields:
                 logger.error(f"Campo inválido para busca: {field}")
-                conn.close()
                 return []
-            sql_query = f"SELECT * FROM {TABLE_NAME} WHERE {field} LIKE ?"
-            cursor.execute(sql_query, (f"%{query}%",))
-        elif query:
-            sql_query = f"SELECT * FROM {TABLE_NAME} WHERE point_type LIKE ? OR description LIKE ? OR responsible LIKE ?"
-            cursor.execute(sql_query, (f"%{query}%", f"%{query}%", f"%{query}%",))
-        else:
-            cursor.execute(f"SELECT * FROM {TABLE_NAME}")
-
-        # Obter nomes das colunas
-        columns = [col[0] for col in cursor.description]
 
-        # Converter resultados em lista de dicionários
-        results = []
-        for row in cursor.fetchall():
-            results.append(dict(zip(columns, row)))
-
-        conn.close()
+            cache_key = (
+                "search", query, field or None, tuple(keys) if keys else None, highlight and tuple(markers), bbox,
+                substring
+            )
+            version = _result_cache.version(DB_PATH)
+            hit, results = _result_cache.get(cache_key, version)
+
+            if not hit:
+                results = None
+                if (
+                    query and not substring and (not field or field in FTS_COLUMNS)
+                    and search_index_exists(conn, TABLE_NAME)
+                ):
+                    results = _search_fts(conn, query, field, keys, highlight, bbox, markers)
+
+                # Sem o índice (ou com um termo que ele não consegue pesquisar), usa LIKE
+                if results is None:
+                    conditions: List[str] = []
+                    params: List[Any] = []
+                    if field and query:
+                        conditions.append(f"{field} LIKE ?")
+                        params.append(f"%{query}%")
+                    elif query:
+                        conditions.append("(point_type LIKE ? OR description LIKE ? OR responsible LIKE ?)")
+                        params.extend([f"%{query}%"] * 3)
+                    if bbox is not None:
+                        condition, bbox_params = _bbox_filter(conn, bbox)
+                        conditions.append(condition)
+                        params.extend(bbox_params)
+
+                    where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+                    cursor.execute(
+                        f"SELECT {', '.join(POINT_COLUMNS)} FROM {TABLE_NAME} {where}ORDER BY {order_clause}", params
+                    )
+
+                    # Obter nomes das colunas
+                    columns = [col[0] for col in cursor.description]
+
+                    # Converter resultados em lista de dicionários
+                    results = []
+                    for row in cursor.fetchall():
+                        results.append(dict(zip(columns, row)))
+
+                _result_cache.put(cache_key, results, version)
+
+        # Cópias, para que alterações feitas pelo chamador não cheguem ao cache
+        results = [dict(r) for r in results]
 
         if results:
             logger.info(f"Encontrados {len(results)} pontos com o termo de pesquisa: {query}")
@@ -363,5 +1870,128 @@ def search_points(query: str = "", field: Optional[str] = None) -> List[Dict[str
         return results
     except Exception as e:
         logger.error(f"Erro na pesquisa: {str(e)}")
-        conn.close()
+        _metrics.record_error("search_points")
         return []
+
+
+class AsyncDatabase:
+    """
+    Fachada assíncrona das operações do banco de dados.
+
+    As operações são executadas por threads dedicadas, donas das suas
+    conexões, sem bloquear o loop de eventos. O número de operações pendentes
+    é limitado por `max_pending`; ao cancelar uma corrotina, a operação é
+    retirada da fila ou, se já estiver em execução, o comando SQL é
+    interrompido.
+
+    Exemplo:
+        async with AsyncDatabase() as adb:
+            point_id = await adb.create_point(point)
+            results = await adb.search_points("cerâmica")
+
+    Args:
+        workers: Quantidade de threads de trabalho.
+        max_pending: Limite de operações enfileiradas ou em execução.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_pending: int = DEFAULT_MAX_PENDING):
+        self._executor = AsyncExecutor(workers=workers, max_pending=max_pending, interrupt=_pool.interrupt)
+
+    @property
+    def pending(self) -> int:
+        """Quantidade aproximada de operações enfileiradas e em execução."""
+        return self._executor.pending
+
+    async def create_point(self, point: Any) -> int:
+        """Versão assíncrona de create_point."""
+        return await self._executor.run(create_point, point)
+
+    async def create_points_bulk(
+        self,
+        points: Iterable[Any],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        atomic: bool = True
+    ) -> List[int]:
+        """Versão assíncrona de create_points_bulk."""
+        return await self._executor.run(create_points_bulk, points, chunk_size, atomic)
+
+    async def get_all_points(self, columns: Optional[Sequence[str]] = None) -> "pd.DataFrame":
+        """Versão assíncrona de get_all_points."""
+        return await self._executor.run(get_all_points, columns)
+
+    async def get_points_page(self, *args: Any, **kwargs: Any) -> PointsPage:
+        """Versão assíncrona de get_points_page."""
+        return await self._executor.run(get_points_page, *args, **kwargs)
+
+    async def count_points(self, estimate: bool = True) -> int:
+        """Versão assíncrona de count_points."""
+        return await self._executor.run(count_points, estimate)
+
+    async def get_point_by_id(self, point_id: int) -> Optional[Any]:
+        """Versão assíncrona de get_point_by_id."""
+        return await self._executor.run(get_point_by_id, point_id)
+
+    async def update_point(self, point: Any) -> bool:
+        """Versão assíncrona de update_point."""
+        return await self._executor.run(update_point, point)
+
+    async def delete_point(self, point_id: int, expected_version: Optional[int] = None) -> bool:
+        """Versão assíncrona de delete_point."""
+        return await self._executor.run(delete_point, point_id, expected_version)
+
+    async def get_points_by_ids(self, ids: Iterable[int]) -> List[Any]:
+        """Versão assíncrona de get_points_by_ids."""
+        return await self._executor.run(get_points_by_ids, list(ids))
+
+    async def update_points_where(self, filter: Dict[str, Any], changes: Dict[str, Any]) -> int:
+        """Versão assíncrona de update_points_where."""
+        return await self._executor.run(update_points_where, filter, changes)
+
+    async def delete_points(self, ids: Iterable[int]) -> int:
+        """Versão assíncrona de delete_points."""
+        return await self._executor.run(delete_points, list(ids))
+
+    async def search_points(self, *args: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+        """Versão assíncrona de search_points."""
+        return await self._executor.run(search_points, *args, **kwargs)
+
+    async def get_points_in_bbox(self, *args: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+        """Versão assíncrona de get_points_in_bbox."""
+        return await self._executor.run(get_points_in_bbox, *args, **kwargs)
+
+    async def find_within_radius(self, lat: float, lon: float, meters: float) -> List[Dict[str, Any]]:
+        """Versão assíncrona de find_within_radius."""
+        return await self._executor.run(find_within_radius, lat, lon, meters)
+
+    async def find_nearest(self, *args: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+        """Versão assíncrona de find_nearest."""
+        return await self._executor.run(find_nearest, *args, **kwargs)
+
+    async def export_points(self, target: Any, fmt: str = "csv", batch_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """Versão assíncrona de export_points."""
+        return await self._executor.run(export_points, target, fmt, batch_size)
+
+    def close(self, wait: bool = True) -> None:
+        """Encerra as threads de trabalho, cancelando as operações ainda na fila."""
+        self._executor.shutdown(wait=wait)
+
+    async def aclose(self) -> None:
+        """Encerra as threads de trabalho sem bloquear o loop de eventos."""
+        await self._executor.aclose()
+
+    async def __aenter__(self) -> "AsyncDatabase":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+
+# Em produção, o registro de consultas lentas pode ser ativado sem alterar o
+# código, pela variável de ambiente SITAI_SLOW_QUERY_MS (limite em milissegundos)
+if os.environ.get("SITAI_SLOW_QUERY_MS"):
+    enable_slow_query_log(threshold_ms=float(os.environ["SITAI_SLOW_QUERY_MS"]))
+
+# Com várias sessões gravando ao mesmo tempo (por exemplo, no aplicativo), a
+# fila de escrita com confirmação em grupo é ativada por SITAI_WRITE_QUEUE=1
+if os.environ.get("SITAI_WRITE_QUEUE") == "1":
+    enable_write_queue()
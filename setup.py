@@ -1,4 +1,4 @@
-from setuptools import setup, find_packages
+from setuptools import setup, find_namespace_packages
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -15,7 +15,9 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/seu-usuario/sitai",
-    packages=find_packages(),
+    packages=find_namespace_packages(include=["sitai", "sitai.*"]),
+    py_modules=["database"],
+    package_data={"sitai": ["images/*.png"]},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -25,7 +27,7 @@ setup(
     install_requires=requirements,
     entry_points={
         "console_scripts": [
-            "sitai=sitai.app:main",
+            "sitai=sitai.cli:main",
         ],
     },
 )
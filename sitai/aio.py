@@ -0,0 +1,185 @@
+"""
+Execução de operações bloqueantes de banco de dados a partir de código assíncrono.
+
+O SQLite não tem API assíncrona: cada consulta bloqueia a thread que a executa.
+O executor deste módulo mantém um pequeno conjunto de threads dedicadas, que
+são as donas das conexões, e expõe as operações como corrotinas. A quantidade
+de operações pendentes é limitada (quem excede o limite aguarda uma vaga, sem
+bloquear o loop de eventos), e o cancelamento de uma corrotina retira a
+operação da fila ou, se ela já estiver em execução, interrompe o comando SQL.
+"""
+
+import asyncio
+import queue
+import threading
+import weakref
+import logging
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING = 64
+# Intervalo, em segundos, entre novas interrupções de uma operação cancelada
+INTERRUPT_RETRY_S = 0.05
+
+
+class ExecutorClosedError(RuntimeError):
+    """Operação enviada a um executor já encerrado."""
+
+
+class AsyncExecutor:
+    """
+    Executor de threads dedicadas para operações de banco de dados.
+
+    Args:
+        workers: Quantidade de threads de trabalho.
+        max_pending: Limite de operações enfileiradas ou em execução por loop
+            de eventos; as corrotinas excedentes aguardam uma vaga.
+        interrupt: Função chamada com a thread de trabalho para interromper a
+            operação em execução quando ela é cancelada (opcional).
+        name: Prefixo do nome das threads.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        interrupt: Optional[Callable[[threading.Thread], Any]] = None,
+        name: str = "sitai-db",
+    ):
+        if workers <= 0 or max_pending <= 0:
+            raise ValueError("workers e max_pending devem ser maiores que zero")
+        self.max_pending = max_pending
+        self._interrupt = interrupt
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._running: Dict[int, Future] = {}
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._closed = False
+        self._threads: List[threading.Thread] = []
+        for index in range(workers):
+            thread = threading.Thread(target=self._work, name=f"{name}-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """Enfileira a operação e retorna um Future (sem limite de pendências)."""
+        future: "Future[T]" = Future()
+        with self._lock:
+            if self._closed:
+                raise ExecutorClosedError("O executor já foi encerrado")
+            self._queue.put((future, func, args, kwargs))
+        return future
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Executa a operação em uma thread de trabalho e aguarda o resultado.
+
+        Se a corrotina for cancelada, a operação é descartada enquanto ainda
+        estiver na fila; se já estiver em execução, é interrompida.
+        """
+        async with self._semaphore():
+            future = self.submit(func, *args, **kwargs)
+            try:
+                return await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                # wrap_future já tentou cancelar; se a operação estava em
+                # execução, o cancelamento falhou e é preciso interrompê-la
+                if not future.cancelled():
+                    self._keep_interrupting(future, asyncio.get_running_loop())
+                raise
+
+    @property
+    def pending(self) -> int:
+        """Quantidade aproximada de operações enfileiradas e em execução."""
+        with self._lock:
+            return self._queue.qsize() + len(self._running)
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = True) -> None:
+        """
+        Encerra o executor.
+
+        Args:
+            wait: Se True, aguarda o término das threads de trabalho.
+            cancel_pending: Se True, cancela as operações ainda na fila.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if cancel_pending:
+                while True:
+                    try:
+                        job = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if job is not None:
+                        job[0].cancel()
+            for _ in self._threads:
+                self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    async def aclose(self) -> None:
+        """Encerra o executor sem bloquear o loop de eventos."""
+        await asyncio.get_running_loop().run_in_executor(None, self.shutdown)
+
+    async def __aenter__(self) -> "AsyncExecutor":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Um semáforo asyncio pertence a um único loop de eventos
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_pending)
+            return semaphore
+
+    def _keep_interrupting(self, future: Future, loop: asyncio.AbstractEventLoop) -> None:
+        # A interrupção do SQLite só afeta comandos já em execução; repete-se
+        # até a operação terminar, para alcançar também comandos iniciados
+        # logo depois do cancelamento
+        if future.done():
+            return
+        self._interrupt_running(future)
+        loop.call_later(INTERRUPT_RETRY_S, self._keep_interrupting, future, loop)
+
+    def _interrupt_running(self, future: Future) -> None:
+        with self._lock:
+            for thread in self._threads:
+                if self._running.get(thread.ident or 0) is future and self._interrupt is not None:
+                    self._interrupt(thread)
+                    logger.info(f"Operação cancelada interrompida na thread {thread.name}")
+
+    def _work(self) -> None:
+        ident = threading.get_ident()
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            future, func, args, kwargs = job
+            with self._lock:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self._running[ident] = future
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                with self._lock:
+                    self._running.pop(ident, None)
+                future.set_exception(e)
+            else:
+                with self._lock:
+                    self._running.pop(ident, None)
+                future.set_result(result)
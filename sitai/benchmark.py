@@ -0,0 +1,310 @@
+"""
+Medição de desempenho das operações do banco de dados em vários volumes de dados.
+
+Para cada volume (por padrão 10 mil, 100 mil e 1 milhão de pontos), um banco
+temporário é preenchido e as operações de cadastro, leitura, pesquisa,
+alteração e remoção são cronometradas. Os resultados são gravados em JSON,
+junto com as versões do Python e do SQLite e o commit do repositório, para que
+execuções em commits diferentes possam ser comparadas.
+
+Uso:
+    python -m sitai.benchmark --sizes 10000 100000 --output resultados.json
+    python -m sitai.benchmark --compare antes.json depois.json
+
+Os mesmos cenários rodam pelo pytest com `pytest -m slow` (ver
+tests/test_benchmarks.py).
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import logging
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_REPEAT = 200
+# Chamadas das operações que percorrem a tabela (leitura completa e pesquisas)
+SCAN_REPEAT = 3
+DEFAULT_SEED = 42
+# Aumento relativo da mediana a partir do qual uma operação é considerada mais lenta
+DEFAULT_REGRESSION_THRESHOLD = 0.2
+
+# Termos pesquisados em cada campo, e em todos os campos (None)
+SEARCH_TERMS = {
+    "point_type": "cabana",
+    "description": "cerâmica",
+    "responsible": "Souza",
+    None: "flecha",
+}
+
+
+@dataclass
+class BenchmarkResult:
+    """Tempos de uma operação em um volume de dados, em segundos."""
+    size: int
+    operation: str
+    calls: int
+    rows: int
+    total_s: float
+    mean_s: float
+    median_s: float
+    p95_s: float
+    min_s: float
+    max_s: float
+
+    @property
+    def ops_per_second(self) -> float:
+        """Chamadas por segundo."""
+        return self.calls / self.total_s if self.total_s else 0.0
+
+
+def summarize(size: int, operation: str, timings: Sequence[float], rows: int = 0) -> BenchmarkResult:
+    """Resume os tempos de várias chamadas de uma operação."""
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return BenchmarkResult(
+        size=size,
+        operation=operation,
+        calls=len(ordered),
+        rows=rows,
+        total_s=sum(ordered),
+        mean_s=statistics.fmean(ordered),
+        median_s=statistics.median(ordered),
+        p95_s=p95,
+        min_s=ordered[0],
+        max_s=ordered[-1],
+    )
+
+
+def sample_points(count: int, seed: int = DEFAULT_SEED) -> Iterator[Any]:
+    """Gera pontos sintéticos determinísticos (ver sitai.synthetic) para preencher o banco."""
+    from sitai.synthetic import CatalogueGenerator
+
+    return CatalogueGenerator(seed=seed).iter_points(count)
+
+
+def _timed(func: Callable[..., Any], *args: Any, **kwargs: Any) -> tuple:
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+
+@contextmanager
+def temporary_database(db: Any, path: str) -> Iterator[None]:
+    """Aponta o módulo de banco para um arquivo temporário e restaura o original ao final."""
+    original_path = db.DB_PATH
+    db_logger = logging.getLogger(db.__name__)
+    original_level = db_logger.level
+    # As mensagens INFO de cada chamada distorceriam os tempos e inundariam a saída
+    db_logger.setLevel(logging.WARNING)
+    db.close_connections()
+    db.DB_PATH = path
+    try:
+        db.init_db()
+        yield
+    finally:
+        db.close_connections()
+        db.DB_PATH = original_path
+        db_logger.setLevel(original_level)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+def run_size(db: Any, size: int, repeat: int = DEFAULT_REPEAT, seed: int = DEFAULT_SEED,
+             workdir: Optional[str] = None) -> List[BenchmarkResult]:
+    """
+    Mede as operações do banco com `size` pontos cadastrados.
+
+    Args:
+        db: Módulo de banco de dados (database).
+        size: Quantidade de pontos inseridos antes das medições.
+        repeat: Quantidade de chamadas das operações pontuais.
+        seed: Semente dos dados e das escolhas aleatórias.
+        workdir: Diretório do banco temporário (opcional).
+
+    Returns:
+        list: Um BenchmarkResult por operação.
+    """
+    rng = random.Random(seed)
+    fd, path = tempfile.mkstemp(prefix=f"sitai_bench_{size}_", suffix=".db", dir=workdir)
+    os.close(fd)
+    os.remove(path)
+    results: List[BenchmarkResult] = []
+
+    with temporary_database(db, path):
+        elapsed, ids = _timed(db.create_points_bulk, sample_points(size, seed), chunk_size=5000)
+        results.append(summarize(size, "create_points_bulk", [elapsed], rows=len(ids)))
+
+        new_points = list(sample_points(repeat, seed + 1))
+        timings = [_timed(db.create_point, point)[0] for point in new_points]
+        results.append(summarize(size, "create_point", timings, rows=repeat))
+
+        # Leituras sem cache e releituras atendidas pelo cache de resultados; a
+        # primeira chamada, descartada, importa o pandas
+        db.get_all_points(columns=["id"])
+        timings, cached_timings = [], []
+        for _ in range(SCAN_REPEAT):
+            db.clear_cache()
+            elapsed, df = _timed(db.get_all_points)
+            timings.append(elapsed)
+            cached_timings.append(_timed(db.get_all_points)[0])
+            rows = len(df)
+            del df
+        results.append(summarize(size, "get_all_points", timings, rows=rows))
+        results.append(summarize(size, "get_all_points_cached", cached_timings, rows=rows))
+
+        sample_ids = rng.sample(ids, min(repeat, len(ids)))
+        timings = [_timed(db.get_point_by_id, point_id)[0] for point_id in sample_ids]
+        results.append(summarize(size, "get_point_by_id", timings, rows=len(sample_ids)))
+
+        for field, term in SEARCH_TERMS.items():
+            timings = []
+            for _ in range(SCAN_REPEAT):
+                db.clear_cache()
+                elapsed, found = _timed(db.search_points, term, field)
+                timings.append(elapsed)
+            results.append(summarize(size, f"search_points[{field or 'all'}]", timings, rows=len(found)))
+
+        points = [db.get_point_by_id(point_id) for point_id in sample_ids]
+        for point in points:
+            point.description = f"{point.description} (revisado)"
+        timings = [_timed(db.update_point, point)[0] for point in points]
+        results.append(summarize(size, "update_point", timings, rows=len(points)))
+
+        timings = [_timed(db.delete_point, point_id)[0] for point_id in sample_ids]
+        results.append(summarize(size, "delete_point", timings, rows=len(sample_ids)))
+
+    for result in results:
+        logger.info(
+            f"{size} pontos - {result.operation}: mediana {result.median_s * 1000:.3f} ms, "
+            f"p95 {result.p95_s * 1000:.3f} ms ({result.calls} chamadas)"
+        )
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    """Commit atual do repositório, se disponível."""
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def run_benchmarks(db: Any, sizes: Sequence[int] = DEFAULT_SIZES, repeat: int = DEFAULT_REPEAT,
+                   seed: int = DEFAULT_SEED, workdir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Executa as medições para cada volume de dados.
+
+    Returns:
+        dict: Metadados da execução e lista de resultados, pronta para JSON.
+    """
+    results: List[BenchmarkResult] = []
+    for size in sizes:
+        results.extend(run_size(db, size, repeat=repeat, seed=seed, workdir=workdir))
+    return {
+        "metadata": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "sizes": list(sizes),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": [dict(asdict(r), ops_per_second=r.ops_per_second) for r in results],
+    }
+
+
+def save_results(report: Dict[str, Any], path: str) -> None:
+    """Grava o relatório das medições em JSON."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    logger.info(f"Resultados das medições gravados em {path}")
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compara duas execuções pelas medianas de cada operação e volume.
+
+    Args:
+        baseline: Relatório de referência (por exemplo, do commit anterior).
+        current: Relatório a ser avaliado.
+        threshold: Aumento relativo da mediana considerado regressão.
+
+    Returns:
+        list: Para cada operação presente nos dois relatórios, as medianas, a
+        variação relativa e se ela ultrapassa o limite.
+    """
+    previous = {(r["size"], r["operation"]): r for r in baseline["results"]}
+    comparison = []
+    for result in current["results"]:
+        before = previous.get((result["size"], result["operation"]))
+        if before is None or not before["median_s"]:
+            continue
+        change = result["median_s"] / before["median_s"] - 1
+        comparison.append({
+            "size": result["size"],
+            "operation": result["operation"],
+            "baseline_median_s": before["median_s"],
+            "median_s": result["median_s"],
+            "change": change,
+            "regression": change > threshold,
+        })
+    return comparison
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Executa as medições ou compara dois relatórios pela linha de comando."""
+    parser = argparse.ArgumentParser(prog="python -m sitai.benchmark", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("REFERENCIA", "ATUAL"))
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.compare:
+        reports = []
+        for path in args.compare:
+            with open(path, encoding="utf-8") as f:
+                reports.append(json.load(f))
+        comparison = compare_results(reports[0], reports[1], args.threshold)
+        for row in comparison:
+            flag = "  REGRESSÃO" if row["regression"] else ""
+            print(f"{row['size']:>9} {row['operation']:<28} {row['baseline_median_s'] * 1000:10.3f} ms "
+                  f"-> {row['median_s'] * 1000:10.3f} ms ({row['change']:+.1%}){flag}")
+        return 1 if any(row["regression"] for row in comparison) else 0
+
+    import database as db
+
+    report = run_benchmarks(db, args.sizes, repeat=args.repeat, seed=args.seed)
+    save_results(report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Cache de resultados de consultas com invalidação por versão dos dados.
+
+Cada resultado é guardado junto com a versão dos dados em que foi lido. A versão
+combina o `PRAGMA data_version` lido por uma conexão de sonda dedicada (que muda
+sempre que qualquer outra conexão, inclusive de outro processo, confirma uma
+escrita) com um contador de gerações incrementado pelas próprias funções de
+escrita. Quando a versão muda, os resultados antigos deixam de ser servidos e são
+descartados. O cache é limitado em quantidade de entradas e em memória estimada,
+com descarte dos resultados menos usados recentemente (LRU).
+"""
+
+import sys
+import sqlite3
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional, Tuple
+from urllib.request import pathname2url
+
+from sitai.connection import MEMORY_PATH, file_identity
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Versão dos dados: (abertura da sonda, PRAGMA data_version, geração de escritas)
+DataVersion = Tuple[int, int, int]
+
+
+@dataclass
+class CacheStats:
+    """Contadores de uso do cache de resultados."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fração das consultas atendidas pelo cache."""
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estima, em bytes, a memória ocupada por um resultado.
+
+    DataFrames usam a contagem do próprio pandas; listas, dicionários e modelos
+    são percorridos somando o tamanho de cada valor. A estimativa serve apenas
+    para o limite de memória do cache, não precisa ser exata.
+    """
+    memory_usage = getattr(value, "memory_usage", None)
+    if callable(memory_usage):
+        try:
+            return int(memory_usage(deep=True).sum())
+        except TypeError:
+            pass
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + estimate_size(vars(value))
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Cache LRU, compartilhado entre threads, de resultados versionados.
+
+    Uso típico: obter a versão atual com `version`, procurar o resultado com
+    `get` e, em caso de falta, executar a consulta e guardá-la com `put`,
+    informando a mesma versão.
+
+    Args:
+        max_entries: Quantidade máxima de resultados guardados (0 desativa o cache).
+        max_bytes: Memória estimada máxima ocupada pelos resultados.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_entries < 0 or max_bytes < 0:
+            raise ValueError("max_entries e max_bytes não podem ser negativos")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[Hashable, DataVersion], Tuple[Any, int]]" = OrderedDict()
+        self._stats = CacheStats()
+        self._generation = 0
+        self._epoch = 0
+        self._last_version: Optional[DataVersion] = None
+        self._probe: Optional[sqlite3.Connection] = None
+        self._probe_path: Optional[str] = None
+        self._probe_identity: Optional[Tuple[int, int]] = None
+
+    def version(self, db_path: str) -> Optional[DataVersion]:
+        """
+        Retorna a versão atual dos dados do banco.
+
+        Returns:
+            tuple: Versão dos dados, ou None se ela não puder ser determinada
+            (banco em memória ou arquivo inexistente); nesse caso o resultado
+            não deve ser guardado.
+        """
+        if db_path == MEMORY_PATH:
+            return None
+        with self._lock:
+            identity = file_identity(db_path)
+            if identity is None:
+                self._close_probe()
+                return None
+            if self._probe is None or self._probe_path != db_path or self._probe_identity != identity:
+                # Outro arquivo (ou o mesmo caminho recriado): nada do que está
+                # guardado vale para ele
+                self._close_probe()
+                try:
+                    self._probe = sqlite3.connect(
+                        f"file:{pathname2url(db_path)}?mode=ro", uri=True, check_same_thread=False
+                    )
+                except sqlite3.Error as e:
+                    logger.warning(f"Não foi possível abrir a sonda de versão do cache: {str(e)}")
+                    return None
+                self._probe_path = db_path
+                self._probe_identity = identity
+                self._epoch += 1
+
+            data_version = self._probe.execute("PRAGMA data_version").fetchone()[0]
+            current = (self._epoch, data_version, self._generation)
+            if current != self._last_version:
+                self._drop_all()
+                self._last_version = current
+            return current
+
+    def get(self, key: Hashable, version: Optional[DataVersion]) -> Tuple[bool, Any]:
+        """
+        Procura o resultado da consulta na versão informada.
+
+        Returns:
+            tuple: (True, resultado) se encontrado; (False, None) caso contrário.
+        """
+        with self._lock:
+            if version is None or self.max_entries == 0:
+                self._stats.misses += 1
+                return False, None
+            entry = self._entries.get((key, version))
+            if entry is None:
+                self._stats.misses += 1
+                return False, None
+            self._entries.move_to_end((key, version))
+            self._stats.hits += 1
+            return True, entry[0]
+
+    def put(self, key: Hashable, value: Any, version: Optional[DataVersion]) -> None:
+        """Guarda o resultado lido na versão informada, se ela ainda for a atual."""
+        if version is None or self.max_entries == 0:
+            return
+        size = estimate_size(value)
+        with self._lock:
+            # Uma escrita confirmada depois da leitura torna o resultado obsoleto
+            if version != self._last_version or version[2] != self._generation:
+                return
+            if size > self.max_bytes:
+                return
+            previous = self._entries.pop((key, version), None)
+            if previous is not None:
+                self._stats.size_bytes -= previous[1]
+            self._entries[(key, version)] = (value, size)
+            self._stats.size_bytes += size
+            while len(self._entries) > self.max_entries or self._stats.size_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._stats.size_bytes -= evicted_size
+                self._stats.evictions += 1
+
+    def invalidate(self) -> None:
+        """Descarta todos os resultados; chamada pelas funções de escrita."""
+        with self._lock:
+            self._generation += 1
+            self._drop_all()
+
+    def clear(self) -> None:
+        """Descarta os resultados, zera os contadores e fecha a sonda de versão."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._stats = CacheStats()
+            self._close_probe()
+
+    def stats(self) -> CacheStats:
+        """Retorna uma cópia dos contadores de uso."""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                invalidations=self._stats.invalidations,
+                entries=len(self._entries),
+                size_bytes=self._stats.size_bytes,
+            )
+
+    def _drop_all(self) -> None:
+        """Descarta todas as entradas (exige o lock)."""
+        if self._entries:
+            self._stats.invalidations += 1
+        self._entries.clear()
+        self._stats.size_bytes = 0
+
+    def _close_probe(self) -> None:
+        """Fecha a conexão de sonda, se houver (exige o lock)."""
+        if self._probe is not None:
+            try:
+                self._probe.close()
+            except sqlite3.Error:
+                pass
+        self._probe = None
+        self._probe_path = None
+        self._probe_identity = None
+        self._last_version = None
@@ -0,0 +1,271 @@
+"""
+Linha de comando do SITAI para operações em lote, sem a interface Streamlit.
+
+Uso:
+    sitai import pontos.csv --errors rejeitados.csv
+    sitai export --format geojson --output pontos.geojson
+    sitai query cerâmica --field point_type --format json
+    sitai query --near -3.119 -60.021 --radius 5000
+    sitai stats
+    sitai vacuum
+    sitai generate 1000000 --seed 42
+    sitai --metrics /var/lib/node_exporter/sitai.prom import pontos.csv
+    sitai --slow-log lentas.log --slow-ms 50 query cerâmica
+    sitai slow-queries lentas.log --top 5 --plan
+
+O módulo de banco de dados é importado apenas depois da leitura dos argumentos,
+e o pandas e o Streamlit nunca são carregados por estes comandos, de modo que
+tarefas agendadas (cron) iniciam rapidamente.
+"""
+
+import os
+import sys
+import csv
+import json
+import sqlite3
+import logging
+import argparse
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Monta o analisador de argumentos com os subcomandos disponíveis."""
+    parser = argparse.ArgumentParser(
+        prog="sitai",
+        description="Sistema de Catalogação de Escavações Arqueológicas - operações em lote"
+    )
+    parser.add_argument("--db", help="Caminho do arquivo do banco de dados (padrão: data/database.db)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Exibe as mensagens de log")
+    parser.add_argument(
+        "--metrics", metavar="ARQUIVO",
+        help="Grava as métricas das operações (formato Prometheus) ao final do comando"
+    )
+    parser.add_argument("--slow-log", metavar="ARQUIVO", help="Registra os comandos SQL lentos neste arquivo")
+    parser.add_argument(
+        "--slow-ms", type=float, default=100.0, help="Duração mínima, em ms, de um comando registrado (padrão: 100)"
+    )
+    commands = parser.add_subparsers(dest="command", metavar="comando")
+    commands.required = True
+
+    importer = commands.add_parser("import", help="Importa pontos de uma planilha CSV ou XLSX")
+    importer.add_argument("path", help="Arquivo CSV ou XLSX")
+    importer.add_argument("--errors", dest="error_report", help="Relatório CSV das linhas rejeitadas")
+    importer.add_argument("--batch-size", type=int, default=1000, help="Linhas gravadas por transação")
+    importer.add_argument("--workers", type=int, help="Processos de validação (0 valida no processo atual)")
+
+    exporter = commands.add_parser("export", help="Exporta todos os pontos em CSV ou GeoJSON")
+    exporter.add_argument("--format", dest="fmt", choices=["csv", "geojson"], default="csv")
+    exporter.add_argument("-o", "--output", default="-", help="Arquivo de destino ('-' para a saída padrão)")
+    exporter.add_argument("--batch-size", type=int, default=1000, help="Linhas lidas do banco por vez")
+
+    query = commands.add_parser("query", help="Pesquisa pontos por texto, área ou proximidade")
+    query.add_argument("term", nargs="?", default="", help="Termo de pesquisa")
+    query.add_argument("--field", help="Campo ao qual a pesquisa se limita")
+    query.add_argument("--sort", help="Ordenação, por exemplo '-discovery_date, id'")
+    query.add_argument(
+        "--substring", action="store_true", help="Encontra o termo também no meio das palavras (percorre a tabela)"
+    )
+    query.add_argument(
+        "--bbox", nargs=4, type=float, metavar=("MIN_LAT", "MIN_LON", "MAX_LAT", "MAX_LON"),
+        help="Limita os resultados a um retângulo"
+    )
+    query.add_argument("--near", nargs=2, type=float, metavar=("LAT", "LON"), help="Busca por proximidade")
+    query.add_argument("--radius", type=float, help="Raio, em metros, da busca por proximidade")
+    query.add_argument("--limit", type=int, help="Quantidade máxima de resultados")
+    query.add_argument("--format", dest="fmt", choices=["csv", "json"], default="csv")
+
+    commands.add_parser("stats", help="Exibe estatísticas do banco de dados")
+    commands.add_parser("vacuum", help="Compacta o arquivo do banco de dados")
+
+    generator = commands.add_parser("generate", help="Grava um catálogo sintético para testes de carga")
+    generator.add_argument("count", type=int, help="Quantidade de pontos")
+    generator.add_argument("--seed", type=int, default=42, help="Semente do gerador")
+    generator.add_argument("--sites", type=int, default=2000, help="Quantidade de sítios")
+
+    slow = commands.add_parser("slow-queries", help="Resume o log de consultas lentas")
+    slow.add_argument("path", nargs="?", help="Arquivo do log (padrão: data/slow_queries.log)")
+    slow.add_argument("--top", type=int, default=10, help="Quantidade de comandos exibidos")
+    slow.add_argument("--sort", choices=["total", "max", "count"], default="total", help="Critério de ordenação")
+    slow.add_argument("--plan", action="store_true", help="Exibe o plano da ocorrência mais lenta")
+    return parser
+
+
+def _require_database(db: Any) -> None:
+    """Interrompe comandos de leitura quando o banco ainda não existe."""
+    if not os.path.exists(db.DB_PATH):
+        raise FileNotFoundError(f"Banco de dados não encontrado: {db.DB_PATH}")
+
+
+def _write_rows(rows: List[Dict[str, Any]], fmt: str, out: Any) -> None:
+    """Grava os resultados de uma consulta em CSV ou em JSON (um objeto por linha)."""
+    if fmt == "json":
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return
+    if not rows:
+        return
+    writer = csv.DictWriter(out, fieldnames=list(rows[0]), extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def cmd_import(db: Any, args: argparse.Namespace, out: Any) -> int:
+    """Importa uma planilha e exibe o resumo da importação."""
+    db.init_db()
+    result = db.import_points_file(
+        args.path, error_report=args.error_report, batch_size=args.batch_size, workers=args.workers
+    )
+    out.write(f"Linhas lidas: {result.total_rows}\n")
+    out.write(f"Importadas: {result.imported}\n")
+    out.write(f"Rejeitadas: {result.rejected}\n")
+    if result.rejected and result.error_report:
+        out.write(f"Relatório de erros: {result.error_report}\n")
+    return 0 if result.rejected == 0 else 2
+
+
+def cmd_export(db: Any, args: argparse.Namespace, out: Any) -> int:
+    """Exporta todos os pontos para um arquivo ou para a saída padrão."""
+    _require_database(db)
+    db.init_db()
+    target = out if args.output == "-" else args.output
+    db.export_points(target, fmt=args.fmt, batch_size=args.batch_size)
+    return 0
+
+
+def cmd_query(db: Any, args: argparse.Namespace, out: Any) -> int:
+    """Pesquisa pontos e grava os resultados em CSV ou JSON."""
+    _require_database(db)
+    db.init_db()
+    if args.near is not None:
+        if args.term or args.field or args.bbox:
+            raise ValueError("--near não pode ser combinado com termo, --field ou --bbox")
+        lat, lon = args.near
+        if args.radius is not None:
+            rows = db.find_within_radius(lat, lon, args.radius)
+        else:
+            rows = db.find_nearest(lat, lon, k=args.limit or 10)
+    else:
+        if args.radius is not None:
+            raise ValueError("--radius exige --near")
+        rows = db.search_points(
+            args.term, field=args.field, sort=args.sort, bbox=args.bbox, substring=args.substring
+        )
+    if args.limit is not None:
+        rows = rows[:args.limit]
+    _write_rows(rows, args.fmt, out)
+    return 0
+
+
+def cmd_stats(db: Any, args: argparse.Namespace, out: Any) -> int:
+    """Exibe a quantidade de pontos e o tamanho dos arquivos do banco."""
+    _require_database(db)
+    db.init_db()
+    wal_path = f"{db.DB_PATH}-wal"
+    stats = [
+        ("Banco de dados", db.DB_PATH),
+        ("Versão do esquema", db.get_db_schema_version()),
+        ("Pontos cadastrados", db.count_points(estimate=False)),
+        ("Tamanho do arquivo (bytes)", os.path.getsize(db.DB_PATH)),
+        ("Tamanho do WAL (bytes)", os.path.getsize(wal_path) if os.path.exists(wal_path) else 0),
+    ]
+    for label, value in stats:
+        out.write(f"{label}: {value}\n")
+    return 0
+
+
+def cmd_vacuum(db: Any, args: argparse.Namespace, out: Any) -> int:
+    """Compacta o banco de dados e exibe o tamanho antes e depois."""
+    _require_database(db)
+    db.init_db()
+    before, after = db.vacuum_db()
+    out.write(f"Tamanho antes: {before} bytes\n")
+    out.write(f"Tamanho depois: {after} bytes\n")
+    return 0
+
+
+def cmd_generate(db: Any, args: argparse.Namespace, out: Any) -> int:
+    """Grava pontos sintéticos agrupados em sítios da bacia amazônica."""
+    from sitai.synthetic import generate_catalogue
+
+    if args.count <= 0:
+        raise ValueError("A quantidade de pontos deve ser maior que zero")
+    db.init_db()
+    written = generate_catalogue(db, args.count, seed=args.seed, site_count=args.sites)
+    out.write(f"Pontos gerados: {written}\n")
+    return 0
+
+
+def cmd_slow_queries(db: Any, args: argparse.Namespace, out: Any) -> int:
+    """Exibe os comandos que mais pesaram no log de consultas lentas."""
+    from sitai.slowlog import read_slow_log, summarize_slow_log
+
+    path = args.path or db.SLOW_QUERY_LOG_PATH
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Log de consultas lentas não encontrado: {path}")
+    stats = summarize_slow_log(read_slow_log(path), sort=args.sort)
+    out.write(f"{'Ocorr.':>7} {'Total ms':>11} {'Máx. ms':>10} {'Média ms':>10} {'Linhas':>8}  Comando\n")
+    for item in stats[:args.top]:
+        errors = f" [{item.errors} erro(s)]" if item.errors else ""
+        out.write(
+            f"{item.count:>7} {item.total_ms:>11.1f} {item.max_ms:>10.1f} {item.mean_ms:>10.1f} "
+            f"{item.rows:>8}  {item.sql}{errors}\n"
+        )
+        if args.plan:
+            out.write(f"{'':>8}Parâmetros: {json.dumps(item.params, ensure_ascii=False)}\n")
+            for line in item.plan or ["(sem plano)"]:
+                out.write(f"{'':>8}{line}\n")
+    return 0
+
+
+COMMANDS = {
+    "import": cmd_import,
+    "export": cmd_export,
+    "query": cmd_query,
+    "stats": cmd_stats,
+    "vacuum": cmd_vacuum,
+    "generate": cmd_generate,
+    "slow-queries": cmd_slow_queries,
+}
+
+
+def main(argv: Optional[Sequence[str]] = None, out: Any = None) -> int:
+    """
+    Ponto de entrada do comando `sitai`.
+
+    Args:
+        argv: Argumentos da linha de comando (por padrão, sys.argv).
+        out: Destino da saída dos comandos (por padrão, sys.stdout).
+
+    Returns:
+        int: Código de saída: 0 em caso de sucesso, 1 em caso de erro e 2
+        quando uma importação rejeita linhas.
+    """
+    args = build_parser().parse_args(argv)
+    out = out or sys.stdout
+
+    # Configura o log antes de importar o módulo de banco, que também o configura
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    import database as db
+
+    if args.db:
+        db.DB_PATH = os.path.abspath(args.db)
+    if args.metrics:
+        db.enable_metrics()
+    if args.slow_log:
+        db.enable_slow_query_log(args.slow_log, threshold_ms=args.slow_ms)
+    try:
+        return COMMANDS[args.command](db, args, out)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        sys.stderr.write(f"Erro: {e}\n")
+        return 1
+    finally:
+        db.close_connections()
+        if args.metrics:
+            db.export_metrics(args.metrics)
+        if args.slow_log:
+            db.disable_slow_query_log()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,416 @@
+"""
+Armazenamento colunar em memória dos pontos de escavação, para análises.
+
+O catálogo inteiro é mantido em arrays NumPy, um por coluna: coordenadas,
+altitude e datas em arrays numéricos e os textos codificados por dicionário
+(um array de códigos inteiros e a lista dos valores distintos). Não há um
+objeto Python por linha, e os filtros produzem máscaras booleanas calculadas
+de forma vetorizada.
+
+A atualização é incremental. Como os IDs são atribuídos com AUTOINCREMENT e
+nunca reutilizados, as linhas novas são as de ID maior que o último carregado;
+alterações e exclusões são registradas por gatilhos em uma tabela de mudanças
+(uma linha por ponto, com o número de sequência da última mudança), de modo que
+apenas as linhas alteradas são relidas.
+"""
+
+import sqlite3
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50000
+
+NUMERIC_COLUMNS = ("latitude", "longitude", "altitude")
+STRING_COLUMNS = ("point_type", "description", "responsible", "srid")
+DATE_COLUMN = "discovery_date"
+STORE_COLUMNS = ("id",) + NUMERIC_COLUMNS + (DATE_COLUMN,) + STRING_COLUMNS
+DATE_DTYPE = "datetime64[us]"
+# Linha da tabela de mudanças (sem ponto correspondente, pois os IDs começam
+# em 1) que guarda a maior sequência já descartada por prune_change_log
+PRUNED_MARKER_ID = 0
+
+
+def change_log_table(table: str) -> str:
+    """Nome da tabela de mudanças associada à tabela informada."""
+    return f"{table}_changes"
+
+
+def create_change_log(conn: sqlite3.Connection, table: str) -> None:
+    """
+    Cria a tabela de mudanças e os gatilhos de alteração e exclusão.
+
+    Inserções não são registradas: com AUTOINCREMENT, toda linha nova tem ID
+    maior que os já existentes. Cada ponto ocupa no máximo uma linha na tabela
+    de mudanças, com a sequência da sua última alteração.
+    """
+    log = change_log_table(table)
+    next_seq = f"COALESCE((SELECT MAX(seq) FROM {log}), 0) + 1"
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {log} (point_id INTEGER PRIMARY KEY, seq INTEGER NOT NULL)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{log}_seq ON {log} (seq)")
+    conn.execute(
+        f"CREATE TRIGGER IF NOT EXISTS trg_{log}_update AFTER UPDATE ON {table} BEGIN "
+        f"INSERT OR REPLACE INTO {log} (point_id, seq) VALUES (old.id, {next_seq}); "
+        f"INSERT OR REPLACE INTO {log} (point_id, seq) SELECT new.id, {next_seq} WHERE new.id <> old.id; END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER IF NOT EXISTS trg_{log}_delete AFTER DELETE ON {table} BEGIN "
+        f"INSERT OR REPLACE INTO {log} (point_id, seq) VALUES (old.id, {next_seq}); END"
+    )
+
+
+def prune_change_log(conn: sqlite3.Connection, table: str, up_to: Optional[int] = None) -> int:
+    """
+    Descarta do registro as mudanças já incorporadas pelos armazenamentos.
+
+    Sem isso, as linhas de pontos removidos ficariam para sempre na tabela de
+    mudanças. A maior sequência descartada é guardada em uma linha própria, o
+    que mantém a sequência crescente e permite que um armazenamento que ainda
+    não tinha lido essas mudanças perceba a lacuna e se recarregue por completo.
+
+    Args:
+        conn: Conexão com o banco de dados.
+        table: Tabela de pontos.
+        up_to: Maior sequência a descartar (padrão: todas as mudanças).
+
+    Returns:
+        int: Quantidade de mudanças descartadas.
+    """
+    log = change_log_table(table)
+    if up_to is None:
+        up_to = conn.execute(f"SELECT MAX(seq) FROM {log}").fetchone()[0] or 0
+    removed = conn.execute(
+        f"DELETE FROM {log} WHERE seq <= ? AND point_id <> ?", (up_to, PRUNED_MARKER_ID)
+    ).rowcount
+    if removed:
+        conn.execute(
+            f"INSERT OR REPLACE INTO {log} (point_id, seq) "
+            f"SELECT ?, MAX(?, COALESCE((SELECT seq FROM {log} WHERE point_id = ?), 0))",
+            (PRUNED_MARKER_ID, up_to, PRUNED_MARKER_ID)
+        )
+    return removed
+
+
+class EncodedStrings:
+    """
+    Coluna de textos codificada por dicionário.
+
+    `codes[i]` é a posição do valor da linha `i` em `values`; valores nulos
+    usam o código -1.
+    """
+
+    def __init__(self) -> None:
+        self.codes = np.empty(0, dtype=np.int32)
+        self.values: List[str] = []
+        self._index: Dict[Optional[str], int] = {None: -1}
+
+    def encode(self, items: Sequence[Optional[str]]) -> np.ndarray:
+        """Converte textos em códigos, acrescentando ao dicionário os valores novos."""
+        index, values = self._index, self.values
+        # dict.fromkeys obtém os valores distintos na ordem de aparição sem um
+        # laço em Python por linha; só os valores novos são tratados um a um
+        for item in dict.fromkeys(items):
+            if item not in index:
+                index[item] = len(values)
+                values.append(item)
+        return np.fromiter(map(index.__getitem__, items), dtype=np.int32, count=len(items))
+
+    def decode(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Retorna os textos (array de objetos) das linhas selecionadas."""
+        codes = self.codes if mask is None else self.codes[mask]
+        lookup = np.array(self.values + [None], dtype=object)
+        return lookup[codes]
+
+    def code_of(self, value: Optional[str]) -> int:
+        """Código do valor, ou -2 (que não corresponde a nenhuma linha) se ausente."""
+        return self._index.get(value, -2)
+
+    def equals(self, value: Optional[str]) -> np.ndarray:
+        """Máscara das linhas cujo valor é igual ao informado."""
+        return self.codes == self.code_of(value)
+
+    def isin(self, values: Iterable[str]) -> np.ndarray:
+        """Máscara das linhas cujo valor está entre os informados."""
+        wanted = [self.code_of(v) for v in values]
+        return np.isin(self.codes, np.array(wanted, dtype=np.int32))
+
+    def contains(self, text: str, case: bool = False) -> np.ndarray:
+        """Máscara das linhas cujo valor contém o trecho informado."""
+        if not case:
+            text = text.lower()
+        matching = [
+            code for code, value in enumerate(self.values)
+            if text in (value if case else value.lower())
+        ]
+        return np.isin(self.codes, np.array(matching, dtype=np.int32))
+
+
+@dataclass
+class RefreshResult:
+    """
+    Resumo de uma atualização incremental.
+
+    Com `reloaded`, as mudanças desde a última leitura já tinham sido
+    descartadas do registro e o armazenamento foi recarregado por completo;
+    nesse caso `added` é o total de linhas carregadas.
+    """
+    added: int = 0
+    updated: int = 0
+    deleted: int = 0
+    reloaded: bool = False
+
+
+def _to_datetime64(values: Sequence[Any]) -> np.ndarray:
+    """Converte datas (texto ISO ou datetime) em datetime64; nulos viram NaT."""
+    return np.array(values, dtype=DATE_DTYPE)
+
+
+class PointStore:
+    """
+    Catálogo de pontos em formato colunar.
+
+    Use `load` para criar o armazenamento a partir do banco e `refresh` para
+    incorporar as mudanças posteriores. As linhas ficam ordenadas por ID.
+    """
+
+    def __init__(self, table: str):
+        self.table = table
+        self.ids = np.empty(0, dtype=np.int64)
+        self.numeric: Dict[str, np.ndarray] = {c: np.empty(0, dtype=np.float64) for c in NUMERIC_COLUMNS}
+        self.discovery_date = np.empty(0, dtype=DATE_DTYPE)
+        self.strings: Dict[str, EncodedStrings] = {c: EncodedStrings() for c in STRING_COLUMNS}
+        self.max_id = 0
+        self.last_change = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection, table: str, batch_size: int = DEFAULT_BATCH_SIZE) -> "PointStore":
+        """
+        Carrega a tabela inteira, lendo as linhas em lotes.
+
+        Args:
+            conn: Conexão com o banco de dados.
+            table: Tabela de pontos, com a tabela de mudanças já criada.
+            batch_size: Quantidade de linhas lidas por vez.
+
+        Returns:
+            PointStore: Armazenamento com todas as linhas da tabela.
+        """
+        store = cls(table)
+        with _read_snapshot(conn):
+            store.last_change = store._current_change(conn)
+            cursor = conn.execute(f"SELECT {', '.join(STORE_COLUMNS)} FROM {table} ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                store._append(rows)
+        logger.info(f"Armazenamento colunar carregado com {len(store)} pontos")
+        return store
+
+    def refresh(self, conn: sqlite3.Connection) -> RefreshResult:
+        """
+        Incorpora as linhas inseridas, alteradas e removidas desde a última leitura.
+
+        Args:
+            conn: Conexão com o banco de dados.
+
+        Returns:
+            RefreshResult: Quantidade de linhas acrescentadas, alteradas e removidas.
+        """
+        result = RefreshResult()
+        log = change_log_table(self.table)
+        with _read_snapshot(conn):
+            pruned = conn.execute(f"SELECT seq FROM {log} WHERE point_id = ?", (PRUNED_MARKER_ID,)).fetchone()
+            if pruned is not None and pruned[0] > self.last_change:
+                # Mudanças ainda não lidas foram descartadas: recarrega tudo
+                fresh = PointStore.load(conn, self.table)
+                self.__dict__.update(fresh.__dict__)
+                logger.info("Registro de mudanças descartado desde a última leitura; armazenamento recarregado")
+                return RefreshResult(added=len(self), reloaded=True)
+
+            changes = conn.execute(
+                f"SELECT point_id, seq FROM {log} WHERE seq > ? ORDER BY seq", (self.last_change,)
+            ).fetchall()
+            changed = sorted({point_id for point_id, _ in changes if point_id <= self.max_id})
+
+            current: Dict[int, tuple] = {}
+            for start in range(0, len(changed), 500):
+                chunk = changed[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT {', '.join(STORE_COLUMNS)} FROM {self.table} "
+                    f"WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                current.update((row[0], row) for row in rows)
+
+            new_rows = conn.execute(
+                f"SELECT {', '.join(STORE_COLUMNS)} FROM {self.table} WHERE id > ? ORDER BY id", (self.max_id,)
+            ).fetchall()
+            if changes:
+                self.last_change = changes[-1][1]
+
+        if changed and len(self.ids):
+            changed_ids = np.array(changed, dtype=np.int64)
+            positions = np.searchsorted(self.ids, changed_ids)
+            present = positions < len(self.ids)
+            present[present] = self.ids[positions[present]] == changed_ids[present]
+            positions, changed_ids = positions[present], changed_ids[present].tolist()
+
+            updated = [(p, current[i]) for p, i in zip(positions, changed_ids) if i in current]
+            if updated:
+                self._overwrite(np.array([p for p, _ in updated]), [row for _, row in updated])
+                result.updated = len(updated)
+
+            deleted = np.array([p for p, i in zip(positions, changed_ids) if i not in current], dtype=np.int64)
+            if len(deleted):
+                keep = np.ones(len(self.ids), dtype=bool)
+                keep[deleted] = False
+                self._compress(keep)
+                result.deleted = len(deleted)
+
+        if new_rows:
+            self._append(new_rows)
+            result.added = len(new_rows)
+
+        logger.info(
+            f"Armazenamento colunar atualizado: {result.added} novos, "
+            f"{result.updated} alterados, {result.deleted} removidos"
+        )
+        return result
+
+    def column(self, name: str, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Retorna os valores de uma coluna (textos decodificados) das linhas selecionadas."""
+        if name == "id":
+            values = self.ids
+        elif name in self.numeric:
+            values = self.numeric[name]
+        elif name == DATE_COLUMN:
+            values = self.discovery_date
+        elif name in self.strings:
+            return self.strings[name].decode(mask)
+        else:
+            raise ValueError(f"Coluna inexistente: {name}")
+        return values if mask is None else values[mask]
+
+    def equals(self, name: str, value: Any) -> np.ndarray:
+        """Máscara das linhas em que a coluna é igual ao valor."""
+        if name in self.strings:
+            return self.strings[name].equals(value)
+        return self.column(name) == value
+
+    def isin(self, name: str, values: Iterable[Any]) -> np.ndarray:
+        """Máscara das linhas em que a coluna assume um dos valores."""
+        if name in self.strings:
+            return self.strings[name].isin(values)
+        return np.isin(self.column(name), list(values))
+
+    def contains(self, name: str, text: str, case: bool = False) -> np.ndarray:
+        """Máscara das linhas em que a coluna de texto contém o trecho."""
+        if name not in self.strings:
+            raise ValueError(f"Coluna sem texto: {name}")
+        return self.strings[name].contains(text, case)
+
+    def between(self, name: str, low: Any = None, high: Any = None) -> np.ndarray:
+        """Máscara das linhas com valor no intervalo fechado [low, high]; None não limita."""
+        values = self.column(name)
+        if name == DATE_COLUMN:
+            low = None if low is None else np.datetime64(low, "us")
+            high = None if high is None else np.datetime64(high, "us")
+        mask = np.ones(len(values), dtype=bool)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return mask
+
+    def in_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> np.ndarray:
+        """Máscara das linhas dentro do retângulo geográfico (limites inclusivos)."""
+        return self.between("latitude", min_lat, max_lat) & self.between("longitude", min_lon, max_lon)
+
+    def value_counts(self, name: str, mask: Optional[np.ndarray] = None) -> Dict[Optional[str], int]:
+        """Contagem das linhas por valor de uma coluna de texto."""
+        strings = self.strings[name]
+        codes = strings.codes if mask is None else strings.codes[mask]
+        counts = np.bincount(codes + 1, minlength=len(strings.values) + 1)
+        result: Dict[Optional[str], int] = {}
+        if counts[0]:
+            result[None] = int(counts[0])
+        for value, count in zip(strings.values, counts[1:].tolist()):
+            if count:
+                result[value] = count
+        return result
+
+    def to_frame(self, mask: Optional[np.ndarray] = None, columns: Optional[Sequence[str]] = None) -> "pd.DataFrame":
+        """
+        Converte as linhas selecionadas em DataFrame, com textos como categorias.
+
+        Requer pandas, importado apenas quando este método é usado.
+        """
+        import pandas as pd
+
+        data: Dict[str, Any] = {}
+        for name in columns or STORE_COLUMNS:
+            if name in self.strings:
+                strings = self.strings[name]
+                codes = strings.codes if mask is None else strings.codes[mask]
+                data[name] = pd.Categorical.from_codes(codes, categories=pd.Index(strings.values, dtype=object))
+            else:
+                data[name] = self.column(name, mask)
+        return pd.DataFrame(data)
+
+    def _current_change(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute(f"SELECT MAX(seq) FROM {change_log_table(self.table)}").fetchone()
+        return row[0] or 0
+
+    def _append(self, rows: List[tuple]) -> None:
+        columns = list(zip(*rows))
+        ids = np.array(columns[0], dtype=np.int64)
+        self.ids = np.concatenate([self.ids, ids])
+        for offset, name in enumerate(NUMERIC_COLUMNS, start=1):
+            values = np.array(columns[offset], dtype=np.float64)
+            self.numeric[name] = np.concatenate([self.numeric[name], values])
+        self.discovery_date = np.concatenate([self.discovery_date, _to_datetime64(columns[4])])
+        for offset, name in enumerate(STRING_COLUMNS, start=5):
+            strings = self.strings[name]
+            strings.codes = np.concatenate([strings.codes, strings.encode(columns[offset])])
+        self.max_id = max(self.max_id, int(ids[-1]))
+
+    def _overwrite(self, positions: np.ndarray, rows: List[tuple]) -> None:
+        columns = list(zip(*rows))
+        for offset, name in enumerate(NUMERIC_COLUMNS, start=1):
+            self.numeric[name][positions] = np.array(columns[offset], dtype=np.float64)
+        self.discovery_date[positions] = _to_datetime64(columns[4])
+        for offset, name in enumerate(STRING_COLUMNS, start=5):
+            strings = self.strings[name]
+            strings.codes[positions] = strings.encode(columns[offset])
+
+    def _compress(self, keep: np.ndarray) -> None:
+        self.ids = self.ids[keep]
+        for name in NUMERIC_COLUMNS:
+            self.numeric[name] = self.numeric[name][keep]
+        self.discovery_date = self.discovery_date[keep]
+        for strings in self.strings.values():
+            strings.codes = strings.codes[keep]
+
+
+@contextmanager
+def _read_snapshot(conn: sqlite3.Connection) -> Iterator[None]:
+    """Mantém uma transação de leitura, para que todas as consultas vejam o mesmo estado."""
+    owns = not conn.in_transaction
+    if owns:
+        conn.execute("BEGIN")
+    try:
+        yield
+    finally:
+        if owns:
+            conn.commit()
@@ -0,0 +1,324 @@
+"""
+Gerenciamento de conexões SQLite reutilizáveis.
+
+Este módulo fornece um gerenciador de conexões thread-safe que mantém uma conexão
+por thread e por arquivo de banco de dados. Assim, as operações CRUD deixam de
+pagar a cada chamada o custo de abrir o arquivo, ler o esquema e aquecer o cache
+de páginas do SQLite. Conexões de threads encerradas (como as do Streamlit a cada
+rerun) são devolvidas a uma fila ociosa e reaproveitadas pelas próximas threads.
+"""
+
+import os
+import sqlite3
+import threading
+import weakref
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Caminho especial do SQLite para bancos em memória (não possui arquivo associado)
+MEMORY_PATH = ":memory:"
+
+
+@dataclass
+class PoolStats:
+    """Contadores de uso do gerenciador de conexões."""
+    created: int = 0
+    reused: int = 0
+    recycled: int = 0
+    health_check_failures: int = 0
+    closed: int = 0
+    open_connections: int = 0
+    idle_connections: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Fração das aquisições atendidas por uma conexão já existente."""
+        total = self.created + self.reused + self.recycled
+        if total == 0:
+            return 0.0
+        return (self.reused + self.recycled) / total
+
+
+class _PooledConnection:
+    """Conexão gerenciada junto com os metadados usados na verificação de saúde."""
+
+    __slots__ = ("conn", "path", "identity", "owner", "depth", "suspect", "closing")
+
+    def __init__(self, conn: sqlite3.Connection, path: str, identity: Optional[Tuple[int, int]]):
+        self.conn = conn
+        self.path = path
+        self.identity = identity
+        self.owner: Optional["weakref.ReferenceType[threading.Thread]"] = None
+        self.depth = 0
+        # Um erro do SQLite passou pela conexão: verificar antes de reutilizar
+        self.suspect = False
+        # close_all foi chamado durante o uso: fechar ao final do bloco
+        self.closing = False
+
+
+def file_identity(path: str) -> Optional[Tuple[int, int]]:
+    """
+    Identifica o arquivo do banco pelo par (dispositivo, inode).
+
+    Permite notar que o arquivo foi substituído ou removido desde que uma
+    conexão (ou um valor em cache) foi obtida a partir dele.
+
+    Args:
+        path: Caminho do arquivo do banco.
+
+    Returns:
+        tuple: (dispositivo, inode) do arquivo, ou None se ele não existir ou
+        se o banco estiver em memória.
+    """
+    if path == MEMORY_PATH:
+        return None
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+class ConnectionManager:
+    """
+    Gerenciador thread-safe de conexões SQLite reutilizáveis.
+
+    Cada thread recebe a sua própria conexão para cada arquivo de banco de dados,
+    e a mesma conexão é devolvida nas chamadas seguintes. A verificação de
+    saúde só é feita quando a conexão sai da fila ociosa ou depois de um erro
+    do SQLite, para não pesar nas chamadas comuns. O acesso deve ser feito
+    pelo gerenciador de contexto `connection`, que confirma a transação ao
+    final do bloco mais externo e a desfaz em caso de exceção.
+
+    Args:
+        max_idle: Número máximo de conexões ociosas mantidas por arquivo.
+        timeout: Tempo de espera (segundos) por bloqueios do SQLite.
+        on_connect: Função opcional chamada com cada conexão recém-aberta.
+        factory: Classe (ou fábrica) das novas conexões, repassada a
+            `sqlite3.connect`; por padrão, sqlite3.Connection.
+    """
+
+    def __init__(
+        self,
+        max_idle: int = 4,
+        timeout: float = 5.0,
+        on_connect: Optional[Callable[[sqlite3.Connection], None]] = None,
+        factory: Optional[Callable[..., sqlite3.Connection]] = None,
+    ) -> None:
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.on_connect = on_connect
+        self.factory = factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._active: Dict[int, _PooledConnection] = {}
+        self._idle: Dict[str, List[_PooledConnection]] = {}
+        self._stats = PoolStats()
+
+    @contextmanager
+    def connection(self, db_path: str) -> Iterator[sqlite3.Connection]:
+        """
+        Fornece a conexão da thread atual para o banco indicado.
+
+        Args:
+            db_path: Caminho do arquivo de banco de dados.
+
+        Yields:
+            sqlite3.Connection: Conexão pronta para uso.
+        """
+        entry = self._acquire(db_path)
+        try:
+            yield entry.conn
+        except BaseException as e:
+            if isinstance(e, sqlite3.Error):
+                entry.suspect = True
+            if entry.depth == 1 and entry.conn.in_transaction:
+                entry.conn.rollback()
+            raise
+        else:
+            if entry.depth == 1 and entry.conn.in_transaction:
+                entry.conn.commit()
+        finally:
+            with self._lock:
+                entry.depth -= 1
+                if entry.depth == 0 and entry.closing:
+                    self._close(entry)
+
+    def in_use(self, db_path: str) -> bool:
+        """
+        Indica se a thread atual está usando a sua conexão com o banco.
+
+        Returns:
+            bool: True dentro de um bloco `connection` para o banco ou se a
+            conexão da thread tiver uma transação aberta.
+        """
+        path = db_path if db_path == MEMORY_PATH else os.path.abspath(db_path)
+        entry = self._thread_connections().get(path)
+        return entry is not None and (entry.depth > 0 or entry.conn.in_transaction)
+
+    def stats(self) -> PoolStats:
+        """Retorna uma cópia dos contadores atuais do gerenciador."""
+        with self._lock:
+            self._reclaim_orphans()
+            return replace(
+                self._stats,
+                open_connections=len(self._active) + sum(len(v) for v in self._idle.values()),
+                idle_connections=sum(len(v) for v in self._idle.values()),
+            )
+
+    def interrupt(self, thread: threading.Thread) -> int:
+        """
+        Interrompe os comandos em execução nas conexões de uma thread.
+
+        O comando interrompido falha com sqlite3.OperationalError na thread
+        dona da conexão; a conexão continua utilizável.
+
+        Args:
+            thread: Thread dona das conexões.
+
+        Returns:
+            int: Quantidade de conexões interrompidas.
+        """
+        with self._lock:
+            entries = [
+                entry for entry in self._active.values()
+                if entry.owner is not None and entry.owner() is thread
+            ]
+            for entry in entries:
+                entry.conn.interrupt()
+        return len(entries)
+
+    def close_all(self) -> None:
+        """
+        Fecha todas as conexões, ativas e ociosas, de todas as threads.
+
+        As conexões em uso por outra thread no momento da chamada não são
+        interrompidas: elas são fechadas ao final do bloco `connection` em
+        andamento. As próximas chamadas de todas as threads abrem conexões novas.
+        """
+        with self._lock:
+            entries = list(self._active.values())
+            for idle in self._idle.values():
+                entries.extend(idle)
+            self._active.clear()
+            self._idle.clear()
+            for entry in entries:
+                if entry.depth > 0:
+                    entry.closing = True
+                else:
+                    self._close(entry)
+        self._local = threading.local()
+
+    def _thread_connections(self) -> Dict[str, _PooledConnection]:
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = {}
+            self._local.conns = conns
+        return conns
+
+    def _acquire(self, db_path: str) -> _PooledConnection:
+        path = db_path if db_path == MEMORY_PATH else os.path.abspath(db_path)
+        conns = self._thread_connections()
+
+        entry = conns.get(path)
+        if entry is not None:
+            if entry.depth > 0 or not entry.suspect or self._is_healthy(entry):
+                with self._lock:
+                    if not entry.closing:
+                        self._stats.reused += 1
+                        entry.suspect = False
+                        entry.depth += 1
+                        return entry
+            with self._lock:
+                if not entry.closing:
+                    self._stats.health_check_failures += 1
+                    self._active.pop(id(entry), None)
+                    self._close(entry)
+            del conns[path]
+
+        with self._lock:
+            self._reclaim_orphans()
+            entry = self._checkout_idle(path)
+            if entry is not None:
+                self._stats.recycled += 1
+
+        if entry is None:
+            entry = self._open(path)
+            with self._lock:
+                self._stats.created += 1
+
+        entry.owner = weakref.ref(threading.current_thread())
+        with self._lock:
+            self._active[id(entry)] = entry
+            entry.depth += 1
+        conns[path] = entry
+        return entry
+
+    def _open(self, path: str) -> _PooledConnection:
+        # check_same_thread=False permite que o gerenciador feche ou recicle a
+        # conexão a partir de outra thread; o uso continua restrito à dona.
+        conn = sqlite3.connect(
+            path, timeout=self.timeout, check_same_thread=False, factory=self.factory or sqlite3.Connection
+        )
+        if self.on_connect is not None:
+            try:
+                self.on_connect(conn)
+            except Exception:
+                conn.close()
+                raise
+        logger.debug(f"Nova conexão aberta para {path}")
+        return _PooledConnection(conn, path, file_identity(path))
+
+    def _is_healthy(self, entry: _PooledConnection) -> bool:
+        """Verifica se a conexão ainda aponta para o arquivo certo e responde."""
+        if entry.path != MEMORY_PATH and file_identity(entry.path) != entry.identity:
+            # O arquivo foi removido ou substituído desde a abertura da conexão
+            return False
+        try:
+            if entry.conn.in_transaction:
+                logger.warning(f"Transação deixada aberta na conexão com {entry.path} foi desfeita")
+                entry.conn.rollback()
+            entry.conn.execute("SELECT 1").fetchone()
+        except sqlite3.Error:
+            return False
+        return True
+
+    def _checkout_idle(self, path: str) -> Optional[_PooledConnection]:
+        """Retira da fila ociosa uma conexão saudável para o arquivo (exige o lock)."""
+        idle = self._idle.get(path)
+        while idle:
+            entry = idle.pop()
+            if self._is_healthy(entry):
+                return entry
+            self._stats.health_check_failures += 1
+            self._close(entry)
+        return None
+
+    def _reclaim_orphans(self) -> None:
+        """Move para a fila ociosa as conexões de threads encerradas (exige o lock)."""
+        for key, entry in list(self._active.items()):
+            owner = entry.owner() if entry.owner is not None else None
+            if owner is not None and owner.is_alive():
+                continue
+            del self._active[key]
+            entry.owner = None
+            entry.depth = 0
+            idle = self._idle.setdefault(entry.path, [])
+            if len(idle) >= self.max_idle:
+                self._close(entry)
+            elif self._is_healthy(entry):
+                idle.append(entry)
+            else:
+                self._stats.health_check_failures += 1
+                self._close(entry)
+
+    def _close(self, entry: _PooledConnection) -> None:
+        try:
+            entry.conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Erro ao fechar conexão com {entry.path}: {str(e)}")
+        self._stats.closed += 1
@@ -0,0 +1,141 @@
+"""
+Exportação em fluxo de pontos de escavação para CSV e GeoJSON.
+
+Os exportadores são geradores que recebem as linhas já lidas do banco (em
+qualquer iterável, tipicamente um cursor percorrido com `fetchmany`) e produzem
+o arquivo em pedaços de texto. Assim, a memória usada permanece constante,
+independentemente do tamanho da tabela.
+"""
+
+import io
+import csv
+import json
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, Sequence, TextIO, Union
+
+DEFAULT_CHUNK_ROWS = 500
+
+EXPORT_FORMATS = {
+    "csv": {"extension": "csv", "mime": "text/csv"},
+    "geojson": {"extension": "geojson", "mime": "application/geo+json"},
+}
+
+
+def iter_csv(columns: Sequence[str], rows: Iterable[Sequence[Any]], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[str]:
+    """
+    Gera o conteúdo CSV das linhas em pedaços de texto.
+
+    Args:
+        columns: Nomes das colunas, na ordem dos valores de cada linha.
+        rows: Iterável de linhas (sequências de valores).
+        chunk_rows: Quantidade de linhas por pedaço gerado.
+
+    Yields:
+        str: Pedaços consecutivos do arquivo CSV, começando pelo cabeçalho.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def row_to_feature(columns: Sequence[str], row: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Converte uma linha da tabela em um Feature GeoJSON do tipo Point.
+
+    A geometria usa a ordem [longitude, latitude, altitude] definida pela
+    RFC 7946; as demais colunas vão para as propriedades do Feature.
+    """
+    record = dict(zip(columns, row))
+    coordinates = [record.pop("longitude"), record.pop("latitude")]
+    altitude = record.pop("altitude", None)
+    if altitude is not None:
+        coordinates.append(altitude)
+
+    feature: Dict[str, Any] = {"type": "Feature"}
+    if "id" in record:
+        feature["id"] = record.pop("id")
+    feature["geometry"] = {"type": "Point", "coordinates": coordinates}
+    feature["properties"] = record
+    return feature
+
+
+def iter_geojson(columns: Sequence[str], rows: Iterable[Sequence[Any]], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[str]:
+    """
+    Gera uma FeatureCollection GeoJSON em pedaços de texto.
+
+    Args:
+        columns: Nomes das colunas; devem incluir latitude e longitude.
+        rows: Iterável de linhas (sequências de valores).
+        chunk_rows: Quantidade de Features por pedaço gerado.
+
+    Yields:
+        str: Pedaços consecutivos do documento GeoJSON.
+    """
+    if "latitude" not in columns or "longitude" not in columns:
+        raise ValueError("A exportação GeoJSON requer as colunas latitude e longitude")
+
+    parts = ['{"type": "FeatureCollection", "features": [\n']
+    separator = ""
+    for row in rows:
+        parts.append(separator)
+        parts.append(json.dumps(row_to_feature(columns, row), ensure_ascii=False))
+        separator = ",\n"
+        if len(parts) >= 2 * chunk_rows:
+            yield "".join(parts)
+            parts = []
+    parts.append("\n]}\n")
+    yield "".join(parts)
+
+
+def get_exporter(fmt: str) -> Callable[..., Iterator[str]]:
+    """Retorna o gerador correspondente ao formato (csv ou geojson)."""
+    exporters = {"csv": iter_csv, "geojson": iter_geojson}
+    try:
+        return exporters[fmt.lower()]
+    except KeyError:
+        raise ValueError(f"Formato de exportação não suportado: {fmt}") from None
+
+
+def write_chunks(chunks: Iterable[str], target: Union[str, TextIO, BinaryIO], encoding: str = "utf-8") -> int:
+    """
+    Grava os pedaços gerados em um arquivo, sem acumulá-los em memória.
+
+    Args:
+        chunks: Pedaços de texto gerados por um exportador.
+        target: Caminho do arquivo ou objeto de arquivo (texto ou binário) aberto.
+        encoding: Codificação usada ao gravar em arquivos binários ou caminhos.
+
+    Returns:
+        int: Quantidade de caracteres gravados.
+    """
+    if isinstance(target, str):
+        with open(target, "w", newline="", encoding=encoding) as f:
+            return write_chunks(chunks, f, encoding)
+
+    written = 0
+    binary = not isinstance(target, io.TextIOBase)
+    for chunk in chunks:
+        target.write(chunk.encode(encoding) if binary else chunk)  # type: ignore[arg-type]
+        written += len(chunk)
+    return written
+
+
+def export_info(fmt: str) -> Dict[str, str]:
+    """Retorna a extensão de arquivo e o tipo MIME do formato."""
+    try:
+        return EXPORT_FORMATS[fmt.lower()]
+    except KeyError:
+        raise ValueError(f"Formato de exportação não suportado: {fmt}") from None
+
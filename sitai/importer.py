@@ -0,0 +1,316 @@
+"""
+Importação de cadernos de campo e planilhas (CSV/XLSX) para o catálogo.
+
+As linhas são lidas em fluxo, sem carregar o arquivo inteiro em memória, e
+validadas contra o modelo ExcavationPoint em um pool de processos. Os pontos
+válidos seguem, na ordem original, para um único escritor que grava em lotes;
+as linhas rejeitadas são registradas em um relatório CSV com o número da linha
+de origem e a mensagem de erro.
+"""
+
+import os
+import csv
+import logging
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
+
+from sitai.models import ExcavationPoint, validate_points
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Nomes de colunas aceitos nas planilhas, além dos próprios nomes dos campos
+COLUMN_ALIASES = {
+    "tipo": "point_type",
+    "tipo de ponto": "point_type",
+    "descrição": "description",
+    "descricao": "description",
+    "descrição detalhada": "description",
+    "data": "discovery_date",
+    "data da descoberta": "discovery_date",
+    "responsável": "responsible",
+    "responsavel": "responsible",
+    "sistema de referência": "srid",
+    "sistema de referencia": "srid",
+}
+
+NUMERIC_FIELDS = ("latitude", "longitude", "altitude")
+DATE_FORMATS = ("%d/%m/%Y", "%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S")
+
+# Linha lida da planilha: (número da linha no arquivo, valores por coluna)
+SourceRow = Tuple[int, Dict[str, Any]]
+# Linha rejeitada: (número da linha no arquivo, mensagem de erro, valores originais)
+RejectedRow = Tuple[int, str, Dict[str, Any]]
+
+
+@dataclass
+class ImportResult:
+    """Resumo de uma importação."""
+    total_rows: int = 0
+    imported: int = 0
+    rejected: int = 0
+    error_report: Optional[str] = None
+
+
+def normalize_column(name: Any) -> str:
+    """Converte o cabeçalho de uma coluna para o nome do campo correspondente."""
+    key = str(name or "").strip().lower()
+    return COLUMN_ALIASES.get(key, key)
+
+
+def iter_csv_rows(path: str, encoding: str = "utf-8-sig") -> Iterator[SourceRow]:
+    """
+    Lê um arquivo CSV linha a linha.
+
+    O delimitador (vírgula ou ponto e vírgula) é detectado automaticamente.
+
+    Args:
+        path: Caminho do arquivo CSV.
+        encoding: Codificação do arquivo.
+
+    Yields:
+        tuple: Número da linha no arquivo e dicionário com os valores da linha.
+    """
+    with open(path, newline="", encoding=encoding) as f:
+        sample = f.read(64 * 1024)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+
+        reader = csv.reader(f, dialect)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = [normalize_column(h) for h in header]
+
+        while True:
+            line_number = reader.line_num + 1
+            try:
+                values = next(reader)
+            except StopIteration:
+                return
+            if not any(v.strip() for v in values):
+                continue
+            yield line_number, dict(zip(columns, values))
+
+
+def iter_xlsx_rows(path: str, sheet: Optional[str] = None) -> Iterator[SourceRow]:
+    """
+    Lê uma planilha XLSX linha a linha em modo somente leitura.
+
+    Requer o pacote opcional openpyxl.
+
+    Args:
+        path: Caminho do arquivo XLSX.
+        sheet: Nome da aba (por padrão, a aba ativa).
+
+    Yields:
+        tuple: Número da linha na planilha e dicionário com os valores da linha.
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise ImportError("A importação de arquivos XLSX requer o pacote openpyxl") from e
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [normalize_column(h) for h in header]
+
+        for line_number, values in enumerate(rows, start=2):
+            if all(v is None or str(v).strip() == "" for v in values):
+                continue
+            yield line_number, dict(zip(columns, values))
+    finally:
+        workbook.close()
+
+
+def iter_rows(path: str) -> Iterator[SourceRow]:
+    """Escolhe o leitor adequado pela extensão do arquivo."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".xlsx", ".xlsm"):
+        return iter_xlsx_rows(path)
+    if extension in (".csv", ".txt"):
+        return iter_csv_rows(path)
+    raise ValueError(f"Formato de arquivo não suportado: {extension}")
+
+
+def _prepare(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Ajusta os valores de uma linha para os formatos aceitos pelo modelo."""
+    data = {}
+    for key, value in values.items():
+        if isinstance(value, str):
+            value = value.strip()
+            if value == "":
+                continue
+        elif value is None:
+            continue
+        data[key] = value
+
+    for field in NUMERIC_FIELDS:
+        value = data.get(field)
+        if isinstance(value, str):
+            # Planilhas em português costumam usar vírgula como separador decimal
+            data[field] = value.replace(",", ".")
+
+    value = data.get("discovery_date")
+    if isinstance(value, str):
+        for fmt in DATE_FORMATS:
+            try:
+                data["discovery_date"] = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+
+    data.pop("id", None)
+    return data
+
+
+def validate_rows(rows: Sequence[SourceRow]) -> Tuple[List[ExcavationPoint], List[RejectedRow]]:
+    """
+    Valida um lote de linhas contra o modelo ExcavationPoint.
+
+    O lote é validado de uma só vez (validate_points); quando há linhas
+    inválidas, elas são identificadas pelos erros e as demais são validadas
+    novamente, sem elas. Executada nos processos do pool, por isso recebe e
+    devolve apenas objetos serializáveis.
+
+    Args:
+        rows: Linhas lidas do arquivo.
+
+    Returns:
+        tuple: Pontos válidos e linhas rejeitadas, ambos na ordem de entrada.
+    """
+    prepared = [_prepare(values) for _, values in rows]
+    try:
+        # Caminho rápido: o lote inteiro é validado por um único validador
+        return validate_points(prepared), []
+    except ValidationError as e:
+        errors: Dict[int, List[str]] = {}
+        for err in e.errors():
+            index, *loc = err["loc"]
+            errors.setdefault(int(index), []).append(f"{'.'.join(str(p) for p in loc) or 'linha'}: {err['msg']}")
+
+    rejected: List[RejectedRow] = [
+        (line_number, "; ".join(errors[i]), values)
+        for i, (line_number, values) in enumerate(rows) if i in errors
+    ]
+    valid = validate_points([data for i, data in enumerate(prepared) if i not in errors])
+    return valid, rejected
+
+
+class _ErrorReport:
+    """Relatório CSV das linhas rejeitadas, gravado à medida que os erros surgem."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._file = None
+        self._writer: Any = None
+
+    def write(self, rejected: List[RejectedRow]) -> None:
+        if not rejected or self.path is None:
+            return
+        if self._writer is None:
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["line", "error", "values"])
+        for line_number, message, values in rejected:
+            self._writer.writerow([line_number, message, repr(values)])
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+def import_points(
+    path: str,
+    writer: Callable[[List[ExcavationPoint]], Any],
+    error_report: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> ImportResult:
+    """
+    Importa pontos de um arquivo CSV ou XLSX.
+
+    A leitura, a validação e a gravação formam um pipeline: no máximo
+    `max_pending` lotes aguardam validação ao mesmo tempo, o que mantém a
+    memória limitada independentemente do tamanho do arquivo. Os lotes
+    validados são entregues ao `writer` na ordem do arquivo, a partir da
+    thread chamadora, que é a única a gravar no banco.
+
+    Args:
+        path: Caminho do arquivo a ser importado.
+        writer: Função que grava uma lista de pontos validados.
+        error_report: Caminho do relatório CSV de linhas rejeitadas (opcional).
+        batch_size: Quantidade de linhas por lote de validação e gravação.
+        workers: Número de processos de validação; 0 valida na própria thread.
+        max_pending: Limite de lotes em validação simultânea.
+        executor: Executor já existente a ser usado no lugar de um novo pool.
+
+    Returns:
+        ImportResult: Totais de linhas lidas, importadas e rejeitadas.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size deve ser maior que zero")
+
+    rows = iter_rows(path)
+    batches = iter(lambda: list(islice(rows, batch_size)), [])
+    result = ImportResult(error_report=error_report)
+    report = _ErrorReport(error_report)
+
+    def consume(valid: List[ExcavationPoint], rejected: List[RejectedRow]) -> None:
+        result.total_rows += len(valid) + len(rejected)
+        if valid:
+            writer(valid)
+            result.imported += len(valid)
+        if rejected:
+            report.write(rejected)
+            result.rejected += len(rejected)
+
+    own_executor = False
+    if executor is None and workers != 0:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        own_executor = True
+
+    pending: Deque[Future] = deque()
+    try:
+        if executor is None:
+            for batch in batches:
+                consume(*validate_rows(batch))
+        else:
+            limit = max_pending or 2 * (workers or os.cpu_count() or 1)
+            for batch in batches:
+                pending.append(executor.submit(validate_rows, batch))
+                if len(pending) >= limit:
+                    consume(*pending.popleft().result())
+            while pending:
+                consume(*pending.popleft().result())
+    finally:
+        report.close()
+        # Em caso de erro ou interrupção, os lotes ainda não iniciados são
+        # descartados (shutdown(cancel_futures=True) só existe a partir do 3.9)
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown()
+
+    logger.info(
+        f"Importação de {path}: {result.imported} pontos importados, "
+        f"{result.rejected} linhas rejeitadas"
+    )
+    return result
@@ -0,0 +1,299 @@
+"""
+Métricas de desempenho das operações do banco de dados.
+
+Cada operação instrumentada (pelo decorador `instrument` ou pelo gerenciador de
+contexto `timer`) registra a latência em um histograma, a quantidade de linhas
+retornadas ou gravadas e a quantidade de erros. As métricas podem ser
+exportadas no formato de texto do Prometheus, gravadas em um arquivo (para o
+coletor "textfile" do node_exporter) ou servidas por HTTP em /metrics.
+
+A coleta começa desativada; nesse estado, o custo de uma chamada instrumentada
+é apenas a verificação de um atributo.
+"""
+
+import os
+import time
+import bisect
+import logging
+import tempfile
+import functools
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Limites superiores (segundos) dos intervalos do histograma de latência
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+METRIC_PREFIX = "sitai_db"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def count_rows(result: Any) -> int:
+    """
+    Conta as linhas de um resultado, conforme o tipo retornado pela operação.
+
+    Listas e DataFrames contam os elementos; páginas contam as linhas de
+    `data`; booleanos contam 1 quando verdadeiros; None conta 0; qualquer
+    outro valor (por exemplo, o ID de um ponto criado) conta 1.
+    """
+    if result is None:
+        return 0
+    if isinstance(result, bool):
+        return int(result)
+    data = getattr(result, "data", None)
+    if data is not None and hasattr(data, "__len__"):
+        return len(data)
+    if hasattr(result, "__len__") and not isinstance(result, (str, bytes)):
+        return len(result)
+    return 1
+
+
+def no_rows(result: Any) -> int:
+    """Contador para operações cujo resultado não corresponde a linhas (manutenção, exportação)."""
+    return 0
+
+
+@dataclass
+class OperationMetrics:
+    """Contadores de uma operação."""
+    calls: int = 0
+    errors: int = 0
+    rows: int = 0
+    total_seconds: float = 0.0
+    # Contagem por intervalo do histograma (não acumulada); o último é +Inf
+    buckets: List[int] = field(default_factory=list)
+
+
+class Timing:
+    """Medição em andamento de um bloco; `rows` pode ser definido dentro do bloco."""
+
+    __slots__ = ("rows",)
+
+    def __init__(self) -> None:
+        self.rows = 0
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas por operação, compartilhado entre threads.
+
+    Args:
+        enabled: Se a coleta começa ativada.
+        buckets: Limites superiores, em segundos, dos intervalos do histograma.
+    """
+
+    def __init__(self, enabled: bool = False, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        if list(buckets) != sorted(buckets) or not buckets:
+            raise ValueError("Os limites do histograma devem estar em ordem crescente")
+        self.enabled = enabled
+        self.buckets = tuple(float(b) for b in buckets)
+        self._lock = threading.Lock()
+        self._operations: Dict[str, OperationMetrics] = {}
+
+    def enable(self, enabled: bool = True) -> None:
+        """Ativa ou desativa a coleta."""
+        self.enabled = enabled
+
+    def reset(self) -> None:
+        """Descarta todas as medições."""
+        with self._lock:
+            self._operations.clear()
+
+    def observe(self, operation: str, seconds: float, rows: int = 0, error: bool = False) -> None:
+        """Registra uma chamada da operação."""
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            metrics = self._operation(operation)
+            metrics.calls += 1
+            metrics.total_seconds += seconds
+            metrics.buckets[index] += 1
+            metrics.rows += rows
+            if error:
+                metrics.errors += 1
+
+    def record_error(self, operation: str) -> None:
+        """
+        Conta um erro tratado dentro da operação (que não chegou a ser lançado).
+
+        Útil para funções que registram o erro no log e retornam um valor
+        padrão, como uma lista vazia.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._operation(operation).errors += 1
+
+    def _operation(self, operation: str) -> OperationMetrics:
+        # Chamado com o bloqueio retido
+        metrics = self._operations.get(operation)
+        if metrics is None:
+            metrics = self._operations[operation] = OperationMetrics(buckets=[0] * (len(self.buckets) + 1))
+        return metrics
+
+    def instrument(self, operation: Optional[str] = None, rows: Optional[Callable[[Any], int]] = None) -> Callable[[F], F]:
+        """
+        Decorador que mede cada chamada da função.
+
+        Args:
+            operation: Nome da operação (por padrão, o nome da função).
+            rows: Função que conta as linhas a partir do resultado (por
+                padrão, count_rows).
+
+        Returns:
+            Callable: Decorador.
+        """
+        counter = rows or count_rows
+
+        def decorator(func: F) -> F:
+            name = operation or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                except BaseException:
+                    self.observe(name, time.perf_counter() - started, error=True)
+                    raise
+                self.observe(name, time.perf_counter() - started, rows=counter(result))
+                return result
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorator
+
+    @contextmanager
+    def timer(self, operation: str) -> Iterator[Timing]:
+        """
+        Mede um bloco de código como uma chamada da operação.
+
+        Exemplo:
+            with registry.timer("reindex") as timing:
+                timing.rows = reindex()
+        """
+        timing = Timing()
+        if not self.enabled:
+            yield timing
+            return
+        started = time.perf_counter()
+        try:
+            yield timing
+        except BaseException:
+            self.observe(operation, time.perf_counter() - started, rows=timing.rows, error=True)
+            raise
+        self.observe(operation, time.perf_counter() - started, rows=timing.rows)
+
+    def snapshot(self) -> Dict[str, OperationMetrics]:
+        """Retorna uma cópia das métricas de cada operação."""
+        with self._lock:
+            return {
+                name: OperationMetrics(m.calls, m.errors, m.rows, m.total_seconds, list(m.buckets))
+                for name, m in self._operations.items()
+            }
+
+    def render_prometheus(self, prefix: str = METRIC_PREFIX) -> str:
+        """
+        Exporta as métricas no formato de texto do Prometheus (versão 0.0.4).
+
+        Returns:
+            str: Histograma de latência, total de linhas e total de erros de
+            cada operação.
+        """
+        operations = sorted(self.snapshot().items())
+        bounds = [_format_value(b) for b in self.buckets] + ["+Inf"]
+        lines: List[str] = [
+            f"# HELP {prefix}_operation_duration_seconds Latência das operações do banco de dados.",
+            f"# TYPE {prefix}_operation_duration_seconds histogram",
+        ]
+        for name, metrics in operations:
+            label = f'operation="{_escape(name)}"'
+            cumulative = 0
+            for bound, count in zip(bounds, metrics.buckets):
+                cumulative += count
+                lines.append(f'{prefix}_operation_duration_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f"{prefix}_operation_duration_seconds_sum{{{label}}} {_format_value(metrics.total_seconds)}")
+            lines.append(f"{prefix}_operation_duration_seconds_count{{{label}}} {metrics.calls}")
+
+        for metric, help_text, attribute in (
+            ("operation_rows_total", "Linhas retornadas ou gravadas pelas operações.", "rows"),
+            ("operation_errors_total", "Erros nas operações do banco de dados.", "errors"),
+        ):
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for name, metrics in operations:
+                lines.append(f'{prefix}_{metric}{{operation="{_escape(name)}"}} {getattr(metrics, attribute)}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, prefix: str = METRIC_PREFIX) -> str:
+        """
+        Grava as métricas em um arquivo, substituindo-o de forma atômica.
+
+        O arquivo nunca é lido pela metade, como exige o coletor "textfile"
+        do node_exporter.
+
+        Returns:
+            str: Texto gravado.
+        """
+        text = self.render_prometheus(prefix)
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(prefix=".metrics_", suffix=".prom", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return text
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Serve as métricas por HTTP em /metrics, em uma thread em segundo plano.
+
+        Args:
+            port: Porta (0 escolhe uma porta livre).
+            host: Endereço; por padrão, apenas a máquina local.
+
+        Returns:
+            ThreadingHTTPServer: Servidor em execução; encerre com `shutdown()`.
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(format % args)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        thread = threading.Thread(target=server.serve_forever, name="sitai-metrics", daemon=True)
+        thread.start()
+        logger.info(f"Métricas disponíveis em http://{host}:{server.server_address[1]}/metrics")
+        return server
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else f"{value:.1f}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,191 @@
+"""
+Migrações versionadas do esquema do banco de dados.
+
+A versão do esquema é guardada no cabeçalho do próprio arquivo SQLite
+(`PRAGMA user_version`). Cada migração é composta de passos executados em
+transações curtas e separadas; o progresso de uma migração em andamento fica
+registrado na tabela `schema_migration_progress`, de modo que uma atualização
+interrompida continua de onde parou. Passos que percorrem tabelas grandes
+(BatchStep) processam intervalos de IDs, liberando o bloqueio de escrita entre
+um lote e outro para não bloquear os demais usuários durante a atualização.
+"""
+
+import sqlite3
+import logging
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_TABLE = "schema_migration_progress"
+DEFAULT_BATCH_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class BatchStep:
+    """
+    Passo que executa um comando sobre uma tabela em lotes de IDs.
+
+    O comando recebe dois parâmetros posicionais, o início (inclusivo) e o fim
+    (exclusivo) do intervalo de rowid do lote. Linhas inseridas depois do início
+    do passo devem ser tratadas por gatilhos criados em um passo anterior da
+    mesma migração, e o comando deve ser idempotente (por exemplo, INSERT OR
+    REPLACE), pois um lote interrompido é executado novamente na retomada.
+
+    Se `when` for informado, o passo só é executado quando a função retornar
+    True para a conexão (por exemplo, quando um recurso opcional está presente).
+    """
+    table: str
+    sql: str
+    batch_size: int = DEFAULT_BATCH_SIZE
+    when: Optional[Callable[[sqlite3.Connection], bool]] = None
+
+
+# Um passo pode ser um comando SQL, uma função que recebe a conexão ou um BatchStep
+Step = Union[str, Callable[[sqlite3.Connection], None], BatchStep]
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Migração identificada pela versão de esquema que ela produz."""
+    version: int
+    description: str
+    steps: Sequence[Step]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Retorna a versão do esquema registrada no banco de dados."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+class MigrationRunner:
+    """
+    Aplica, em ordem, as migrações ainda não aplicadas a um banco de dados.
+
+    Args:
+        migrations: Migrações conhecidas; as versões devem ser únicas e positivas.
+    """
+
+    def __init__(self, migrations: Sequence[Migration]):
+        versions = [m.version for m in migrations]
+        if len(set(versions)) != len(versions) or any(v <= 0 for v in versions):
+            raise ValueError("As versões das migrações devem ser únicas e positivas")
+        self.migrations = sorted(migrations, key=lambda m: m.version)
+
+    @property
+    def latest_version(self) -> int:
+        """Versão de esquema produzida pela última migração conhecida."""
+        return self.migrations[-1].version if self.migrations else 0
+
+    def pending(self, conn: sqlite3.Connection) -> List[Migration]:
+        """Lista as migrações ainda não aplicadas ao banco."""
+        current = get_schema_version(conn)
+        return [m for m in self.migrations if m.version > current]
+
+    def migrate(self, conn: sqlite3.Connection, target: Optional[int] = None) -> int:
+        """
+        Aplica as migrações pendentes até a versão alvo.
+
+        Args:
+            conn: Conexão com o banco de dados, fora de qualquer transação.
+            target: Versão final desejada (por padrão, a mais recente).
+
+        Returns:
+            int: Versão do esquema após a execução.
+        """
+        if conn.in_transaction:
+            raise RuntimeError("As migrações devem ser executadas fora de uma transação")
+
+        for migration in self.pending(conn):
+            if target is not None and migration.version > target:
+                break
+            self._apply(conn, migration)
+        return get_schema_version(conn)
+
+    def _apply(self, conn: sqlite3.Connection, migration: Migration) -> None:
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {PROGRESS_TABLE} ("
+            "version INTEGER PRIMARY KEY, step INTEGER NOT NULL, position INTEGER)"
+        )
+        row = conn.execute(
+            f"SELECT step, position FROM {PROGRESS_TABLE} WHERE version = ?",
+            (migration.version,)
+        ).fetchone()
+        start_step, position = row if row else (0, None)
+        if row:
+            logger.info(f"Retomando migração {migration.version} no passo {start_step}")
+
+        for index in range(start_step, len(migration.steps)):
+            step = migration.steps[index]
+            if isinstance(step, BatchStep):
+                self._run_batches(conn, migration.version, index, step, position)
+            else:
+                self._run_step(conn, migration.version, index, step)
+            position = None
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(f"DELETE FROM {PROGRESS_TABLE} WHERE version = ?", (migration.version,))
+            # PRAGMA não aceita parâmetros; a versão é sempre um inteiro validado
+            conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        logger.info(f"Migração {migration.version} aplicada: {migration.description}")
+
+    def _save_progress(self, conn: sqlite3.Connection, version: int, step: int, position: Optional[int]) -> None:
+        conn.execute(
+            f"INSERT OR REPLACE INTO {PROGRESS_TABLE} (version, step, position) VALUES (?, ?, ?)",
+            (version, step, position)
+        )
+
+    def _run_step(self, conn: sqlite3.Connection, version: int, index: int, step: Step) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if callable(step):
+                step(conn)
+            else:
+                conn.execute(step)
+            self._save_progress(conn, version, index + 1, None)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def _run_batches(
+        self,
+        conn: sqlite3.Connection,
+        version: int,
+        index: int,
+        step: BatchStep,
+        position: Optional[int]
+    ) -> None:
+        if step.when is not None and not step.when(conn):
+            conn.execute("BEGIN IMMEDIATE")
+            self._save_progress(conn, version, index + 1, None)
+            conn.commit()
+            return
+
+        # Cada lote é uma transação curta: entre um lote e outro, os demais
+        # escritores conseguem obter o bloqueio de escrita
+        end = conn.execute(f"SELECT MAX(rowid) FROM {step.table}").fetchone()[0] or 0
+        start = position if position is not None else (
+            conn.execute(f"SELECT MIN(rowid) FROM {step.table}").fetchone()[0] or 0
+        )
+
+        while start <= end:
+            stop = start + step.batch_size
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(step.sql, (start, stop))
+                self._save_progress(conn, version, index, stop)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            start = stop
+
+        conn.execute("BEGIN IMMEDIATE")
+        self._save_progress(conn, version, index + 1, None)
+        conn.commit()
@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, field_validator, ConfigDict
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+from pydantic import BaseModel, field_validator, ConfigDict, TypeAdapter
 
 class ExcavationPoint(BaseModel):
     id: Optional[int] = None
@@ -12,6 +12,7 @@ class ExcavationPoint(BaseModel):
     discovery_date: datetime = datetime.now()
     responsible: str
     srid: str = "WGS84"  # Sistema de Referência (padrão: WGS84)
+    version: Optional[int] = None  # Versão da linha no banco, para detectar alterações concorrentes
     
     model_config = ConfigDict(
         extra="ignore",
@@ -41,3 +42,86 @@ class ExcavationPoint(BaseModel):
         if not -180 <= v <= 180:
             raise ValueError('Longitude deve estar entre -180 e 180 graus')
         return v
+
+
+# Valida listas inteiras de pontos com um único validador compilado, em vez de
+# instanciar e validar um modelo por vez
+POINT_LIST_ADAPTER = TypeAdapter(List[ExcavationPoint])
+
+def validate_points(items: Sequence[Any]) -> List[ExcavationPoint]:
+    """
+    Valida vários pontos de uma só vez.
+
+    Args:
+        items: Dicionários com os campos do ponto ou objetos ExcavationPoint
+            (que são aceitos sem nova validação).
+
+    Returns:
+        list: Pontos validados, na ordem de entrada.
+
+    Raises:
+        ValidationError: Se algum item for inválido; o primeiro elemento de
+            `loc` de cada erro é a posição do item na lista.
+    """
+    return POINT_LIST_ADAPTER.validate_python(items)
+
+
+def row_mapper(columns: Sequence[str]) -> Callable[[Sequence[Sequence[Any]]], List[ExcavationPoint]]:
+    """
+    Compila uma função que converte linhas do banco em ExcavationPoint, em lote.
+
+    As posições das colunas são resolvidas uma única vez e cada lote de linhas
+    é validado por uma só chamada a POINT_LIST_ADAPTER, o que é mais rápido que
+    instanciar um modelo por linha (e que `model_construct`, que resolve os
+    campos em Python a cada chamada). Colunas que não são campos do modelo são
+    ignoradas e campos ausentes recebem o valor padrão.
+
+    Args:
+        columns: Nomes das colunas das linhas, na ordem do cursor.
+
+    Returns:
+        Callable: Função que recebe uma sequência de linhas (tuplas) e devolve
+        os pontos, na mesma ordem.
+
+    Raises:
+        ValueError: Se faltar uma coluna obrigatória do modelo.
+    """
+    fields = ExcavationPoint.model_fields
+    positions = [(name, i) for i, name in enumerate(columns) if name in fields]
+    present = {name for name, _ in positions}
+    missing = [name for name, info in fields.items() if name not in present and info.is_required()]
+    if missing:
+        raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(missing)}")
+    validate = POINT_LIST_ADAPTER.validate_python
+
+    def to_points(rows: Sequence[Sequence[Any]]) -> List[ExcavationPoint]:
+        return validate([{name: row[i] for name, i in positions} for row in rows])
+
+    return to_points
+
+
+def validate_changes(changes: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Valida alterações parciais de pontos com as mesmas regras do modelo.
+
+    Cada campo é validado isoladamente (por exemplo, a latitude continua
+    limitada a -90..90), sem exigir os demais campos obrigatórios.
+
+    Args:
+        changes: Novos valores por nome de campo.
+
+    Returns:
+        dict: Valores convertidos para os tipos do modelo.
+
+    Raises:
+        ValueError: Se um campo não existir ou não puder ser alterado.
+        ValidationError: Se algum valor for inválido.
+    """
+    invalid = [name for name in changes if name not in ExcavationPoint.model_fields or name in ("id", "version")]
+    if invalid:
+        raise ValueError(f"Campos que não podem ser alterados: {', '.join(invalid)}")
+    draft = ExcavationPoint.model_construct()
+    validator = ExcavationPoint.__pydantic_validator__
+    for name, value in changes.items():
+        validator.validate_assignment(draft, name, value)
+    return {name: getattr(draft, name) for name in changes}
@@ -0,0 +1,135 @@
+"""
+Pesquisa textual com o módulo FTS5 do SQLite.
+
+Este módulo define o índice de texto completo dos pontos de escavação: uma
+tabela virtual FTS5 mantida em sincronia com a tabela principal por gatilhos,
+além das funções que montam consultas MATCH seguras a partir do texto digitado
+pelo usuário. Cada termo é tratado como prefixo ("cer" encontra "cerâmica") e
+os acentos são ignorados na comparação.
+"""
+
+import re
+import sqlite3
+import logging
+from typing import List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Colunas textuais indexadas, na ordem em que aparecem na tabela FTS5
+FTS_COLUMNS = ["point_type", "description", "responsible"]
+
+# Separa o texto digitado em termos, preservando trechos entre aspas
+_TERM_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def fts_table(table: str) -> str:
+    """Nome da tabela FTS5 associada à tabela informada."""
+    return f"{table}_fts"
+
+
+def fts5_available(conn: sqlite3.Connection) -> bool:
+    """Indica se o SQLite em uso foi compilado com o módulo FTS5."""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.sitai_fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp.sitai_fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def search_index_exists(conn: sqlite3.Connection, table: str) -> bool:
+    """Indica se o índice de texto completo da tabela já foi criado."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (fts_table(table),)
+    ).fetchone()
+    return row is not None
+
+
+def create_search_index(conn: sqlite3.Connection, table: str) -> bool:
+    """
+    Cria a tabela FTS5 e os gatilhos que a mantêm sincronizada.
+
+    A tabela FTS5 guarda sua própria cópia do texto (em vez de usar a tabela
+    principal como conteúdo externo) para que o preenchimento inicial possa ser
+    feito em lotes idempotentes com INSERT OR REPLACE.
+
+    Args:
+        conn: Conexão com o banco de dados.
+        table: Tabela principal a ser indexada.
+
+    Returns:
+        bool: True se o índice foi criado ou já existia; False se o FTS5 não
+        estiver disponível nesta instalação do SQLite.
+    """
+    if not fts5_available(conn):
+        logger.warning("FTS5 indisponível; a pesquisa continuará usando LIKE")
+        return False
+
+    fts = fts_table(table)
+    columns = ", ".join(FTS_COLUMNS)
+    new_values = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    conn.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{columns}, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    conn.execute(
+        f"CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT OR REPLACE INTO {fts} (rowid, {columns}) VALUES (new.id, {new_values}); END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete AFTER DELETE ON {table} BEGIN "
+        f"DELETE FROM {fts} WHERE rowid = old.id; END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER IF NOT EXISTS trg_{fts}_update AFTER UPDATE OF {columns} ON {table} BEGIN "
+        f"INSERT OR REPLACE INTO {fts} (rowid, {columns}) VALUES (new.id, {new_values}); END"
+    )
+    return True
+
+
+def backfill_sql(table: str) -> str:
+    """Comando de preenchimento do índice para um intervalo de IDs (BatchStep)."""
+    columns = ", ".join(FTS_COLUMNS)
+    return (
+        f"INSERT OR REPLACE INTO {fts_table(table)} (rowid, {columns}) "
+        f"SELECT id, {columns} FROM {table} WHERE id >= ? AND id < ?"
+    )
+
+
+def split_terms(query: str) -> List[str]:
+    """Separa o texto de pesquisa em termos; trechos entre aspas formam um termo."""
+    terms = []
+    for quoted, word in _TERM_PATTERN.findall(query or ""):
+        term = (quoted or word).strip()
+        if term:
+            terms.append(term)
+    return terms
+
+
+def build_match_query(query: str, columns: Optional[Sequence[str]] = None) -> Optional[str]:
+    """
+    Monta a expressão MATCH do FTS5 para o texto digitado pelo usuário.
+
+    Cada termo é colocado entre aspas (neutralizando a sintaxe do FTS5, como
+    AND, OR, NEAR e parênteses) e marcado como prefixo; todos os termos devem
+    estar presentes. Com `columns`, a busca fica restrita a essas colunas.
+
+    Args:
+        query: Texto de pesquisa.
+        columns: Colunas da tabela FTS5 às quais a busca deve se limitar.
+
+    Returns:
+        str: Expressão MATCH, ou None se o texto não tiver termos.
+    """
+    terms = split_terms(query)
+    if not terms:
+        return None
+
+    expression = " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+    if columns:
+        invalid = [c for c in columns if c not in FTS_COLUMNS]
+        if invalid:
+            raise ValueError(f"Colunas sem índice de texto: {', '.join(invalid)}")
+        expression = f"{{{' '.join(columns)}}} : ({expression})"
+    return expression
@@ -0,0 +1,378 @@
+"""
+Registro de consultas lentas do SQLite.
+
+O módulo `sqlite3` do Python não expõe o gancho de perfil do SQLite, e o
+callback de `set_trace_callback` é chamado apenas no início de cada comando,
+sem o tempo de execução. Por isso, o tempo é medido por uma subclasse de
+cursor: cada comando acumula o tempo gasto em `execute` e nas buscas das
+linhas (`fetch*`), até o cursor ser esgotado, reutilizado, fechado ou
+descartado. Comandos acima do limite são gravados em um log local com rotação,
+um objeto JSON por linha, com o formato dos parâmetros (tipos e tamanhos,
+nunca os valores) e o resultado de EXPLAIN QUERY PLAN.
+
+O registro é opcional: sem ele, as conexões são objetos sqlite3.Connection
+comuns e nada é medido.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import functools
+import itertools
+import threading
+from datetime import datetime
+from dataclasses import dataclass
+from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD_MS = 100.0
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+# Comandos para os quais EXPLAIN QUERY PLAN é aplicável
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "REPLACE", "UPDATE", "DELETE")
+# Planos guardados por texto de comando, para não repetir o EXPLAIN
+PLAN_CACHE_SIZE = 256
+SORT_KEYS = ("total", "max", "count")
+
+_MISSING = object()
+
+
+def _value_shape(value: Any) -> str:
+    if value is None:
+        return "null"
+    name = type(value).__name__
+    if isinstance(value, (str, bytes)):
+        return f"{name}[{len(value)}]"
+    return name
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """
+    Descreve os parâmetros de um comando sem expor os valores.
+
+    Returns:
+        list | dict: Tipo de cada parâmetro, com o tamanho de textos e blobs
+        (por exemplo, ["str[12]", "float", "null"]).
+    """
+    if not parameters:
+        return []
+    if isinstance(parameters, dict):
+        return {key: _value_shape(value) for key, value in parameters.items()}
+    return [_value_shape(value) for value in parameters]
+
+
+def normalize_sql(sql: str) -> str:
+    """Remove espaços e quebras de linha repetidos do texto do comando."""
+    return " ".join(sql.split())
+
+
+class SlowQueryTracer:
+    """
+    Mede os comandos das conexões criadas por `connection_factory` e grava os lentos.
+
+    Args:
+        path: Arquivo do log; as cópias rotacionadas recebem os sufixos .1, .2...
+        threshold_ms: Duração, em milissegundos, a partir da qual um comando é gravado.
+        max_bytes: Tamanho do arquivo que dispara a rotação.
+        backup_count: Quantidade de cópias rotacionadas mantidas.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        threshold_ms: float = DEFAULT_THRESHOLD_MS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+    ):
+        if threshold_ms < 0:
+            raise ValueError("O limite de duração não pode ser negativo")
+        self.path = os.path.abspath(path)
+        self.threshold_s = threshold_ms / 1000
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._handler = RotatingFileHandler(
+            self.path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True
+        )
+        self._lock = threading.Lock()
+        self._plans: Dict[str, Optional[List[str]]] = {}
+        self.recorded = 0
+
+    def connection_factory(self) -> Callable[..., sqlite3.Connection]:
+        """Fábrica de conexões para `sqlite3.connect(factory=...)`."""
+        return functools.partial(TracedConnection, tracer=self)
+
+    def close(self) -> None:
+        """Fecha o arquivo do log."""
+        self._handler.close()
+
+    def record(
+        self,
+        conn: sqlite3.Connection,
+        sql: str,
+        parameters: Any,
+        elapsed: float,
+        rows: int,
+        many: Optional[int] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Grava o comando se a duração atingir o limite."""
+        if elapsed < self.threshold_s:
+            return
+        text = normalize_sql(sql)
+        entry: Dict[str, Any] = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "rows": rows,
+            "sql": text,
+            "params": parameter_shape(parameters),
+        }
+        if many is not None:
+            entry["many"] = many
+        if error is not None:
+            entry["error"] = error
+        entry["plan"] = self._plan(conn, sql, text, parameters)
+        self._handler.handle(logging.makeLogRecord({"msg": json.dumps(entry, ensure_ascii=False)}))
+        with self._lock:
+            self.recorded += 1
+
+    def _plan(self, conn: sqlite3.Connection, sql: str, text: str, parameters: Any) -> Optional[List[str]]:
+        with self._lock:
+            if text in self._plans:
+                return self._plans[text]
+        keyword = text.split(" ", 1)[0].upper() if text else ""
+        plan = None
+        if keyword in EXPLAINABLE:
+            try:
+                # Cursor base, para que o próprio EXPLAIN não seja medido
+                rows = sqlite3.Cursor(conn).execute(f"EXPLAIN QUERY PLAN {sql}", parameters or ()).fetchall()
+            except sqlite3.Error as e:
+                logger.debug(f"EXPLAIN QUERY PLAN falhou: {str(e)}")
+            else:
+                depth: Dict[int, int] = {0: -1}
+                plan = []
+                for node, parent, _, detail in rows:
+                    depth[node] = depth.get(parent, -1) + 1
+                    plan.append("  " * depth[node] + detail)
+        with self._lock:
+            if len(self._plans) >= PLAN_CACHE_SIZE:
+                self._plans.clear()
+            self._plans[text] = plan
+        return plan
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor que mede cada comando até que as suas linhas tenham sido lidas."""
+
+    def __init__(self, conn: "TracedConnection"):
+        super().__init__(conn)
+        self._tracer: SlowQueryTracer = conn.tracer
+        self._sql: Optional[str] = None
+        self._parameters: Any = None
+        self._elapsed = 0.0
+        self._rows = 0
+
+    def execute(self, sql: str, parameters: Any = ()) -> "TracedCursor":
+        self._finish()
+        started = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        except sqlite3.Error as e:
+            self._tracer.record(self.connection, sql, parameters, time.perf_counter() - started, 0, error=str(e))
+            raise
+        self._sql, self._parameters = sql, parameters
+        self._elapsed, self._rows = time.perf_counter() - started, 0
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Any]) -> "TracedCursor":
+        self._finish()
+        # Apenas a primeira linha de parâmetros é guardada, para o formato e o plano
+        iterator = iter(seq_of_parameters)
+        first = next(iterator, _MISSING)
+        parameters = () if first is _MISSING else first
+        if first is not _MISSING:
+            iterator = itertools.chain([first], iterator)
+        started = time.perf_counter()
+        try:
+            super().executemany(sql, iterator)
+        except sqlite3.Error as e:
+            self._tracer.record(self.connection, sql, parameters, time.perf_counter() - started, 0, error=str(e))
+            raise
+        self._tracer.record(
+            self.connection, sql, parameters, time.perf_counter() - started, max(self.rowcount, 0),
+            many=self.rowcount
+        )
+        return self
+
+    def executescript(self, sql_script: str) -> "TracedCursor":
+        self._finish()
+        started = time.perf_counter()
+        super().executescript(sql_script)
+        self._tracer.record(self.connection, sql_script, (), time.perf_counter() - started, 0)
+        return self
+
+    def fetchone(self) -> Any:
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._elapsed += time.perf_counter() - started
+        if row is None:
+            self._finish()
+        else:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size: Optional[int] = None) -> List[Any]:
+        size = self.arraysize if size is None else size
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._elapsed += time.perf_counter() - started
+        self._rows += len(rows)
+        if len(rows) < size:
+            self._finish()
+        return rows
+
+    def fetchall(self) -> List[Any]:
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._elapsed += time.perf_counter() - started
+        self._rows += len(rows)
+        self._finish()
+        return rows
+
+    def __next__(self) -> Any:
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._elapsed += time.perf_counter() - started
+            self._finish()
+            raise
+        self._elapsed += time.perf_counter() - started
+        self._rows += 1
+        return row
+
+    def close(self) -> None:
+        self._finish()
+        super().close()
+
+    def __del__(self) -> None:
+        # Cursores descartados depois de um único fetchone (o caso mais comum)
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+    def _finish(self) -> None:
+        if self._sql is None:
+            return
+        sql, self._sql = self._sql, None
+        if self.rowcount > 0 and self._rows == 0:
+            self._rows = self.rowcount  # linhas alteradas por INSERT/UPDATE/DELETE
+        self._tracer.record(self.connection, sql, self._parameters, self._elapsed, self._rows)
+
+
+class TracedConnection(sqlite3.Connection):
+    """Conexão cujos cursores medem os comandos executados."""
+
+    def __init__(self, *args: Any, tracer: SlowQueryTracer, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.tracer = tracer
+
+    def cursor(self, factory: Callable[..., sqlite3.Cursor] = TracedCursor) -> sqlite3.Cursor:
+        return super().cursor(factory)
+
+    # Os atalhos da conexão criam cursores internamente, sem passar por cursor()
+    def execute(self, sql: str, parameters: Any = ()) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Any]) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script: str) -> sqlite3.Cursor:
+        return self.cursor().executescript(sql_script)
+
+
+@dataclass
+class SlowQueryStats:
+    """Ocorrências de um mesmo comando no log de consultas lentas."""
+    sql: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    errors: int = 0
+    # Formato dos parâmetros e plano da ocorrência mais lenta
+    params: Any = None
+    plan: Optional[List[str]] = None
+
+    @property
+    def mean_ms(self) -> float:
+        """Duração média, em milissegundos."""
+        return self.total_ms / self.count if self.count else 0.0
+
+
+def log_files(path: str) -> List[str]:
+    """Arquivos do log, das cópias rotacionadas mais antigas ao arquivo atual."""
+    files = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        files.append(f"{path}.{index}")
+        index += 1
+    files.reverse()
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def read_slow_log(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Lê as entradas do log e das suas cópias rotacionadas.
+
+    Linhas que não forem JSON válido (por exemplo, cortadas por uma queda do
+    processo) são ignoradas.
+    """
+    for file_path in log_files(path):
+        with open(file_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict) and "sql" in entry and "elapsed_ms" in entry:
+                    yield entry
+
+
+def summarize_slow_log(entries: Iterable[Dict[str, Any]], sort: str = "total") -> List[SlowQueryStats]:
+    """
+    Agrupa as entradas pelo texto do comando.
+
+    Args:
+        entries: Entradas lidas com read_slow_log.
+        sort: Critério de ordenação: "total" (tempo somado), "max" ou "count".
+
+    Returns:
+        list: Um SlowQueryStats por comando, dos piores aos melhores.
+
+    Raises:
+        ValueError: Se o critério de ordenação for inválido.
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Ordenação inválida: {sort} (use {', '.join(SORT_KEYS)})")
+    stats: Dict[str, SlowQueryStats] = {}
+    for entry in entries:
+        item = stats.get(entry["sql"])
+        if item is None:
+            item = stats[entry["sql"]] = SlowQueryStats(entry["sql"])
+        elapsed = float(entry["elapsed_ms"])
+        item.count += 1
+        item.total_ms += elapsed
+        item.rows += int(entry.get("rows") or 0)
+        item.errors += 1 if entry.get("error") else 0
+        if elapsed >= item.max_ms:
+            item.max_ms = elapsed
+            item.params = entry.get("params")
+            item.plan = entry.get("plan")
+    key = {"total": "total_ms", "max": "max_ms", "count": "count"}[sort]
+    return sorted(stats.values(), key=lambda s: getattr(s, key), reverse=True)
@@ -0,0 +1,199 @@
+"""
+Índice espacial R*Tree para as coordenadas dos pontos de escavação.
+
+O módulo R*Tree do SQLite indexa retângulos; cada ponto é guardado como um
+retângulo degenerado (mínimo igual ao máximo) em uma tabela virtual mantida em
+sincronia com a tabela principal por gatilhos. Consultas por área percorrem
+apenas os nós da árvore que intersectam o retângulo pedido, em vez de toda a
+tabela.
+
+O R*Tree armazena as coordenadas como números de ponto flutuante de 32 bits,
+arredondando as caixas para fora; por isso a consulta no índice devolve um
+superconjunto dos pontos, refinado depois com as coordenadas exatas.
+
+As buscas por distância usam o mesmo índice como pré-filtro: o círculo pedido
+é convertido no menor retângulo que o contém e as distâncias dos candidatos
+são calculadas de uma só vez com NumPy (fórmula de haversine).
+"""
+
+import math
+import sqlite3
+import logging
+from typing import List, Tuple, TYPE_CHECKING
+
+# O NumPy só é importado pelo cálculo das distâncias, para não pesar na
+# importação de quem usa apenas o índice espacial
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Raio médio da Terra (IUGG), em metros
+EARTH_RADIUS_M = 6371008.8
+
+# Retângulo geográfico: (latitude mínima, longitude mínima, latitude máxima, longitude máxima)
+BoundingBox = Tuple[float, float, float, float]
+
+
+def rtree_table(table: str) -> str:
+    """Nome da tabela R*Tree associada à tabela informada."""
+    return f"{table}_rtree"
+
+
+def rtree_available(conn: sqlite3.Connection) -> bool:
+    """Indica se o SQLite em uso foi compilado com o módulo R*Tree."""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.sitai_rtree_probe USING rtree(id, x0, x1)")
+        conn.execute("DROP TABLE temp.sitai_rtree_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def spatial_index_exists(conn: sqlite3.Connection, table: str) -> bool:
+    """Indica se o índice espacial da tabela já foi criado."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (rtree_table(table),)
+    ).fetchone()
+    return row is not None
+
+
+def create_spatial_index(conn: sqlite3.Connection, table: str) -> bool:
+    """
+    Cria a tabela R*Tree e os gatilhos que a mantêm sincronizada.
+
+    Args:
+        conn: Conexão com o banco de dados.
+        table: Tabela principal, com as colunas id, latitude e longitude.
+
+    Returns:
+        bool: True se o índice foi criado ou já existia; False se o R*Tree não
+        estiver disponível nesta instalação do SQLite.
+    """
+    if not rtree_available(conn):
+        logger.warning("R*Tree indisponível; consultas por área usarão o índice de coordenadas")
+        return False
+
+    rtree = rtree_table(table)
+    new_box = "new.id, new.latitude, new.latitude, new.longitude, new.longitude"
+    conn.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {rtree} "
+        "USING rtree(id, min_lat, max_lat, min_lon, max_lon)"
+    )
+    conn.execute(
+        f"CREATE TRIGGER IF NOT EXISTS trg_{rtree}_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT OR REPLACE INTO {rtree} VALUES ({new_box}); END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER IF NOT EXISTS trg_{rtree}_delete AFTER DELETE ON {table} BEGIN "
+        f"DELETE FROM {rtree} WHERE id = old.id; END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER IF NOT EXISTS trg_{rtree}_update AFTER UPDATE OF latitude, longitude ON {table} BEGIN "
+        f"INSERT OR REPLACE INTO {rtree} VALUES ({new_box}); END"
+    )
+    return True
+
+
+def spatial_backfill_sql(table: str) -> str:
+    """Comando de preenchimento do índice para um intervalo de IDs (BatchStep)."""
+    return (
+        f"INSERT OR REPLACE INTO {rtree_table(table)} "
+        f"SELECT id, latitude, latitude, longitude, longitude FROM {table} WHERE id >= ? AND id < ?"
+    )
+
+
+def validate_bbox(min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> BoundingBox:
+    """
+    Valida um retângulo geográfico.
+
+    Raises:
+        ValueError: Se os limites estiverem invertidos ou fora das faixas
+            válidas de latitude e longitude.
+    """
+    bbox = tuple(float(v) for v in (min_lat, min_lon, max_lat, max_lon))
+    min_lat, min_lon, max_lat, max_lon = bbox
+    if not (-90 <= min_lat <= max_lat <= 90):
+        raise ValueError("Latitudes devem estar entre -90 e 90, com a mínima menor ou igual à máxima")
+    if not (-180 <= min_lon <= max_lon <= 180):
+        raise ValueError("Longitudes devem estar entre -180 e 180, com a mínima menor ou igual à máxima")
+    return bbox  # type: ignore[return-value]
+
+
+def bbox_condition(table: str, bbox: BoundingBox, alias: str = "", use_index: bool = True) -> Tuple[str, List[float]]:
+    """
+    Monta a condição WHERE que seleciona os pontos dentro do retângulo.
+
+    Args:
+        table: Tabela principal.
+        bbox: Retângulo já validado (ver validate_bbox).
+        alias: Apelido da tabela principal na consulta (opcional).
+        use_index: Se True, pré-filtra os IDs pela tabela R*Tree.
+
+    Returns:
+        tuple: Trecho SQL e lista de parâmetros correspondentes.
+    """
+    min_lat, min_lon, max_lat, max_lon = bbox
+    prefix = f"{alias}." if alias else ""
+    sql = f"{prefix}latitude BETWEEN ? AND ? AND {prefix}longitude BETWEEN ? AND ?"
+    params = [min_lat, max_lat, min_lon, max_lon]
+    if use_index:
+        sql = (
+            f"{prefix}id IN (SELECT id FROM {rtree_table(table)} "
+            "WHERE max_lat >= ? AND min_lat <= ? AND max_lon >= ? AND min_lon <= ?) AND " + sql
+        )
+        params = [min_lat, max_lat, min_lon, max_lon] + params
+    return sql, params
+
+
+def haversine_distances(lat: float, lon: float, lats: "np.ndarray", lons: "np.ndarray") -> "np.ndarray":
+    """
+    Calcula as distâncias de um ponto a vários outros pela fórmula de haversine.
+
+    Args:
+        lat: Latitude do ponto de referência, em graus.
+        lon: Longitude do ponto de referência, em graus.
+        lats: Latitudes dos demais pontos, em graus.
+        lons: Longitudes dos demais pontos, em graus.
+
+    Returns:
+        numpy.ndarray: Distâncias em metros, na ordem de `lats` e `lons`.
+    """
+    import numpy as np
+
+    phi = math.radians(lat)
+    phis = np.radians(np.asarray(lats, dtype=np.float64))
+    dphi = phis - phi
+    dlambda = np.radians(np.asarray(lons, dtype=np.float64) - lon)
+    a = np.sin(dphi / 2) ** 2 + math.cos(phi) * np.cos(phis) * np.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def radius_bbox(lat: float, lon: float, meters: float) -> BoundingBox:
+    """
+    Retorna o menor retângulo que contém o círculo de raio `meters` em torno do ponto.
+
+    Quando o círculo alcança um dos polos ou atravessa o antimeridiano, o
+    retângulo passa a cobrir todas as longitudes.
+    """
+    if meters < 0:
+        raise ValueError("O raio não pode ser negativo")
+
+    delta = meters / EARTH_RADIUS_M
+    if delta >= math.pi:
+        return (-90.0, -180.0, 90.0, 180.0)
+
+    phi = math.radians(lat)
+    min_lat = max(-90.0, lat - math.degrees(delta))
+    max_lat = min(90.0, lat + math.degrees(delta))
+
+    cos_phi = math.cos(phi)
+    if math.sin(delta) >= cos_phi or min_lat <= -90.0 or max_lat >= 90.0:
+        return (min_lat, -180.0, max_lat, 180.0)
+
+    # Maior afastamento em longitude dos pontos do círculo
+    dlon = math.degrees(math.asin(math.sin(delta) / cos_phi))
+    if lon - dlon < -180.0 or lon + dlon > 180.0:
+        return (min_lat, -180.0, max_lat, 180.0)
+    return (min_lat, lon - dlon, max_lat, lon + dlon)
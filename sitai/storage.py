@@ -0,0 +1,144 @@
+"""
+Perfil de armazenamento do SQLite e tratamento de bloqueios concorrentes.
+
+Este módulo concentra as configurações (PRAGMAs) que definem como o SQLite grava
+os dados em disco: modo de journal, nível de sincronização, tempo de espera por
+bloqueios e política de checkpoint do WAL. Também fornece um decorador que
+repete, com espera exponencial, operações que falham com SQLITE_BUSY.
+"""
+
+import sqlite3
+import time
+import random
+import logging
+import functools
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+JOURNAL_MODES = ("WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF")
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+
+# Códigos primários do SQLite para banco ocupado/bloqueado
+SQLITE_BUSY = 5
+SQLITE_LOCKED = 6
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    """
+    Configuração de armazenamento aplicada ao banco e a cada conexão.
+
+    O modo WAL permite que leitores executem em paralelo com um escritor; com ele,
+    o nível de sincronização NORMAL é seguro contra corrupção e evita um fsync
+    por transação. O checkpoint automático transfere o WAL para o banco a cada
+    `wal_autocheckpoint` páginas e `journal_size_limit` limita o tamanho que o
+    arquivo WAL mantém em disco após o checkpoint.
+    """
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    busy_timeout_ms: int = 5000
+    wal_autocheckpoint: int = 1000
+    journal_size_limit: int = 64 * 1024 * 1024
+
+    def __post_init__(self) -> None:
+        if self.journal_mode.upper() not in JOURNAL_MODES:
+            raise ValueError(f"Modo de journal inválido: {self.journal_mode}")
+        if self.synchronous.upper() not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Nível de sincronização inválido: {self.synchronous}")
+        if self.busy_timeout_ms < 0 or self.wal_autocheckpoint < 0:
+            raise ValueError("busy_timeout_ms e wal_autocheckpoint não podem ser negativos")
+
+    def apply_connection_settings(self, conn: sqlite3.Connection) -> None:
+        """
+        Aplica as configurações que valem apenas para a conexão informada.
+
+        Args:
+            conn: Conexão recém-aberta com o banco de dados.
+        """
+        conn.execute(f"PRAGMA synchronous = {self.synchronous.upper()}")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA wal_autocheckpoint = {int(self.wal_autocheckpoint)}")
+        conn.execute(f"PRAGMA journal_size_limit = {int(self.journal_size_limit)}")
+
+    def apply(self, conn: sqlite3.Connection) -> str:
+        """
+        Aplica o perfil completo, incluindo o modo de journal persistente no arquivo.
+
+        Args:
+            conn: Conexão com o banco de dados, fora de qualquer transação.
+
+        Returns:
+            str: Modo de journal efetivamente ativo.
+        """
+        mode = conn.execute(f"PRAGMA journal_mode = {self.journal_mode.upper()}").fetchone()[0]
+        if mode.upper() != self.journal_mode.upper():
+            logger.warning(f"Modo de journal {self.journal_mode} indisponível, usando {mode}")
+        self.apply_connection_settings(conn)
+        return mode
+
+
+def checkpoint(conn: sqlite3.Connection, mode: str = "PASSIVE") -> tuple:
+    """
+    Executa um checkpoint do WAL.
+
+    Args:
+        conn: Conexão com o banco de dados.
+        mode: Modo do checkpoint (PASSIVE, FULL, RESTART ou TRUNCATE).
+
+    Returns:
+        tuple: (ocupado, páginas no WAL, páginas transferidas), como retornado pelo SQLite.
+    """
+    mode = mode.upper()
+    if mode not in CHECKPOINT_MODES:
+        raise ValueError(f"Modo de checkpoint inválido: {mode}")
+    return tuple(conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone())
+
+
+def is_busy_error(error: BaseException) -> bool:
+    """Indica se a exceção corresponde a um banco ocupado ou bloqueado."""
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (SQLITE_BUSY, SQLITE_LOCKED)
+    message = str(error).lower()
+    return "database is locked" in message or "database is busy" in message
+
+
+def retry_on_busy(attempts: int = 5, base_delay: float = 0.05, max_delay: float = 1.0) -> Callable[[F], F]:
+    """
+    Decorador que repete a operação quando o SQLite retorna SQLITE_BUSY.
+
+    A espera cresce exponencialmente a partir de `base_delay`, limitada a
+    `max_delay`, com variação aleatória para que escritores concorrentes não
+    tentem novamente ao mesmo tempo. Esgotadas as tentativas, a exceção original
+    é propagada.
+
+    Args:
+        attempts: Número máximo de tentativas.
+        base_delay: Espera inicial em segundos.
+        max_delay: Espera máxima em segundos.
+    """
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            for attempt in range(1, attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except sqlite3.OperationalError as e:
+                    if attempt == attempts or not is_busy_error(e):
+                        raise
+                    delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+                    delay *= random.uniform(0.5, 1.0)
+                    logger.warning(
+                        f"Banco ocupado em {func.__name__} (tentativa {attempt}/{attempts}), "
+                        f"nova tentativa em {delay:.3f}s"
+                    )
+                    time.sleep(delay)
+        return wrapper  # type: ignore[return-value]
+    return decorator
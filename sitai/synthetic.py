@@ -0,0 +1,369 @@
+"""
+Gerador de catálogos sintéticos de escavações para testes de carga e de escala.
+
+Os pontos são agrupados em sítios espalhados por regiões arqueológicas da bacia
+amazônica (Manaus, Santarém, Marajó, Alto Xingu, geoglifos do Acre etc.). Cada
+sítio tem centro, raio, altitude, equipe de responsáveis, sistema de referência
+e ano da primeira campanha próprios; a quantidade de pontos por sítio segue
+uma distribuição de cauda longa, assim como as datas, concentradas nas
+campanhas mais recentes e na estação seca.
+
+Os tipos de ponto são os oferecidos no cadastro da interface, com alguns tipos
+livres ("Outro"), e as descrições, em português, têm tamanhos variados. Com a
+mesma semente, o gerador produz sempre as mesmas linhas.
+
+Uso:
+    sitai generate 1000000 --seed 42 --db catalogo.db
+"""
+
+import math
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEED = 42
+DEFAULT_SITE_COUNT = 2000
+DEFAULT_RESPONSIBLE_COUNT = 60
+# Linhas geradas por vez; não depende do tamanho dos lotes de gravação, para
+# que a mesma semente produza as mesmas linhas
+BLOCK_SIZE = 10000
+
+METERS_PER_DEGREE = 111320.0
+FIRST_YEAR = 1950
+END_DATE = np.datetime64("2025-06-30")
+
+# Regiões: (nome, latitude, longitude, dispersão dos sítios em graus, peso)
+REGIONS = [
+    ("Manaus e confluência Negro-Solimões", -3.10, -60.02, 0.8, 18),
+    ("Santarém e baixo Tapajós", -2.44, -54.71, 0.7, 14),
+    ("Ilha de Marajó", -0.95, -49.60, 0.8, 12),
+    ("Médio Solimões (Tefé)", -3.35, -64.71, 0.7, 8),
+    ("Parintins", -2.63, -56.74, 0.5, 6),
+    ("Médio Tapajós (Itaituba)", -4.27, -55.98, 0.7, 5),
+    ("Rio Negro (Barcelos)", -0.97, -62.93, 0.8, 5),
+    ("Xingu (Altamira)", -3.20, -52.21, 0.6, 6),
+    ("Alto Xingu", -12.00, -53.40, 1.0, 7),
+    ("Alto Madeira (Porto Velho)", -8.76, -63.90, 0.9, 7),
+    ("Geoglifos do Acre", -9.97, -67.81, 0.9, 8),
+    ("Amapá (Macapá)", 0.03, -51.07, 0.5, 4),
+]
+
+# Tipos oferecidos no cadastro (app.py) e seus pesos
+POINT_TYPES = [
+    ("Artefato indígena", 30),
+    ("Utensílio indígena", 24),
+    ("Antiga cabana indígena", 14),
+    ("Armas de caça", 12),
+    ("Restos mortais", 8),
+    ("Possível vestimenta", 4),
+]
+# Tipos livres, informados com a opção "Outro" do cadastro
+CUSTOM_POINT_TYPES = ["Terra preta arqueológica", "Geoglifo", "Gravura rupestre", "Sambaqui fluvial", "Oficina lítica"]
+CUSTOM_TYPE_RATE = 0.03
+
+# Sistemas de referência por época da primeira campanha do sítio: (até o ano, pesos)
+SRID_BY_ERA = [
+    (1990, {"SAD69": 0.85, "WGS84": 0.15}),
+    (2005, {"SAD69": 0.35, "WGS84": 0.55, "SIRGAS2000": 0.10}),
+    (2015, {"WGS84": 0.55, "SIRGAS2000": 0.45}),
+    (9999, {"WGS84": 0.60, "SIRGAS2000": 0.38, "SAD69": 0.02}),
+]
+
+FEMALE_NAMES = ["Ana", "Beatriz", "Mariana", "Luíza", "Fernanda", "Helena", "Juliana", "Patrícia", "Camila", "Larissa", "Raquel", "Yara"]
+MALE_NAMES = ["Carlos", "João", "Paulo", "Rafael", "Tiago", "Marcos", "Eduardo", "Gabriel", "André", "Rodrigo", "Caio", "Raoni"]
+SURNAMES = [
+    "Silva", "Souza", "Lima", "Pereira", "Oliveira", "Costa", "Rodrigues", "Almeida", "Nascimento",
+    "Carvalho", "Gomes", "Barbosa", "Ribeiro", "Martins", "Araújo", "Cardoso", "Neves", "Tavares",
+]
+
+# Frase inicial da descrição, por tipo de ponto
+OPENINGS = {
+    "Artefato indígena": [
+        "Fragmento de cerâmica com decoração incisa",
+        "Vaso cerâmico parcialmente preservado",
+        "Conjunto de fragmentos cerâmicos com engobo vermelho",
+        "Estatueta antropomorfa em cerâmica",
+        "Adorno em pedra polida",
+    ],
+    "Utensílio indígena": [
+        "Lâmina de machado polida",
+        "Fragmento de assador de mandioca",
+        "Raspador lítico em quartzo",
+        "Mão de pilão em arenito",
+        "Tigela cerâmica com marcas de uso",
+    ],
+    "Antiga cabana indígena": [
+        "Vestígios de estrutura habitacional",
+        "Marcas de esteios de uma antiga cabana",
+        "Piso de terra batida com restos de fogueira",
+        "Alinhamento de buracos de estaca",
+    ],
+    "Armas de caça": [
+        "Ponta de flecha em sílex",
+        "Ponta de projétil lascada",
+        "Fragmento de lâmina lítica retocada",
+        "Peso de rede em cerâmica",
+    ],
+    "Restos mortais": [
+        "Urna funerária com restos ósseos",
+        "Sepultamento primário em posição fletida",
+        "Fragmentos ósseos associados a cerâmica",
+    ],
+    "Possível vestimenta": [
+        "Contas de colar em semente e osso",
+        "Fragmento de tecido vegetal carbonizado",
+        "Tanga cerâmica fragmentada",
+    ],
+}
+CUSTOM_OPENINGS = [
+    "Feição registrada durante o levantamento",
+    "Ocorrência identificada na prospecção de superfície",
+]
+# Frases complementares; {depth}, {count} e {meters} são preenchidos ao gerar
+DETAILS = [
+    "Material coletado a {depth} cm de profundidade.",
+    "Solo de terra preta com fragmentos de carvão.",
+    "Área sujeita a alagamento no período de cheia.",
+    "Registro fotográfico e croqui anexados ao caderno de campo.",
+    "Foram contabilizadas {count} peças no mesmo nível.",
+    "Ocorrência a {meters} m da margem do rio.",
+    "Decoração característica da tradição Polícroma da Amazônia.",
+    "Presença de peças lascadas em quartzo e sílex.",
+    "Amostra de carvão enviada para datação por radiocarbono.",
+    "Estado de conservação regular, com fraturas recentes.",
+    "Sedimento peneirado em malha de 3 mm.",
+    "Informação fornecida por moradores da comunidade ribeirinha.",
+]
+# Probabilidade de cada quantidade de frases complementares (0 a 5)
+DETAIL_COUNT_WEIGHTS = [0.20, 0.32, 0.24, 0.14, 0.07, 0.03]
+EMPTY_DESCRIPTION_RATE = 0.02
+
+# Proporção dos pontos coletados na estação seca (junho a novembro)
+DRY_SEASON_RATE = 0.8
+
+
+@dataclass
+class Sites:
+    """Atributos dos sítios, um elemento por sítio em cada array."""
+    latitude: np.ndarray
+    longitude: np.ndarray
+    radius_m: np.ndarray
+    altitude: np.ndarray
+    first_year: np.ndarray
+    duration_days: np.ndarray
+    srid: np.ndarray
+    team: np.ndarray
+    team_size: np.ndarray
+    weight: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.latitude)
+
+
+def _normalized(weights: Sequence[float]) -> np.ndarray:
+    values = np.asarray(weights, dtype=np.float64)
+    return values / values.sum()
+
+
+def make_responsibles(count: int, rng: np.random.Generator) -> List[str]:
+    """Gera nomes distintos de responsáveis, com e sem título."""
+    limit = (len(FEMALE_NAMES) + len(MALE_NAMES)) * len(SURNAMES) * (len(SURNAMES) + 1)
+    if count > limit:
+        raise ValueError(f"No máximo {limit} responsáveis distintos podem ser gerados")
+    names: List[str] = []
+    seen = set()
+    while len(names) < count:
+        female = rng.random() < 0.5
+        first = rng.choice(FEMALE_NAMES if female else MALE_NAMES)
+        surname = rng.choice(SURNAMES)
+        name = f"{first} {surname}"
+        if name in seen:
+            surname = f"{surname} {rng.choice(SURNAMES)}"
+            name = f"{first} {surname}"
+            if name in seen:
+                continue
+        seen.add(name)
+        if rng.random() < 0.7:
+            name = f"{'Dra.' if female else 'Dr.'} {name}"
+        names.append(name)
+    return names
+
+
+class CatalogueGenerator:
+    """
+    Gerador determinístico de pontos de escavação sintéticos.
+
+    Args:
+        seed: Semente; a mesma semente produz sempre os mesmos sítios e linhas.
+        site_count: Quantidade de sítios em que os pontos são agrupados.
+        responsible_count: Quantidade de responsáveis distintos.
+    """
+
+    def __init__(
+        self,
+        seed: int = DEFAULT_SEED,
+        site_count: int = DEFAULT_SITE_COUNT,
+        responsible_count: int = DEFAULT_RESPONSIBLE_COUNT
+    ):
+        if site_count <= 0 or responsible_count <= 0:
+            raise ValueError("site_count e responsible_count devem ser maiores que zero")
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self.responsibles = make_responsibles(responsible_count, rng)
+        self.point_types = [name for name, _ in POINT_TYPES] + CUSTOM_POINT_TYPES
+        self.srids = sorted({srid for _, weights in SRID_BY_ERA for srid in weights})
+        self.sites = self._make_sites(site_count, rng)
+
+    def _make_sites(self, count: int, rng: np.random.Generator) -> Sites:
+        region = rng.choice(len(REGIONS), size=count, p=_normalized([r[4] for r in REGIONS]))
+        centers = np.array([(r[1], r[2], r[3]) for r in REGIONS])[region]
+        latitude = np.clip(centers[:, 0] + rng.normal(0, centers[:, 2] / 2), -15.0, 5.0)
+        longitude = np.clip(centers[:, 1] + rng.normal(0, centers[:, 2] / 2), -75.0, -44.0)
+        radius_m = np.clip(rng.lognormal(math.log(300), 0.8, size=count), 30, 3000)
+
+        # Planície baixa a leste, subindo para oeste e para o planalto ao sul
+        altitude = (
+            8 + np.maximum(0, -49 - longitude) * 7 + np.maximum(0, -7 - latitude) * 45
+            + rng.normal(0, 12, size=count)
+        )
+        altitude = np.clip(altitude, 2, 900)
+
+        # Campanhas recentes são mais frequentes
+        first_year = np.clip(2024 - rng.exponential(9, size=count).astype(np.int64), FIRST_YEAR, 2024)
+        duration_days = np.clip(rng.lognormal(math.log(120), 1.0, size=count), 5, 3650)
+
+        srid = np.empty(count, dtype=np.int64)
+        for i, year in enumerate(first_year):
+            weights = next(w for limit, w in SRID_BY_ERA if year <= limit)
+            names = list(weights)
+            srid[i] = self.srids.index(names[rng.choice(len(names), p=_normalized(list(weights.values())))])
+
+        # Equipes de 1 a 4 responsáveis, com alguns responsáveis muito mais ativos
+        people = len(self.responsibles)
+        popularity = _normalized(1 / np.arange(1, people + 1) ** 0.8)
+        team_size = rng.integers(1, min(4, people) + 1, size=count)
+        team = np.stack([rng.choice(people, size=count, p=popularity) for _ in range(4)], axis=1)
+
+        # Poucos sítios concentram muitos pontos (Zipf)
+        weight = _normalized(1 / np.arange(1, count + 1) ** 0.9)
+        weight = weight[rng.permutation(count)]
+
+        return Sites(latitude, longitude, radius_m, altitude, first_year, duration_days, srid, team, team_size, weight)
+
+    def iter_rows(self, count: int) -> Iterator[Tuple[Any, ...]]:
+        """
+        Gera as linhas na ordem das colunas de INSERT_SQL.
+
+        Args:
+            count: Quantidade de pontos.
+
+        Yields:
+            tuple: (tipo, latitude, longitude, altitude, descrição, data ISO,
+            responsável, SRID), com valores que passam pela validação de
+            ExcavationPoint.
+        """
+        rng = np.random.default_rng([self.seed, 1])
+        remaining = count
+        while remaining > 0:
+            size = min(BLOCK_SIZE, remaining)
+            yield from self._block(size, rng)
+            remaining -= size
+
+    def iter_points(self, count: int) -> Iterator[Any]:
+        """Gera os mesmos pontos de iter_rows como objetos ExcavationPoint validados."""
+        from sitai.models import ExcavationPoint
+
+        for point_type, lat, lon, alt, description, date, responsible, srid in self.iter_rows(count):
+            yield ExcavationPoint(
+                point_type=point_type, latitude=lat, longitude=lon, altitude=alt,
+                description=description, discovery_date=datetime.fromisoformat(date),
+                responsible=responsible, srid=srid
+            )
+
+    def _block(self, size: int, rng: np.random.Generator) -> Iterator[Tuple[Any, ...]]:
+        sites = self.sites
+        site = rng.choice(len(sites), size=size, p=sites.weight)
+
+        # Deslocamento em metros em torno do centro do sítio
+        spread = sites.radius_m[site] / 2
+        north = rng.normal(0, spread)
+        east = rng.normal(0, spread)
+        latitude = np.clip(sites.latitude[site] + north / METERS_PER_DEGREE, -90, 90)
+        longitude = sites.longitude[site] + east / (METERS_PER_DEGREE * np.cos(np.radians(latitude)))
+        longitude = np.clip(longitude, -180, 180)
+        altitude = np.maximum(0, sites.altitude[site] + rng.normal(0, 1.5, size=size))
+
+        type_count = len(POINT_TYPES)
+        point_type = rng.choice(type_count, size=size, p=_normalized([w for _, w in POINT_TYPES]))
+        custom = rng.random(size) < CUSTOM_TYPE_RATE
+        point_type[custom] = type_count + rng.integers(0, len(CUSTOM_POINT_TYPES), size=int(custom.sum()))
+
+        # Datas: a partir da primeira campanha, concentradas no início dela e na estação seca
+        year_start = (sites.first_year[site] - 1970).astype("datetime64[Y]").astype("datetime64[D]")
+        season = np.where(
+            rng.random(size) < DRY_SEASON_RATE,
+            rng.integers(151, 334, size=size),  # junho a novembro
+            rng.integers(0, 365, size=size),
+        )
+        elapsed = rng.exponential(sites.duration_days[site]).astype(np.int64)
+        days = np.minimum(year_start + season + elapsed, END_DATE)
+        minutes = rng.integers(7 * 60, 17 * 60, size=size)
+        dates = np.datetime_as_string(days.astype("datetime64[s]") + minutes * 60, unit="s")
+
+        member = (rng.random(size) * sites.team_size[site]).astype(np.int64)
+        responsible = sites.team[site, member]
+        srid = sites.srid[site]
+
+        detail_count = rng.choice(len(DETAIL_COUNT_WEIGHTS), size=size, p=_normalized(DETAIL_COUNT_WEIGHTS))
+        empty = rng.random(size) < EMPTY_DESCRIPTION_RATE
+        opening_pick = rng.integers(0, 1 << 30, size=size)
+        detail_pick = rng.integers(0, len(DETAILS), size=(size, len(DETAIL_COUNT_WEIGHTS) - 1))
+        numbers = rng.integers(1, 400, size=(size, 3))
+
+        point_types = self.point_types
+        responsibles = self.responsibles
+        srids = self.srids
+        for i, (type_index, lat, lon, alt, date, person, ref) in enumerate(zip(
+            point_type.tolist(), np.round(latitude, 6).tolist(), np.round(longitude, 6).tolist(),
+            np.round(altitude, 2).tolist(), dates.tolist(), responsible.tolist(), srid.tolist()
+        )):
+            name = point_types[type_index]
+            if empty[i]:
+                description = ""
+            else:
+                openings = OPENINGS.get(name, CUSTOM_OPENINGS)
+                parts = [openings[opening_pick[i] % len(openings)] + "."]
+                depth, pieces, meters = numbers[i].tolist()
+                for detail in detail_pick[i, :detail_count[i]].tolist():
+                    parts.append(DETAILS[detail].format(depth=depth, count=pieces, meters=meters * 5))
+                description = " ".join(parts)
+            yield (name, lat, lon, alt, description, date, responsibles[person], srids[ref])
+
+
+def generate_catalogue(
+    db: Any,
+    count: int,
+    seed: int = DEFAULT_SEED,
+    site_count: int = DEFAULT_SITE_COUNT
+) -> int:
+    """
+    Grava um catálogo sintético no banco configurado no módulo de banco de dados.
+
+    Args:
+        db: Módulo de banco de dados (database), já inicializado.
+        count: Quantidade de pontos.
+        seed: Semente do gerador.
+        site_count: Quantidade de sítios.
+
+    Returns:
+        int: Quantidade de pontos gravados.
+    """
+    generator = CatalogueGenerator(seed=seed, site_count=site_count)
+    written = db.load_point_rows(generator.iter_rows(count))
+    logger.info(f"Catálogo sintético gravado: {written} pontos em {site_count} sítios (semente {seed})")
+    return written
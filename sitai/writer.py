@@ -0,0 +1,243 @@
+"""
+Fila de escrita com confirmação em grupo (group commit).
+
+No SQLite só uma conexão escreve por vez, e cada transação confirmada paga a
+sincronização do arquivo com o disco. Quando várias sessões gravam ao mesmo
+tempo, cada uma disputa o bloqueio de escrita e confirma sozinha. O escritor
+deste módulo é uma única thread que retira os pedidos de uma fila, junta os
+que chegam dentro de uma janela de tempo (até um tamanho máximo de lote) e os
+grava em uma única transação.
+
+Cada pedido roda dentro de um SAVEPOINT próprio: um pedido que falha é
+desfeito sozinho e recebe a própria exceção, sem afetar os demais do lote.
+Quem enviou o pedido recebe um Future, resolvido somente depois da
+confirmação da transação.
+"""
+
+import time
+import queue
+import sqlite3
+import logging
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, replace
+from typing import Any, Callable, ContextManager, List, Optional, Tuple, TypeVar
+
+from sitai.aio import ExecutorClosedError
+from sitai.storage import retry_on_busy
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Janela, em milissegundos, em que novos pedidos são reunidos ao lote. Com
+# janela 0, o lote reúne os pedidos que chegaram enquanto o anterior era
+# gravado; é o melhor quando os chamadores aguardam o resultado (create_point),
+# pois nenhum deles envia outro pedido durante a espera. Uma janela maior só
+# compensa para quem envia vários pedidos sem aguardar (submit_point).
+DEFAULT_WINDOW_MS = 0.0
+DEFAULT_MAX_BATCH = 256
+
+# Pedido: Future do chamador e operação que recebe a conexão de escrita
+_Request = Tuple["Future[Any]", Callable[[sqlite3.Connection], Any]]
+
+
+@dataclass
+class WriterStats:
+    """Contadores da fila de escrita."""
+    requests: int = 0
+    batches: int = 0
+    errors: int = 0
+    largest_batch: int = 0
+
+    @property
+    def mean_batch(self) -> float:
+        """Quantidade média de pedidos confirmados por transação."""
+        return self.requests / self.batches if self.batches else 0.0
+
+
+class GroupCommitWriter:
+    """
+    Thread única de escrita que confirma os pedidos em grupo.
+
+    Args:
+        connect: Função que fornece a conexão de escrita como gerenciador de
+            contexto (por exemplo, `ConnectionManager.connection` já ligado ao
+            caminho do banco).
+        window_ms: Tempo máximo, em milissegundos, de espera por novos pedidos
+            depois do primeiro pedido do lote (0 reúne apenas os já enfileirados).
+        max_batch: Quantidade máxima de pedidos por transação.
+        on_commit: Função chamada após cada confirmação com a quantidade de
+            pedidos gravados (por exemplo, para invalidar um cache).
+        metrics: Registro de métricas (sitai.metrics.MetricsRegistry) em que
+            cada lote é medido como a operação "group_commit" (opcional).
+        name: Nome da thread.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], ContextManager[sqlite3.Connection]],
+        window_ms: float = DEFAULT_WINDOW_MS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        on_commit: Optional[Callable[[int], Any]] = None,
+        metrics: Any = None,
+        name: str = "sitai-writer",
+    ):
+        if window_ms < 0 or max_batch <= 0:
+            raise ValueError("window_ms não pode ser negativo e max_batch deve ser maior que zero")
+        self.window_s = window_ms / 1000
+        self.max_batch = max_batch
+        self._connect = connect
+        self._on_commit = on_commit
+        self._metrics = metrics
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = WriterStats()
+        self._closed = False
+        self._thread = threading.Thread(target=self._work, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, operation: Callable[[sqlite3.Connection], T]) -> "Future[T]":
+        """
+        Enfileira uma operação de escrita.
+
+        A operação recebe a conexão de escrita, já dentro da transação do lote,
+        e não deve confirmar nem desfazer a transação. Ela pode ser executada
+        mais de uma vez se o lote for repetido por banco ocupado.
+
+        Args:
+            operation: Função que grava e retorna o resultado do pedido (por
+                exemplo, o ID da linha inserida).
+
+        Returns:
+            Future: Resultado da operação, disponível após a confirmação do
+            lote, ou a exceção da própria operação.
+
+        Raises:
+            ExecutorClosedError: Se o escritor já foi encerrado.
+        """
+        future: "Future[T]" = Future()
+        with self._lock:
+            if self._closed:
+                raise ExecutorClosedError("A fila de escrita já foi encerrada")
+            self._queue.put((future, operation))
+        return future
+
+    @property
+    def pending(self) -> int:
+        """Quantidade aproximada de pedidos ainda na fila."""
+        return self._queue.qsize()
+
+    def stats(self) -> WriterStats:
+        """Retorna uma cópia dos contadores atuais."""
+        with self._lock:
+            return replace(self._stats)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Encerra o escritor depois de gravar os pedidos já enfileirados.
+
+        Args:
+            wait: Se True, aguarda a gravação dos pedidos pendentes.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        if wait and threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "GroupCommitWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+    def _work(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stopping = self._collect(first)
+            # Pedidos cancelados antes de começar são descartados; os demais
+            # não podem mais ser cancelados
+            batch = [request for request in batch if request[0].set_running_or_notify_cancel()]
+            if batch:
+                self._process(batch)
+
+    def _collect(self, first: _Request) -> Tuple[List[_Request], bool]:
+        """Reúne ao lote os pedidos que chegam dentro da janela."""
+        batch = [first]
+        deadline = time.monotonic() + self.window_s
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+        return batch, False
+
+    def _process(self, batch: List[_Request]) -> None:
+        try:
+            if self._metrics is not None:
+                with self._metrics.timer("group_commit") as timing:
+                    outcomes = self._write(batch)
+                    timing.rows = len(batch)
+            else:
+                outcomes = self._write(batch)
+        except BaseException as e:
+            # A transação inteira falhou (BEGIN ou COMMIT): nada foi gravado
+            logger.error(f"Falha na confirmação em grupo de {len(batch)} pedidos: {str(e)}")
+            with self._lock:
+                self._stats.errors += len(batch)
+            for future, _ in batch:
+                future.set_exception(e)
+            return
+
+        failed = sum(1 for ok, _ in outcomes if not ok)
+        with self._lock:
+            self._stats.batches += 1
+            self._stats.requests += len(batch)
+            self._stats.errors += failed
+            self._stats.largest_batch = max(self._stats.largest_batch, len(batch))
+
+        if self._on_commit is not None and failed < len(batch):
+            try:
+                self._on_commit(len(batch) - failed)
+            except Exception as e:
+                logger.error(f"Erro após a confirmação em grupo: {str(e)}")
+
+        for (future, _), (ok, value) in zip(batch, outcomes):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    @retry_on_busy()
+    def _write(self, batch: List[_Request]) -> List[Tuple[bool, Any]]:
+        """Grava o lote em uma transação, com um SAVEPOINT por pedido."""
+        outcomes: List[Tuple[bool, Any]] = []
+        with self._connect() as conn:
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for _, operation in batch:
+                    conn.execute("SAVEPOINT sitai_request")
+                    try:
+                        outcomes.append((True, operation(conn)))
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO sitai_request")
+                        outcomes.append((False, e))
+                    conn.execute("RELEASE sitai_request")
+                conn.commit()
+            except BaseException:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+        return outcomes
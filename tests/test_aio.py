@@ -0,0 +1,125 @@
+import pytest
+import os
+import sys
+import sqlite3
+import time
+import asyncio
+import threading
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from sitai.aio import AsyncExecutor, ExecutorClosedError
+    from sitai.connection import ConnectionManager
+except ImportError:
+    pytest.skip("Módulo assíncrono não encontrado", allow_module_level=True)
+
+
+# Consulta que só termina quando interrompida
+ENDLESS_SQL = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) SELECT MAX(x) FROM c"
+
+
+def test_runs_operations_in_worker_threads():
+    """Testa a execução das operações fora da thread do loop de eventos."""
+    async def main():
+        async with AsyncExecutor(workers=2) as executor:
+            names = await asyncio.gather(*[
+                executor.run(lambda: threading.current_thread().name) for _ in range(4)
+            ])
+            assert set(names) <= {"sitai-db-0", "sitai-db-1"}
+            assert await executor.run(pow, 2, 10) == 1024
+            with pytest.raises(ZeroDivisionError):
+                await executor.run(lambda: 1 / 0)
+
+    asyncio.run(main())
+
+
+def test_limits_pending_operations():
+    """Testa se as corrotinas excedentes aguardam uma vaga antes de enfileirar."""
+    release = threading.Event()
+
+    async def main():
+        async with AsyncExecutor(workers=1, max_pending=2) as executor:
+            tasks = [asyncio.create_task(executor.run(release.wait)) for _ in range(5)]
+            await asyncio.sleep(0.05)
+            assert executor.pending == 2
+            release.set()
+            assert await asyncio.gather(*tasks) == [True] * 5
+
+    asyncio.run(main())
+
+
+def test_cancel_removes_queued_operation():
+    """Testa o cancelamento de uma operação que ainda não começou."""
+    release = threading.Event()
+    calls = []
+
+    async def main():
+        async with AsyncExecutor(workers=1) as executor:
+            blocker = asyncio.create_task(executor.run(release.wait))
+            queued = asyncio.create_task(executor.run(calls.append, "executada"))
+            await asyncio.sleep(0.05)
+            queued.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+            release.set()
+            await blocker
+
+    asyncio.run(main())
+    assert calls == []
+
+
+@pytest.mark.parametrize("delay", [0, 0.2])
+def test_cancel_interrupts_running_query(temp_db_path, delay):
+    """
+    Testa a interrupção do comando SQL de uma operação cancelada.
+
+    Com `delay`, o cancelamento chega antes de o comando começar, quando a
+    primeira interrupção ainda não tem efeito.
+    """
+    pool = ConnectionManager()
+    picked = threading.Event()
+    errors = []
+
+    def endless():
+        picked.set()
+        time.sleep(delay)
+        try:
+            with pool.connection(temp_db_path) as conn:
+                conn.execute(ENDLESS_SQL).fetchone()
+        except sqlite3.OperationalError as e:
+            errors.append(str(e))
+            raise
+
+    def still_usable():
+        with pool.connection(temp_db_path) as conn:
+            return conn.execute("SELECT 1").fetchone()[0]
+
+    async def main():
+        async with AsyncExecutor(workers=1, interrupt=pool.interrupt) as executor:
+            task = asyncio.create_task(executor.run(endless))
+            await asyncio.get_running_loop().run_in_executor(None, picked.wait)
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            # A conexão da thread de trabalho continua utilizável
+            assert await asyncio.wait_for(executor.run(still_usable), 5) == 1
+
+    try:
+        asyncio.run(main())
+    finally:
+        pool.close_all()
+    assert errors == ["interrupted"]
+
+
+def test_shutdown_rejects_new_operations():
+    """Testa o encerramento do executor."""
+    executor = AsyncExecutor(workers=2)
+    executor.shutdown()
+    assert executor.pending == 0
+    with pytest.raises(ExecutorClosedError):
+        executor.submit(print)
+    with pytest.raises(ValueError):
+        AsyncExecutor(workers=0)
@@ -0,0 +1,75 @@
+import pytest
+import os
+import sys
+import json
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from sitai.benchmark import DEFAULT_SIZES, compare_results, run_benchmarks, save_results, summarize
+    import database as db
+except ImportError:
+    pytest.skip("Módulo de medições não encontrado", allow_module_level=True)
+
+
+def test_summarize():
+    """Testa o resumo dos tempos de uma operação."""
+    result = summarize(10, "get_point_by_id", [0.3, 0.1, 0.2, 0.4], rows=4)
+    assert result.calls == 4
+    assert result.median_s == pytest.approx(0.25)
+    assert result.p95_s == 0.4
+    assert result.ops_per_second == pytest.approx(4)
+
+
+def test_compare_results_flags_regressions():
+    """Testa a comparação das medianas entre duas execuções."""
+    baseline = {"results": [
+        {"size": 10, "operation": "create_point", "median_s": 0.010},
+        {"size": 10, "operation": "delete_point", "median_s": 0.010},
+    ]}
+    current = {"results": [
+        {"size": 10, "operation": "create_point", "median_s": 0.011},
+        {"size": 10, "operation": "delete_point", "median_s": 0.020},
+        {"size": 10, "operation": "update_point", "median_s": 0.020},
+    ]}
+    comparison = compare_results(baseline, current, threshold=0.2)
+    assert [(c["operation"], c["regression"]) for c in comparison] == [
+        ("create_point", False), ("delete_point", True)
+    ]
+
+
+def test_run_benchmarks_small(tmp_path):
+    """Testa uma execução reduzida de todas as operações medidas."""
+    original_path = db.DB_PATH
+    report = run_benchmarks(db, sizes=[200], repeat=5, workdir=str(tmp_path))
+    assert db.DB_PATH == original_path
+    assert list(tmp_path.iterdir()) == []
+
+    operations = {r["operation"]: r for r in report["results"]}
+    assert operations["create_points_bulk"]["rows"] == 200
+    assert operations["get_all_points"]["rows"] == 205
+    assert operations["delete_point"]["calls"] == 5
+    assert "search_points[all]" in operations
+    assert report["metadata"]["sizes"] == [200]
+
+
+@pytest.mark.slow
+def test_benchmark_suite(tmp_path):
+    """
+    Executa as medições completas e grava o relatório em JSON.
+
+    Executar com `pytest -m slow`. Os volumes podem ser definidos em
+    SITAI_BENCHMARK_SIZES (por exemplo "10000,100000") e o arquivo de saída em
+    SITAI_BENCHMARK_OUTPUT.
+    """
+    sizes_env = os.environ.get("SITAI_BENCHMARK_SIZES")
+    sizes = [int(s) for s in sizes_env.split(",")] if sizes_env else list(DEFAULT_SIZES)
+    output = os.environ.get("SITAI_BENCHMARK_OUTPUT", "benchmark-results.json")
+
+    report = run_benchmarks(db, sizes=sizes, workdir=str(tmp_path))
+    save_results(report, output)
+
+    with open(output, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert {r["size"] for r in saved["results"]} == set(sizes)
@@ -0,0 +1,99 @@
+import pytest
+import os
+import sys
+import sqlite3
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from sitai.cache import ResultCache, estimate_size
+except ImportError:
+    pytest.skip("Módulo de cache não encontrado", allow_module_level=True)
+
+
+@pytest.fixture
+def conn(temp_db_path):
+    """Fornece uma conexão de escrita com um banco em modo WAL."""
+    connection = sqlite3.connect(temp_db_path)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value INTEGER)")
+    connection.commit()
+    yield connection
+    connection.close()
+
+
+def test_hits_and_misses(conn, temp_db_path):
+    """Testa os contadores de acertos e faltas."""
+    cache = ResultCache()
+    version = cache.version(temp_db_path)
+
+    assert cache.get("q", version) == (False, None)
+    cache.put("q", [1, 2, 3], version)
+    assert cache.get("q", version) == (True, [1, 2, 3])
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.hit_ratio == 0.5
+    cache.clear()
+
+
+def test_write_from_other_connection_changes_version(conn, temp_db_path):
+    """Testa se escritas confirmadas por outra conexão invalidam o cache."""
+    cache = ResultCache()
+    version = cache.version(temp_db_path)
+    cache.put("q", "antigo", version)
+
+    conn.execute("INSERT INTO items (value) VALUES (1)")
+    conn.commit()
+
+    new_version = cache.version(temp_db_path)
+    assert new_version != version
+    assert cache.get("q", new_version) == (False, None)
+    assert cache.stats().entries == 0
+    cache.clear()
+
+
+def test_invalidate_rejects_stale_results(temp_db_path, conn):
+    """Testa se um resultado lido antes de uma escrita não é guardado depois dela."""
+    cache = ResultCache()
+    version = cache.version(temp_db_path)
+    cache.invalidate()
+
+    cache.put("q", "lido antes da escrita", version)
+    assert cache.get("q", cache.version(temp_db_path)) == (False, None)
+    cache.clear()
+
+
+def test_lru_eviction_and_memory_cap(conn, temp_db_path):
+    """Testa o descarte LRU por quantidade de entradas e por memória."""
+    cache = ResultCache(max_entries=2)
+    version = cache.version(temp_db_path)
+    cache.put("a", 1, version)
+    cache.put("b", 2, version)
+    cache.get("a", version)
+    cache.put("c", 3, version)
+
+    assert cache.get("b", version) == (False, None)
+    assert cache.get("a", version) == (True, 1)
+    assert cache.stats().evictions == 1
+    cache.clear()
+
+    small = ResultCache(max_bytes=estimate_size("x" * 100) * 2)
+    version = small.version(temp_db_path)
+    small.put("big", "x" * 10000, version)
+    assert small.stats().entries == 0
+    for key in ("a", "b", "c"):
+        small.put(key, "x" * 100, version)
+    assert small.stats().entries == 2
+    assert small.stats().size_bytes <= small.max_bytes
+    small.clear()
+
+
+def test_memory_database_is_not_cached():
+    """Testa se bancos em memória, sem versão determinável, não são guardados."""
+    cache = ResultCache()
+    version = cache.version(":memory:")
+    assert version is None
+    cache.put("q", 1, version)
+    assert cache.get("q", version) == (False, None)
@@ -0,0 +1,145 @@
+import pytest
+import io
+import os
+import sys
+import json
+import subprocess
+
+# Adiciona o diretório raiz ao path para importar os módulos
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+try:
+    from sitai.cli import main
+    import database as db
+except ImportError:
+    pytest.skip("Linha de comando não encontrada", allow_module_level=True)
+
+CSV_CONTENT = """Tipo de Ponto;Latitude;Longitude;Altitude;Descrição;Data da Descoberta;Responsável;SRID
+Artefato indígena;-3,1190;-60,0217;92;Cerâmica com desenhos;25/03/2023;Dr. Ana Silva;WGS84
+Utensílio indígena;-100;-60,0;10;Latitude inválida;25/03/2023;Dr. Carlos Souza;WGS84
+Armas de caça;-3,3;-60,2;40;Ponta de flecha;27/03/2023;Dr. Carlos Souza;WGS84
+"""
+
+
+@pytest.fixture
+def cli(temp_db_path, monkeypatch):
+    """Executa a linha de comando sobre um banco temporário e retorna (código, saída)."""
+    # O comando altera db.DB_PATH; o monkeypatch restaura o valor original
+    monkeypatch.setattr(db, "DB_PATH", db.DB_PATH)
+
+    def run(*args):
+        out = io.StringIO()
+        code = main(["--db", temp_db_path, *args], out=out)
+        return code, out.getvalue()
+
+    yield run
+    db.close_connections()
+
+
+def test_import_query_and_export(cli, tmp_path):
+    """Testa a importação, a pesquisa e a exportação pela linha de comando."""
+    source = tmp_path / "caderno.csv"
+    source.write_text(CSV_CONTENT, encoding="utf-8")
+    report = str(tmp_path / "erros.csv")
+
+    code, output = cli("import", str(source), "--errors", report, "--workers", "0")
+    assert code == 2
+    assert "Importadas: 2" in output and "Rejeitadas: 1" in output
+    assert os.path.exists(report)
+
+    code, output = cli("query", "flecha", "--format", "json")
+    assert code == 0
+    assert [json.loads(line)["point_type"] for line in output.splitlines()] == ["Armas de caça"]
+
+    code, output = cli("query", "--near", "-3.119", "-60.0217", "--limit", "1")
+    assert output.splitlines()[1].startswith("1,Artefato indígena")
+
+    code, output = cli("export", "--format", "csv")
+    assert code == 0
+    assert len(output.splitlines()) == 3
+
+
+def test_stats_and_vacuum(cli, tmp_path):
+    """Testa as estatísticas e a compactação do banco."""
+    source = tmp_path / "caderno.csv"
+    source.write_text(CSV_CONTENT, encoding="utf-8")
+    cli("import", str(source), "--workers", "0")
+
+    code, output = cli("stats")
+    assert code == 0
+    assert "Pontos cadastrados: 2" in output
+
+    code, output = cli("vacuum")
+    assert code == 0
+    assert "Tamanho depois" in output
+
+
+def test_generate_synthetic_catalogue(cli):
+    """Testa a geração de um catálogo sintético pela linha de comando."""
+    code, output = cli("generate", "500", "--seed", "3", "--sites", "10")
+    assert code == 0
+    assert "Pontos gerados: 500" in output
+
+    code, output = cli("stats")
+    assert "Pontos cadastrados: 500" in output
+
+
+def test_writes_metrics_file(cli, tmp_path):
+    """Testa a gravação das métricas das operações ao final do comando."""
+    path = tmp_path / "sitai.prom"
+    try:
+        code, _ = cli("--metrics", str(path), "generate", "50", "--sites", "5")
+        assert code == 0
+        code, _ = cli("--metrics", str(path), "stats")
+    finally:
+        db.enable_metrics(False)
+        db.get_metrics().reset()
+    assert code == 0
+    text = path.read_text(encoding="utf-8")
+    assert 'sitai_db_operation_rows_total{operation="load_point_rows"} 50' in text
+    assert 'sitai_db_operation_duration_seconds_count{operation="count_points"} 1' in text
+
+
+def test_slow_query_log_and_report(cli, tmp_path):
+    """Testa o registro de consultas lentas e o relatório dos piores comandos."""
+    path = str(tmp_path / "lentas.log")
+    code, _ = cli("--slow-log", path, "--slow-ms", "0", "generate", "200", "--sites", "5")
+    assert code == 0
+    code, _ = cli("--slow-log", path, "--slow-ms", "0", "query", "flecha")
+    assert code == 0
+
+    code, output = cli("slow-queries", path, "--top", "3", "--sort", "count", "--plan")
+    assert code == 0
+    lines = output.splitlines()
+    assert lines[0].split()[:2] == ["Ocorr.", "Total"]
+    assert "Parâmetros:" in output
+
+    code, _ = cli("slow-queries", str(tmp_path / "inexistente.log"))
+    assert code == 1
+
+
+def test_reports_missing_database(cli, capsys):
+    """Testa a mensagem de erro para um banco inexistente."""
+    code, _ = cli("stats")
+    assert code == 1
+    assert "não encontrado" in capsys.readouterr().err
+
+
+def test_simple_commands_do_not_load_pandas_or_streamlit(tmp_path):
+    """Testa se os comandos simples não carregam o pandas nem o Streamlit."""
+    source = tmp_path / "caderno.csv"
+    source.write_text(CSV_CONTENT, encoding="utf-8")
+    db_path = str(tmp_path / "x.db")
+    script = (
+        "import sys\n"
+        "from sitai.cli import main\n"
+        f"main(['--db', {db_path!r}, 'import', {str(source)!r}, '--workers', '0'])\n"
+        f"main(['--db', {db_path!r}, 'stats'])\n"
+        f"main(['--db', {db_path!r}, 'query', 'flecha'])\n"
+        "print(sorted(m for m in ('pandas', 'streamlit') if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip().splitlines()[-1] == "[]"
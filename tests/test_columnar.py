@@ -0,0 +1,142 @@
+import pytest
+import os
+import sys
+import sqlite3
+from datetime import datetime
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    import numpy as np
+    from sitai.columnar import EncodedStrings, PointStore, change_log_table, create_change_log, prune_change_log
+except ImportError:
+    pytest.skip("Módulo colunar não encontrado", allow_module_level=True)
+
+
+@pytest.fixture
+def conn(temp_db_path):
+    """Fornece uma conexão com uma tabela de pontos e o registro de mudanças."""
+    connection = sqlite3.connect(temp_db_path)
+    connection.execute(
+        "CREATE TABLE points (id INTEGER PRIMARY KEY AUTOINCREMENT, point_type TEXT, latitude REAL, "
+        "longitude REAL, altitude REAL, description TEXT, discovery_date TEXT, responsible TEXT, srid TEXT)"
+    )
+    create_change_log(connection, "points")
+    connection.commit()
+    yield connection
+    connection.close()
+
+
+def _insert(conn, count, point_type="Cerâmica", responsible="Ana"):
+    conn.executemany(
+        "INSERT INTO points (point_type, latitude, longitude, altitude, description, discovery_date, responsible, srid) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, 'WGS84')",
+        [
+            (point_type, -3.0 - i / 100, -60.0, 50.0 + i, f"Ponto {i}", datetime(2023, 1, 1 + i % 28).isoformat(), responsible)
+            for i in range(count)
+        ]
+    )
+    conn.commit()
+
+
+def test_encoded_strings():
+    """Testa a codificação por dicionário e as máscaras de texto."""
+    column = EncodedStrings()
+    column.codes = column.encode(["Cerâmica", "Lítico", None, "Cerâmica"])
+
+    assert column.values == ["Cerâmica", "Lítico"]
+    assert column.codes.tolist() == [0, 1, -1, 0]
+    assert column.decode().tolist() == ["Cerâmica", "Lítico", None, "Cerâmica"]
+    assert column.equals("Cerâmica").tolist() == [True, False, False, True]
+    assert column.equals("Inexistente").sum() == 0
+    assert column.isin(["Lítico", "Inexistente"]).tolist() == [False, True, False, False]
+    assert column.contains("cerâ").tolist() == [True, False, False, True]
+
+
+def test_load_and_filters(conn):
+    """Testa a carga em lotes e os filtros vetorizados."""
+    _insert(conn, 10)
+    _insert(conn, 5, point_type="Lítico", responsible="Bruno")
+
+    store = PointStore.load(conn, "points", batch_size=4)
+    assert len(store) == 15
+    assert store.ids.tolist() == list(range(1, 16))
+    assert store.column("discovery_date").dtype == np.dtype("datetime64[us]")
+
+    mask = store.equals("point_type", "Lítico") & store.between("altitude", 52, None)
+    assert store.column("id", mask).tolist() == [13, 14, 15]
+    assert store.in_bbox(-3.025, -61, -3.0, -59).sum() == 6
+    assert store.between("discovery_date", datetime(2023, 1, 1), datetime(2023, 1, 2)).sum() == 4
+    assert store.value_counts("responsible") == {"Ana": 10, "Bruno": 5}
+
+    frame = store.to_frame(mask, columns=["id", "point_type"])
+    assert frame["point_type"].tolist() == ["Lítico"] * 3
+
+
+def test_incremental_refresh(conn):
+    """Testa a atualização incremental com inserções, alterações e exclusões."""
+    _insert(conn, 5)
+    store = PointStore.load(conn, "points")
+
+    conn.execute("UPDATE points SET point_type = 'Lítico', altitude = 0 WHERE id = 2")
+    conn.execute("DELETE FROM points WHERE id IN (3, 5)")
+    _insert(conn, 2, responsible="Bruno")
+    # Inserido e removido entre duas atualizações: não deve aparecer
+    _insert(conn, 1)
+    conn.execute("DELETE FROM points WHERE id = 8")
+    conn.commit()
+
+    result = store.refresh(conn)
+    assert (result.added, result.updated, result.deleted) == (2, 1, 2)
+    assert store.ids.tolist() == [1, 2, 4, 6, 7]
+    assert store.column("point_type").tolist() == ["Cerâmica", "Lítico", "Cerâmica", "Cerâmica", "Cerâmica"]
+    assert store.column("altitude").tolist()[1] == 0
+
+    # Sem mudanças, nada é relido
+    result = store.refresh(conn)
+    assert (result.added, result.updated, result.deleted) == (0, 0, 0)
+
+    # O estado incremental é igual ao de uma carga completa
+    fresh = PointStore.load(conn, "points")
+    for name in ("id", "latitude", "discovery_date", "point_type", "description"):
+        assert store.column(name).tolist() == fresh.column(name).tolist()
+
+
+def test_change_log_keeps_one_row_per_point(conn):
+    """Testa se o registro de mudanças guarda apenas a última mudança de cada ponto."""
+    _insert(conn, 2)
+    for altitude in range(5):
+        conn.execute("UPDATE points SET altitude = ? WHERE id = 1", (altitude,))
+    conn.commit()
+
+    rows = conn.execute(f"SELECT point_id, seq FROM {change_log_table('points')}").fetchall()
+    assert rows == [(1, 5)]
+
+
+def test_prune_change_log(conn):
+    """Testa o descarte do registro de mudanças e a recarga de um armazenamento atrasado."""
+    _insert(conn, 4)
+    behind = PointStore.load(conn, "points")
+    conn.execute("DELETE FROM points WHERE id = 1")
+    conn.execute("UPDATE points SET altitude = 0 WHERE id = 2")
+    conn.commit()
+    synced = PointStore.load(conn, "points")
+
+    assert prune_change_log(conn, "points") == 2
+    conn.commit()
+    assert prune_change_log(conn, "points") == 0
+    log = change_log_table("points")
+    assert conn.execute(f"SELECT point_id, seq FROM {log}").fetchall() == [(0, 2)]
+
+    # A sequência continua crescendo depois do descarte
+    conn.execute("DELETE FROM points WHERE id = 3")
+    conn.commit()
+    assert conn.execute(f"SELECT MAX(seq) FROM {log}").fetchone()[0] == 3
+
+    result = synced.refresh(conn)
+    assert (result.deleted, result.reloaded) == (1, False)
+    result = behind.refresh(conn)
+    assert (result.added, result.reloaded) == (2, True)
+    assert behind.ids.tolist() == synced.ids.tolist() == [2, 4]
+    assert behind.column("altitude").tolist() == synced.column("altitude").tolist()
@@ -0,0 +1,134 @@
+import pytest
+import os
+import sys
+import sqlite3
+import threading
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from sitai.connection import ConnectionManager
+except ImportError:
+    pytest.skip("Módulo de conexões não encontrado", allow_module_level=True)
+
+
+@pytest.fixture
+def manager():
+    """Fornece um gerenciador de conexões que é fechado ao final do teste."""
+    pool = ConnectionManager()
+    yield pool
+    pool.close_all()
+
+
+def test_reuses_connection_in_same_thread(manager, temp_db_path):
+    """Testa se a mesma thread recebe sempre a mesma conexão."""
+    with manager.connection(temp_db_path) as first:
+        pass
+    with manager.connection(temp_db_path) as second:
+        pass
+
+    assert first is second
+    stats = manager.stats()
+    assert stats.created == 1
+    assert stats.reused == 1
+
+
+def test_threads_get_distinct_connections(manager, temp_db_path):
+    """Testa se threads diferentes recebem conexões diferentes."""
+    seen = []
+
+    def worker():
+        with manager.connection(temp_db_path) as conn:
+            seen.append(conn)
+
+    with manager.connection(temp_db_path) as main_conn:
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+    assert len(seen) == 1
+    assert seen[0] is not main_conn
+
+
+def test_recycles_connection_of_finished_thread(manager, temp_db_path):
+    """Testa se a conexão de uma thread encerrada é reaproveitada."""
+    def worker():
+        with manager.connection(temp_db_path) as conn:
+            conn.execute("SELECT 1")
+
+    for _ in range(3):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+    stats = manager.stats()
+    assert stats.created == 1
+    assert stats.recycled == 2
+
+
+def test_commits_and_rolls_back(manager, temp_db_path):
+    """Testa a confirmação e o desfazimento automáticos da transação."""
+    with manager.connection(temp_db_path) as conn:
+        conn.execute("CREATE TABLE t (v INTEGER)")
+        conn.execute("INSERT INTO t VALUES (1)")
+
+    with pytest.raises(RuntimeError):
+        with manager.connection(temp_db_path) as conn:
+            conn.execute("INSERT INTO t VALUES (2)")
+            raise RuntimeError("falha simulada")
+
+    check = sqlite3.connect(temp_db_path)
+    assert check.execute("SELECT v FROM t").fetchall() == [(1,)]
+    check.close()
+
+
+def test_reconnects_when_file_is_replaced(manager, temp_db_path):
+    """Testa se a verificação de saúde de uma conexão ociosa detecta a remoção do arquivo."""
+    def create_table():
+        with manager.connection(temp_db_path) as conn:
+            conn.execute("CREATE TABLE t (v INTEGER)")
+
+    thread = threading.Thread(target=create_table)
+    thread.start()
+    thread.join()
+
+    os.remove(temp_db_path)
+
+    # A conexão da thread encerrada é verificada ao sair da fila ociosa
+    with manager.connection(temp_db_path) as conn:
+        tables = conn.execute("SELECT name FROM sqlite_master").fetchall()
+
+    assert tables == []
+    assert manager.stats().health_check_failures == 1
+
+
+def test_checks_health_only_after_error(manager, temp_db_path, caplog):
+    """Testa se a conexão da thread só é verificada depois de um erro do SQLite."""
+    with manager.connection(temp_db_path) as conn:
+        conn.execute("CREATE TABLE t (v INTEGER)")
+    with pytest.raises(sqlite3.OperationalError):
+        with manager.connection(temp_db_path) as conn:
+            conn.execute("SELECT * FROM inexistente")
+
+    # Transação deixada aberta fora do gerenciador: desfeita na verificação, com aviso
+    conn.execute("INSERT INTO t VALUES (1)")
+    with manager.connection(temp_db_path) as again:
+        assert again is conn
+        assert again.execute("SELECT COUNT(*) FROM t").fetchone() == (0,)
+    assert "Transação deixada aberta" in caplog.text
+    assert manager.stats().health_check_failures == 0
+
+
+def test_close_all_waits_for_connections_in_use(manager, temp_db_path):
+    """Testa se close_all de outra thread só fecha a conexão em uso ao final do bloco."""
+    with manager.connection(temp_db_path) as conn:
+        thread = threading.Thread(target=manager.close_all)
+        thread.start()
+        thread.join()
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    with manager.connection(temp_db_path) as new_conn:
+        assert new_conn is not conn
@@ -3,12 +3,16 @@ import os
 import sys
 from datetime import datetime
 import sqlite3
+import json
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 
 # Adiciona o diretório raiz ao path para importar os módulos
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 try:
-    from models import ExcavationPoint
+    # Mesma ordem de importação usada por app.py
+    from sitai.models import ExcavationPoint
     import database as db
 except ImportError:
     try:
@@ -28,9 +32,10 @@ def setup_test_db():
     os.makedirs(test_db_dir, exist_ok=True)
     test_db_path = os.path.join(test_db_dir, 'test_database.db')
     
-    # Se o arquivo de teste já existir, remova-o
-    if os.path.exists(test_db_path):
-        os.remove(test_db_path)
+    # Se o arquivo de teste (ou o WAL de uma execução anterior) já existir, remova-o
+    for path in (test_db_path, test_db_path + "-wal", test_db_path + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
     
     # Substitui o caminho do banco de dados
     db.DB_PATH = test_db_path
@@ -40,12 +45,16 @@ def setup_test_db():
     
     yield
     
+    # Fecha as conexões reutilizáveis antes de remover o arquivo
+    db.close_connections()
+    
     # Restaura o caminho original
     db.DB_PATH = original_db_path
     
-    # Limpa o arquivo de teste
-    if os.path.exists(test_db_path):
-        os.remove(test_db_path)
+    # Limpa o arquivo de teste e os arquivos do WAL
+    for path in (test_db_path, test_db_path + "-wal", test_db_path + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
 
 @pytest.mark.parametrize("test_point", [
     {
@@ -157,6 +166,77 @@ def test_delete_point(setup_test_db):
     # Verifica se não existe mais
     assert db.get_point_by_id(point_id) is None
 
+@pytest.mark.parametrize("returning", [True, False])
+def test_optimistic_concurrency(setup_test_db, monkeypatch, returning):
+    """
+    Testa o controle de versão das linhas em alterações e exclusões concorrentes.
+
+    Sem `returning`, simula o SQLite anterior ao 3.35, sem UPDATE ... RETURNING.
+    """
+    monkeypatch.setattr(db, "HAS_RETURNING", returning)
+    point_id = db.create_points_bulk(_bulk_points(1))[0]
+    first = db.get_point_by_id(point_id)
+    second = db.get_point_by_id(point_id)
+    assert first.version == 1
+
+    first.description = "Alterada pela primeira pessoa"
+    assert db.update_point(first) is True
+    assert first.version == 2
+
+    # A segunda pessoa ainda tem a versão 1: a alteração é recusada
+    second.description = "Alterada pela segunda pessoa"
+    with pytest.raises(db.VersionConflictError) as info:
+        db.update_point(second)
+    assert (info.value.expected_version, info.value.current_version) == (1, 2)
+    assert db.get_point_by_id(point_id).description == "Alterada pela primeira pessoa"
+    with pytest.raises(db.VersionConflictError):
+        db.delete_point(point_id, expected_version=1)
+
+    # Sem versão, a alteração é incondicional
+    second.version = None
+    assert db.update_point(second) is True
+    assert db.get_point_by_id(point_id).version == 3
+
+    assert db.delete_point(point_id, expected_version=3) is True
+    assert db.delete_point(point_id) is False
+    first.id = 999
+    assert db.update_point(first) is False
+
+
+def test_write_queue_group_commit(setup_test_db):
+    """Testa a criação de pontos por várias threads com a fila de escrita ativa."""
+    db.enable_write_queue(window_ms=20)
+    try:
+        before = db.get_all_points()
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            ids = list(pool.map(db.create_point, _bulk_points(30)))
+        pending = db.submit_point(next(_bulk_points(1)))
+        assert pending.result(timeout=5) == max(ids) + 1
+        # O erro de um pedido chega somente a quem o enviou
+        with pytest.raises(sqlite3.IntegrityError):
+            db.create_point(next(_bulk_points(1, invalid_at=0)))
+        stats = db.get_write_queue_stats()
+        assert stats.requests == 32 and stats.batches < 32 and stats.errors == 1
+
+        # Dentro de uma transação da própria thread, a gravação não passa pela
+        # fila (que esperaria pelo bloqueio de escrita retido pela chamadora)
+        with db.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            inside = db.create_point(next(_bulk_points(1)))
+            conn.rollback()
+        assert db.get_point_by_id(inside) is None
+        assert db.get_write_queue_stats().requests == 32
+    finally:
+        db.disable_write_queue()
+
+    assert db.get_write_queue_stats() is None
+    assert sorted(ids) == list(range(1, 31))
+    assert len(before) == 0 and len(db.get_all_points()) == 31
+    assert db.get_point_by_id(ids[0]).point_type == "Fragmento cerâmico"
+    # Sem a fila, submit_point grava na hora
+    assert db.submit_point(next(_bulk_points(1))).result() == 32
+
+
 def test_search_points(setup_test_db):
     """Testa a pesquisa de pontos no banco de dados."""
     # Cria alguns pontos
@@ -205,3 +285,557 @@ def test_search_points(setup_test_db):
     # Testa pesquisa sem resultados
     results = db.search_points("termo inexistente")
     assert len(results) == 0
+
+def test_init_db_enables_wal(setup_test_db):
+    """Testa se o banco é inicializado em modo WAL."""
+    with db.get_connection() as conn:
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode.upper() == "WAL"
+
+def _bulk_points(count, invalid_at=None):
+    """Gera pontos para os testes de inserção em lote."""
+    for i in range(count):
+        if i == invalid_at:
+            # point_type nulo viola a restrição NOT NULL da tabela
+            yield ExcavationPoint.model_construct(
+                point_type=None, latitude=0.0, longitude=0.0, altitude=0.0,
+                description="Inválido", discovery_date=datetime.now(),
+                responsible="Teste", srid="WGS84"
+            )
+        else:
+            yield ExcavationPoint(
+                point_type="Fragmento cerâmico",
+                latitude=-3.0 - i / 1000,
+                longitude=-60.0,
+                altitude=50.0,
+                description=f"Fragmento {i}",
+                responsible="Pesquisador Lote",
+                discovery_date=datetime.now()
+            )
+
+def test_create_points_bulk(setup_test_db):
+    """Testa a inserção em lote e os IDs retornados."""
+    ids = db.create_points_bulk(_bulk_points(25), chunk_size=10)
+
+    assert len(ids) == 25
+    assert len(set(ids)) == 25
+    assert db.get_point_by_id(ids[0]).description == "Fragmento 0"
+    assert db.get_point_by_id(ids[-1]).description == "Fragmento 24"
+    assert len(db.get_all_points()) == 25
+
+def test_create_points_bulk_validates_dicts(setup_test_db):
+    """Testa a inserção em lote de dicionários, validados em lote."""
+    rows = [p.model_dump(exclude={"id"}) for p in _bulk_points(3)]
+    ids = db.create_points_bulk(rows, chunk_size=2)
+    assert db.get_point_by_id(ids[2]).description == "Fragmento 2"
+
+    rows[1]["latitude"] = 200.0
+    with pytest.raises(db.BulkInsertError):
+        db.create_points_bulk(rows)
+    assert db.count_points(estimate=False) == 3
+
+
+def test_create_points_bulk_atomic_rollback(setup_test_db):
+    """Testa se uma falha desfaz toda a inserção no modo tudo ou nada."""
+    with pytest.raises(db.BulkInsertError) as excinfo:
+        db.create_points_bulk(_bulk_points(25, invalid_at=15), chunk_size=10)
+
+    assert excinfo.value.inserted_ids == []
+    assert len(db.get_all_points()) == 0
+
+def test_create_points_bulk_per_chunk_commit(setup_test_db):
+    """Testa se os blocos anteriores à falha permanecem gravados."""
+    with pytest.raises(db.BulkInsertError) as excinfo:
+        db.create_points_bulk(_bulk_points(25, invalid_at=15), chunk_size=10, atomic=False)
+
+    assert len(excinfo.value.inserted_ids) == 10
+    assert len(db.get_all_points()) == 10
+
+def test_import_points_file(setup_test_db, tmp_path):
+    """Testa a importação de uma planilha CSV para o banco de dados."""
+    path = tmp_path / "caderno.csv"
+    path.write_text(
+        "point_type,latitude,longitude,altitude,description,responsible\n"
+        "Artefato indígena,-3.1,-60.0,92.0,Cerâmica,Dr. Ana Silva\n"
+        "Artefato indígena,95.0,-60.0,92.0,Latitude inválida,Dr. Ana Silva\n",
+        encoding="utf-8"
+    )
+
+    result = db.import_points_file(str(path), workers=0)
+
+    assert result.imported == 1
+    assert result.rejected == 1
+    assert len(db.get_all_points()) == 1
+
+def test_export_points(setup_test_db, tmp_path):
+    """Testa a exportação em fluxo para CSV e GeoJSON."""
+    db.create_points_bulk(_bulk_points(5))
+
+    csv_path = str(tmp_path / "pontos.csv")
+    db.export_points(csv_path, fmt="csv", batch_size=2)
+    with open(csv_path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines[0] == ",".join(db.POINT_COLUMNS)
+    assert len(lines) == 6
+
+    geojson_path = str(tmp_path / "pontos.geojson")
+    db.export_points(geojson_path, fmt="geojson", batch_size=2)
+    with open(geojson_path, encoding="utf-8") as f:
+        document = json.load(f)
+    assert len(document["features"]) == 5
+
+def test_get_points_page_keyset_navigation(setup_test_db):
+    """Testa a paginação por chave nos dois sentidos, sem repetir linhas."""
+    db.create_points_bulk(_bulk_points(12))
+
+    pages = [db.get_points_page(limit=5)]
+    while pages[-1].has_next:
+        pages.append(db.get_points_page(after_key=pages[-1].last_key, limit=5))
+
+    ids = [i for page in pages for i in page.data["id"]]
+    assert [len(page.data) for page in pages] == [5, 5, 2]
+    assert ids == sorted(ids) and len(set(ids)) == 12
+    assert pages[0].has_previous is False
+    assert pages[-1].total == 12
+
+    previous = db.get_points_page(before_key=pages[-1].first_key, limit=5)
+    assert list(previous.data["id"]) == list(pages[1].data["id"])
+
+def test_count_points_uses_analyze_estimate(setup_test_db):
+    """Testa se, após o ANALYZE, a contagem usa a estatística sem executar COUNT(*)."""
+    db.create_points_bulk(_bulk_points(12))
+    with db.get_connection() as conn:
+        conn.execute("ANALYZE")
+        # A tabela tem índices, então o ANALYZE só grava as linhas dos índices
+        assert conn.execute(
+            "SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = ? AND idx IS NULL", (db.TABLE_NAME,)
+        ).fetchone()[0] == 0
+    db.create_points_bulk(_bulk_points(3))
+
+    statements = []
+    with db.get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            assert db.count_points() == 12
+            assert db.get_points_page(limit=5).total == 12
+        finally:
+            conn.set_trace_callback(None)
+    assert statements and not any("COUNT(" in sql.upper() for sql in statements)
+    assert db.count_points(estimate=False) == 15
+
+def test_get_points_page_orders_by_column(setup_test_db):
+    """Testa a ordenação por coluna com desempate pelo ID."""
+    db.create_points_bulk(_bulk_points(6))
+    db.create_point(ExcavationPoint(
+        point_type="Adorno corporal", latitude=0.0, longitude=0.0, altitude=0.0,
+        description="Colar", responsible="Pesquisador", discovery_date=datetime.now()
+    ))
+
+    first = db.get_points_page(limit=4, order_by="point_type")
+    second = db.get_points_page(after_key=first.last_key, limit=4, order_by="point_type")
+
+    assert first.data["point_type"].iloc[0] == "Adorno corporal"
+    assert len(first.data) + len(second.data) == 7
+    assert second.has_next is False
+
+    with pytest.raises(ValueError):
+        db.get_points_page(order_by="description; DROP TABLE excavation_points")
+
+def test_search_points_sorted_by_database(setup_test_db):
+    """Testa a ordenação dos resultados pelo banco, inclusive por data."""
+    dates = [datetime(2023, 12, 1), datetime(2022, 1, 15), datetime(2023, 2, 28)]
+    for i, date in enumerate(dates):
+        db.create_point(ExcavationPoint(
+            point_type="Fragmento", latitude=0.0, longitude=0.0, altitude=0.0,
+            description=f"Ponto {i}", responsible="Pesquisador", discovery_date=date
+        ))
+
+    results = db.search_points("Fragmento", sort="-discovery_date")
+    assert [r["description"] for r in results] == ["Ponto 0", "Ponto 2", "Ponto 1"]
+
+    results = db.search_points("", sort=[("point_type", "ASC"), ("discovery_date", "ASC")])
+    assert [r["description"] for r in results] == ["Ponto 1", "Ponto 2", "Ponto 0"]
+
+def test_normalize_sort_validates_spec():
+    """Testa a validação das especificações de ordenação."""
+    assert db.normalize_sort("point_type, -discovery_date") == [
+        ("point_type", False), ("discovery_date", True), ("id", True)
+    ]
+    assert db.normalize_sort(None) == [("id", False)]
+
+    with pytest.raises(ValueError):
+        db.normalize_sort("description")
+    with pytest.raises(ValueError):
+        db.normalize_sort("id SIDEWAYS")
+
+def test_get_points_page_mixed_directions(setup_test_db):
+    """Testa a paginação por chave com sentidos de ordenação mistos."""
+    db.create_points_bulk(_bulk_points(9))
+    sort = [("responsible", "ASC"), ("discovery_date", "DESC")]
+
+    expected = [r["id"] for r in db.search_points("", sort=sort)]
+    first = db.get_points_page(limit=4, order_by=sort)
+    second = db.get_points_page(after_key=first.last_key, limit=4, order_by=sort)
+    third = db.get_points_page(after_key=second.last_key, limit=4, order_by=sort)
+
+    ids = [i for page in (first, second, third) for i in page.data["id"]]
+    assert ids == expected
+    assert third.has_next is False
+
+def test_init_db_applies_migrations(setup_test_db):
+    """Testa se init_db aplica as migrações e cria os índices."""
+    assert db.get_db_schema_version() == db.MIGRATIONS[-1].version
+
+    with db.get_connection() as conn:
+        indexes = {row[1] for row in conn.execute(f"PRAGMA index_list({db.TABLE_NAME})")}
+    assert f"idx_{db.TABLE_NAME}_discovery_date" in indexes
+    assert f"idx_{db.TABLE_NAME}_coordinates" in indexes
+
+def _search_points():
+    """Cria pontos com textos variados para os testes de pesquisa textual."""
+    samples = [
+        ("Cerâmica decorada", "Fragmento de cerâmica com pintura", "Ana Souza"),
+        ("Lítico", "Ponta de flecha com cerâmica associada", "Bruno Lima"),
+        ("Adorno corporal", "Colar de sementes", "Ana Souza"),
+    ]
+    for point_type, description, responsible in samples:
+        db.create_point(ExcavationPoint(
+            point_type=point_type, latitude=-3.0, longitude=-60.0, altitude=50.0,
+            description=description, responsible=responsible,
+            discovery_date=datetime.now()
+        ))
+
+def test_search_points_full_text(setup_test_db):
+    """Testa a pesquisa pelo índice FTS5: prefixos, acentos e campos."""
+    with db.get_connection() as conn:
+        if not db.search_index_exists(conn, db.TABLE_NAME):
+            pytest.skip("SQLite sem suporte a FTS5")
+    _search_points()
+
+    # Prefixo e comparação sem acentos
+    assert {p["point_type"] for p in db.search_points("ceram")} == {"Cerâmica decorada", "Lítico"}
+    assert len(db.search_points("litico")) == 1
+
+    # Todos os termos devem estar presentes
+    assert [p["responsible"] for p in db.search_points("ponta flecha")] == ["Bruno Lima"]
+
+    # Restrição a um campo indexado
+    assert len(db.search_points("ana", field="responsible")) == 2
+    assert db.search_points("ana", field="description") == []
+
+    # Campos não textuais continuam usando LIKE
+    assert len(db.search_points("-60", field="longitude")) == 3
+
+def test_search_points_relevance_and_snippet(setup_test_db):
+    """Testa a ordenação por relevância e os trechos destacados."""
+    with db.get_connection() as conn:
+        if not db.search_index_exists(conn, db.TABLE_NAME):
+            pytest.skip("SQLite sem suporte a FTS5")
+    _search_points()
+
+    results = db.search_points("cerâmica", highlight=True)
+    # O ponto que cita o termo no tipo e na descrição é o mais relevante
+    assert results[0]["point_type"] == "Cerâmica decorada"
+    assert "**cerâmica**" in results[1]["snippet"].lower()
+    marked = db.search_points("cerâmica", highlight=True, markers=("«", "»"))
+    assert "«cerâmica»" in marked[1]["snippet"].lower()
+
+    # O índice só encontra palavras pelo início; trechos exigem substring=True
+    assert db.search_points("mica") == []
+    assert [p["id"] for p in db.search_points("mica", substring=True)] == [
+        p["id"] for p in db.search_points("cerâmica", sort="id")
+    ]
+
+    # Com ordenação explícita, a relevância é ignorada
+    ordered = db.search_points("cerâmica", sort=[("id", "DESC")])
+    assert [p["id"] for p in ordered] == sorted((p["id"] for p in results), reverse=True)
+
+def test_get_points_in_bbox(setup_test_db):
+    """Testa a consulta de pontos por retângulo geográfico."""
+    coordinates = [(-3.10, -60.02), (-3.15, -60.10), (-2.50, -60.05), (-3.12, -59.00)]
+    for i, (lat, lon) in enumerate(coordinates):
+        db.create_point(ExcavationPoint(
+            point_type="Fragmento", latitude=lat, longitude=lon, altitude=0.0,
+            description=f"Ponto {i}", responsible="Pesquisador", discovery_date=datetime.now()
+        ))
+
+    results = db.get_points_in_bbox(-3.2, -60.2, -3.0, -60.0)
+    assert [r["description"] for r in results] == ["Ponto 0", "Ponto 1"]
+
+    # O mesmo filtro combinado com a pesquisa textual
+    results = db.search_points("ponto", bbox=(-3.2, -60.2, -2.0, -59.5), sort="-id")
+    assert [r["description"] for r in results] == ["Ponto 2", "Ponto 1", "Ponto 0"]
+    assert len(db.search_points("", bbox=(-3.2, -61, -3.0, -58))) == 3
+
+    with pytest.raises(ValueError):
+        db.get_points_in_bbox(-3.0, -60.2, -3.2, -60.0)
+
+def test_find_within_radius_and_nearest(setup_test_db):
+    """Testa as buscas por raio e por vizinhos mais próximos contra a força bruta."""
+    import random
+    from sitai.spatial import haversine_distances
+
+    rng = random.Random(42)
+    points = []
+    for i in range(300):
+        points.append(ExcavationPoint(
+            point_type="Fragmento", latitude=-3.1 + rng.uniform(-0.05, 0.05),
+            longitude=-60.0 + rng.uniform(-0.05, 0.05), altitude=0.0,
+            description=f"Ponto {i}", responsible="Pesquisador", discovery_date=datetime.now()
+        ))
+    db.create_points_bulk(points)
+
+    center = (-3.1, -60.0)
+    expected = haversine_distances(
+        center[0], center[1], [p.latitude for p in points], [p.longitude for p in points]
+    )
+    by_distance = sorted(range(len(points)), key=lambda i: expected[i])
+
+    results = db.find_within_radius(center[0], center[1], 2000)
+    assert [r["description"] for r in results] == [
+        f"Ponto {i}" for i in by_distance if expected[i] <= 2000
+    ]
+    assert all(r["distance_m"] <= 2000 for r in results)
+
+    nearest = db.find_nearest(center[0], center[1], k=5)
+    assert [r["description"] for r in nearest] == [f"Ponto {i}" for i in by_distance[:5]]
+
+    # Com distância máxima, podem vir menos de k pontos
+    assert len(db.find_nearest(center[0], center[1], k=5, max_distance=1.0)) == 0
+    # Mais pontos pedidos do que existem
+    assert len(db.find_nearest(0.0, 0.0, k=1000)) == 300
+
+    with pytest.raises(ValueError):
+        db.find_nearest(center[0], center[1], k=0)
+
+def test_result_cache_invalidated_by_writes(setup_test_db):
+    """Testa o cache de resultados e sua invalidação pelas escritas."""
+    point = ExcavationPoint(
+        point_type="Fragmento", latitude=-3.0, longitude=-60.0, altitude=0.0,
+        description="Original", responsible="Pesquisador", discovery_date=datetime.now()
+    )
+    point_id = db.create_point(point)
+
+    before = db.get_cache_stats()
+    assert len(db.get_all_points()) == 1
+    assert len(db.get_all_points()) == 1
+    assert db.get_point_by_id(point_id).description == "Original"
+    cached = db.get_point_by_id(point_id)
+    after = db.get_cache_stats()
+    assert after.hits - before.hits == 2
+
+    # Alterar o objeto devolvido não altera o cache
+    cached.description = "Alterado localmente"
+    assert db.get_point_by_id(point_id).description == "Original"
+
+    # Cada escrita invalida os resultados guardados
+    cached.description = "Atualizado"
+    db.update_point(cached)
+    assert db.get_point_by_id(point_id).description == "Atualizado"
+    assert db.search_points("Atualizado")[0]["id"] == point_id
+
+    db.create_point(point)
+    assert len(db.get_all_points()) == 2
+    db.delete_point(point_id)
+    assert db.get_point_by_id(point_id) is None
+    assert len(db.get_all_points()) == 1
+
+def test_result_cache_sees_external_writes(setup_test_db):
+    """Testa se escritas feitas fora do módulo (outra conexão) invalidam o cache."""
+    assert len(db.get_all_points()) == 0
+
+    external = sqlite3.connect(db.DB_PATH)
+    external.execute(db.INSERT_SQL, ("Fragmento", -3.0, -60.0, 0.0, "Externo", datetime.now().isoformat(), "Outro", "WGS84"))
+    external.commit()
+    external.close()
+
+    assert len(db.get_all_points()) == 1
+
+def test_get_all_points_typed_frame(setup_test_db):
+    """Testa os tipos compactos e a projeção de colunas do DataFrame."""
+    for i in range(3):
+        db.create_point(ExcavationPoint(
+            point_type="Fragmento", latitude=-3.25, longitude=-60.0217 - i / 10, altitude=92.5,
+            description=f"Ponto {i}", responsible="Pesquisador", discovery_date=datetime(2023, 5, i + 1, 14, 30)
+        ))
+
+    df = db.get_all_points()
+    assert isinstance(df["point_type"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["srid"].dtype, pd.CategoricalDtype)
+    assert str(df["discovery_date"].dtype).startswith("datetime64")
+    assert df["discovery_date"].iloc[0] == datetime(2023, 5, 1, 14, 30)
+    # -3.25 é exato em float32; -60.0217 perderia precisão e continua float64
+    assert df["latitude"].dtype == "float32"
+    assert df["longitude"].dtype == "float64"
+
+    projected = db.get_all_points(columns=["id", "discovery_date"])
+    assert list(projected.columns) == ["id", "discovery_date"]
+
+    with pytest.raises(ValueError):
+        db.get_all_points(columns=["id", "inexistente"])
+
+def test_get_points_page_projection_keeps_sort_keys(setup_test_db):
+    """Testa se a página projetada ainda navega pela coluna de ordenação."""
+    db.create_points_bulk(_bulk_points(5))
+
+    page = db.get_points_page(limit=2, order_by="responsible", columns=["point_type"])
+    assert list(page.data.columns) == ["point_type"]
+    assert page.last_key[0] == "Pesquisador Lote"
+
+    next_page = db.get_points_page(after_key=page.last_key, limit=2, order_by="responsible", columns=["point_type"])
+    assert len(next_page.data) == 2
+
+def test_point_store_refresh(setup_test_db):
+    """Testa o armazenamento colunar carregado e atualizado pelo banco."""
+    ids = db.create_points_bulk(_bulk_points(5))
+    store = db.load_point_store()
+    assert len(store) == 5
+
+    db.delete_point(ids[0])
+    point = db.get_point_by_id(ids[1])
+    point.point_type = "Lítico"
+    db.update_point(point)
+    db.create_points_bulk(_bulk_points(2))
+
+    result = db.refresh_point_store(store)
+    assert (result.added, result.updated, result.deleted) == (2, 1, 1)
+    assert len(store) == 6
+    assert store.equals("point_type", "Lítico").sum() == 1
+
+    # A compactação descarta o registro de mudanças já lido
+    db.vacuum_db()
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM excavation_points_changes WHERE point_id > 0").fetchone() == (0,)
+    db.delete_point(ids[2])
+    result = db.refresh_point_store(store)
+    assert (result.deleted, result.reloaded) == (1, False)
+
+
+def test_async_database(setup_test_db):
+    """Testa a fachada assíncrona das operações do banco."""
+    import asyncio
+
+    async def main():
+        async with db.AsyncDatabase(workers=2, max_pending=4) as adb:
+            ids = await adb.create_points_bulk(_bulk_points(3))
+            point_id = await adb.create_point(ExcavationPoint(
+                point_type="Lítico", latitude=-3.1, longitude=-60.0, altitude=90.0,
+                description="Lasca", responsible="Ana"
+            ))
+            found = await asyncio.gather(*[adb.get_point_by_id(i) for i in ids + [point_id]])
+            assert [p.id for p in found] == ids + [point_id]
+            assert await adb.count_points(estimate=False) == 4
+
+            results = await adb.search_points("Lítico", field="point_type")
+            assert [r["id"] for r in results] == [point_id]
+            assert await adb.delete_point(point_id) is True
+
+    asyncio.run(main())
+
+
+def test_load_point_rows_keeps_indexes(setup_test_db):
+    """Testa a carga rápida, que preenche os índices sem os gatilhos de inserção."""
+    from sitai.synthetic import CatalogueGenerator
+
+    db.create_points_bulk(_bulk_points(2))
+    rows = list(CatalogueGenerator(seed=5, site_count=20).iter_rows(300))
+    assert db.load_point_rows(rows, chunk_size=64) == 300
+    assert db.count_points(estimate=False) == 302
+
+    # Os índices de texto e espacial cobrem as linhas carregadas
+    expected = sum(1 for r in rows if "flecha" in r[4].lower() or "flecha" in r[0].lower())
+    assert len(db.search_points("flecha")) == expected
+    lat, lon = rows[0][1], rows[0][2]
+    assert rows[0][4] in [p["description"] for p in db.find_within_radius(lat, lon, 1)]
+
+    # Os gatilhos foram recriados: novos pontos continuam indexados
+    db.create_point(ExcavationPoint(
+        point_type="Lítico", latitude=-3.1, longitude=-60.0, altitude=90.0,
+        description="Lasca de flecha", responsible="Ana"
+    ))
+    assert len(db.search_points("flecha")) == expected + 1
+
+
+def test_metrics_instrument_database_operations(setup_test_db, tmp_path):
+    """Testa as métricas das operações do banco e a exportação no formato Prometheus."""
+    registry = db.get_metrics()
+    registry.reset()
+    db.enable_metrics()
+    try:
+        ids = db.create_points_bulk(_bulk_points(3))
+        db.get_point_by_id(ids[0])
+        db.get_point_by_id(-1)
+        db.search_points("Fragmento")
+        with pytest.raises(ValueError):
+            db.get_all_points(columns=["inexistente"])
+
+        metrics = registry.snapshot()
+        assert metrics["create_points_bulk"].rows == 3
+        assert (metrics["get_point_by_id"].calls, metrics["get_point_by_id"].rows) == (2, 1)
+        assert metrics["search_points"].rows == 3
+        assert metrics["get_all_points"].errors == 1
+
+        path = tmp_path / "sitai.prom"
+        text = db.export_metrics(str(path))
+        assert path.read_text(encoding="utf-8") == text
+        assert 'sitai_db_operation_duration_seconds_count{operation="get_point_by_id"} 2' in text
+    finally:
+        db.enable_metrics(False)
+        registry.reset()
+
+    db.count_points()
+    assert registry.snapshot() == {}
+
+
+def test_slow_query_log(setup_test_db, tmp_path):
+    """Testa o registro de consultas lentas nas conexões do módulo."""
+    path = str(tmp_path / "lentas.log")
+    tracer = db.enable_slow_query_log(path, threshold_ms=0)
+    try:
+        db.create_points_bulk(_bulk_points(3))
+        assert len(db.search_points("Fragmento")) == 3
+    finally:
+        db.disable_slow_query_log()
+
+    with open(path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert tracer.recorded == len(entries)
+    fts = [e for e in entries if "MATCH" in e["sql"]]
+    assert fts and fts[0]["rows"] == 3 and fts[0]["params"] == ["str[12]"]
+    assert any("excavation_points_fts" in line for line in fts[0]["plan"])
+
+    # Desativado, as conexões voltam a ser comuns
+    db.count_points()
+    with db.get_connection() as conn:
+        assert type(conn) is sqlite3.Connection
+
+
+def test_bulk_operations_by_ids_and_filter(setup_test_db):
+    """Testa a leitura, a alteração e a exclusão de vários pontos de uma vez."""
+    from pydantic import ValidationError
+
+    ids = db.create_points_bulk(_bulk_points(6))
+    points = db.get_points_by_ids([ids[3], 999, ids[1], ids[3]])
+    assert [p.id for p in points] == [ids[3], ids[1]]
+    assert points[0].description == "Fragmento 3" and points[0].version == 1
+
+    changed = db.update_points_where({"id": ids[:4]}, {"responsible": "Dra. Ana Silva", "srid": "SIRGAS2000"})
+    assert changed == 4
+    changed = db.update_points_where({"responsible": "Dra. Ana Silva", "description": ["Fragmento 0", "Fragmento 5"]},
+                                     {"latitude": "-3.5"})
+    assert changed == 1
+    first = db.get_point_by_id(ids[0])
+    assert (first.responsible, first.srid, first.latitude, first.version) == ("Dra. Ana Silva", "SIRGAS2000", -3.5, 3)
+    assert db.get_point_by_id(ids[5]).responsible == "Pesquisador Lote"
+    assert len(db.search_points("Silva", field="responsible")) == 4
+
+    with pytest.raises(ValidationError):
+        db.update_points_where({"id": ids}, {"latitude": 95.0})
+    with pytest.raises(ValueError):
+        db.update_points_where({}, {"responsible": "Todos"})
+    with pytest.raises(ValueError):
+        db.update_points_where({"id": ids}, {"id": 1})
+
+    assert db.delete_points([ids[0], ids[2], 999]) == 2
+    assert db.count_points(estimate=False) == 4
+    assert db.get_points_by_ids([ids[0], ids[2]]) == []
@@ -0,0 +1,61 @@
+import pytest
+import os
+import sys
+import csv
+import io
+import json
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from sitai.exporter import iter_csv, iter_geojson, get_exporter, write_chunks
+except ImportError:
+    pytest.skip("Módulo de exportação não encontrado", allow_module_level=True)
+
+COLUMNS = ["id", "point_type", "latitude", "longitude", "altitude", "description"]
+
+
+def _rows(count):
+    """Gera linhas sem materializá-las, como um cursor do banco."""
+    for i in range(1, count + 1):
+        yield (i, "Artefato indígena", -3.0 - i / 100, -60.0, 90.0 + i, f"Peça {i}, com vírgula")
+
+
+def test_iter_csv_streams_in_chunks():
+    """Testa se o CSV é gerado em pedaços e contém todas as linhas."""
+    chunks = list(iter_csv(COLUMNS, _rows(25), chunk_rows=10))
+
+    assert len(chunks) == 3
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+    assert rows[0] == COLUMNS
+    assert len(rows) == 26
+    assert rows[1][5] == "Peça 1, com vírgula"
+
+
+@pytest.mark.parametrize("count", [0, 1, 25])
+def test_iter_geojson_produces_valid_collection(count):
+    """Testa se a FeatureCollection gerada em pedaços é um JSON válido."""
+    document = json.loads("".join(iter_geojson(COLUMNS, _rows(count), chunk_rows=10)))
+
+    assert document["type"] == "FeatureCollection"
+    assert len(document["features"]) == count
+    if count:
+        feature = document["features"][0]
+        assert feature["id"] == 1
+        assert feature["geometry"] == {"type": "Point", "coordinates": [-60.0, -3.01, 91.0]}
+        assert feature["properties"] == {"point_type": "Artefato indígena", "description": "Peça 1, com vírgula"}
+
+
+def test_write_chunks_to_binary_file():
+    """Testa a gravação dos pedaços em um arquivo binário."""
+    target = io.BytesIO()
+    write_chunks(iter_csv(COLUMNS, _rows(3)), target)
+
+    assert target.getvalue().decode("utf-8").startswith("id,point_type")
+
+
+def test_get_exporter_rejects_unknown_format():
+    """Testa a validação do formato de exportação."""
+    with pytest.raises(ValueError):
+        get_exporter("xml")
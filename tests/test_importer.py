@@ -0,0 +1,85 @@
+import pytest
+import os
+import sys
+import csv
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from sitai.importer import import_points, iter_csv_rows
+except ImportError:
+    pytest.skip("Módulo de importação não encontrado", allow_module_level=True)
+
+CSV_CONTENT = """Tipo de Ponto;Latitude;Longitude;Altitude;Descrição;Data da Descoberta;Responsável;SRID
+Artefato indígena;-3,1190;-60,0217;92;Cerâmica com desenhos;25/03/2023;Dr. Ana Silva;WGS84
+Utensílio indígena;-100;-60,0;10;Latitude inválida;25/03/2023;Dr. Carlos Souza;WGS84
+
+Restos mortais;-3,2;-60,1;;Sem altitude;26/03/2023;Dr. Ana Silva;SIRGAS2000
+Armas de caça;-3,3;-60,2;40;"Ponta de flecha; pedra lascada";2023-03-27;Dr. Carlos Souza;WGS84
+"""
+
+
+@pytest.fixture
+def notebook_csv(tmp_path):
+    """Cria uma planilha CSV no formato usado pelos cadernos de campo."""
+    path = tmp_path / "caderno.csv"
+    path.write_text(CSV_CONTENT, encoding="utf-8")
+    return str(path)
+
+
+def test_iter_csv_rows_reports_line_numbers(notebook_csv):
+    """Testa a leitura em fluxo, os aliases de colunas e os números de linha."""
+    rows = list(iter_csv_rows(notebook_csv))
+
+    assert [line for line, _ in rows] == [2, 3, 5, 6]
+    assert rows[0][1]["point_type"] == "Artefato indígena"
+    assert rows[3][1]["description"] == "Ponta de flecha; pedra lascada"
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_import_points_writes_valid_and_reports_rejected(notebook_csv, tmp_path, workers):
+    """Testa a validação, a gravação em lotes e o relatório de erros."""
+    written = []
+    report_path = str(tmp_path / "erros.csv")
+
+    result = import_points(
+        notebook_csv,
+        writer=written.append,
+        error_report=report_path,
+        batch_size=2,
+        workers=workers
+    )
+
+    assert result.total_rows == 4
+    assert result.imported == 2
+    assert result.rejected == 2
+    points = [p for batch in written for p in batch]
+    assert [p.point_type for p in points] == ["Artefato indígena", "Armas de caça"]
+    assert points[0].latitude == -3.1190
+    assert points[0].discovery_date.day == 25
+
+    with open(report_path, newline="", encoding="utf-8") as f:
+        report = list(csv.DictReader(f))
+    assert [r["line"] for r in report] == ["3", "5"]
+    assert "latitude" in report[0]["error"]
+    assert "altitude" in report[1]["error"]
+
+
+def test_import_points_xlsx(tmp_path):
+    """Testa a importação de planilhas XLSX."""
+    openpyxl = pytest.importorskip("openpyxl")
+    path = str(tmp_path / "caderno.xlsx")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["point_type", "latitude", "longitude", "altitude", "description", "responsible"])
+    sheet.append(["Artefato indígena", -3.1, -60.0, 92.0, "Cerâmica", "Dr. Ana Silva"])
+    sheet.append(["Artefato indígena", -3.1, -200.0, 92.0, "Longitude inválida", "Dr. Ana Silva"])
+    workbook.save(path)
+
+    written = []
+    result = import_points(path, writer=written.extend, workers=0)
+
+    assert result.imported == 1
+    assert result.rejected == 1
+    assert written[0].description == "Cerâmica"
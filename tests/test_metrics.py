@@ -0,0 +1,110 @@
+import pytest
+import os
+import sys
+import time
+import urllib.request
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from sitai.metrics import MetricsRegistry, count_rows
+except ImportError:
+    pytest.skip("Módulo de métricas não encontrado", allow_module_level=True)
+
+
+def test_disabled_registry_records_nothing():
+    """Testa se, desativado, o decorador apenas chama a função."""
+    registry = MetricsRegistry()
+
+    @registry.instrument()
+    def lookup(value):
+        return [value]
+
+    assert lookup(3) == [3]
+    assert lookup.__name__ == "lookup"
+    with registry.timer("block"):
+        pass
+    registry.record_error("lookup")
+    assert registry.snapshot() == {}
+
+
+def test_records_latency_rows_and_errors():
+    """Testa o registro de chamadas, linhas retornadas e erros por operação."""
+    registry = MetricsRegistry(enabled=True, buckets=(0.01, 1.0))
+
+    @registry.instrument()
+    def lookup(count):
+        if count < 0:
+            raise ValueError("negativo")
+        return list(range(count))
+
+    @registry.instrument(operation="total", rows=lambda result: result)
+    def total(count):
+        return count
+
+    lookup(2)
+    lookup(3)
+    with pytest.raises(ValueError):
+        lookup(-1)
+    total(7)
+    with registry.timer("reindex") as timing:
+        time.sleep(0.02)
+        timing.rows = 5
+
+    metrics = registry.snapshot()
+    assert (metrics["lookup"].calls, metrics["lookup"].rows, metrics["lookup"].errors) == (3, 5, 1)
+    assert metrics["lookup"].buckets == [3, 0, 0]
+    assert metrics["total"].rows == 7
+    assert metrics["reindex"].buckets == [0, 1, 0] and metrics["reindex"].rows == 5
+
+
+def test_count_rows_by_result_type():
+    """Testa a contagem de linhas para os tipos retornados pelas operações."""
+    class Page:
+        data = [1, 2, 3]
+
+    assert count_rows(None) == 0
+    assert count_rows(False) == 0
+    assert count_rows(True) == 1
+    assert count_rows([1, 2]) == 2
+    assert count_rows(Page()) == 3
+    assert count_rows(42) == 1
+
+
+def test_prometheus_text_format(tmp_path):
+    """Testa o formato de texto do Prometheus, em memória e em arquivo."""
+    registry = MetricsRegistry(enabled=True, buckets=(0.5, 1.0))
+    registry.observe("get_point_by_id", 0.2, rows=1)
+    registry.observe("get_point_by_id", 0.7, rows=1)
+    registry.observe("search_points", 3.0, error=True)
+
+    text = registry.render_prometheus()
+    assert "# TYPE sitai_db_operation_duration_seconds histogram" in text
+    assert 'sitai_db_operation_duration_seconds_bucket{operation="get_point_by_id",le="0.5"} 1' in text
+    assert 'sitai_db_operation_duration_seconds_bucket{operation="get_point_by_id",le="1.0"} 2' in text
+    assert 'sitai_db_operation_duration_seconds_bucket{operation="get_point_by_id",le="+Inf"} 2' in text
+    assert 'sitai_db_operation_duration_seconds_count{operation="search_points"} 1' in text
+    assert 'sitai_db_operation_rows_total{operation="get_point_by_id"} 2' in text
+    assert 'sitai_db_operation_errors_total{operation="search_points"} 1' in text
+
+    path = tmp_path / "sitai.prom"
+    registry.write_prometheus(str(path))
+    assert path.read_text(encoding="utf-8") == text
+    assert os.listdir(tmp_path) == ["sitai.prom"]
+
+
+def test_serves_metrics_over_http():
+    """Testa o servidor HTTP das métricas."""
+    registry = MetricsRegistry(enabled=True)
+    registry.observe("count_points", 0.001, rows=1)
+    server = registry.serve(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode("utf-8")
+            assert response.headers["Content-Type"].startswith("text/plain")
+        assert 'sitai_db_operation_duration_seconds_count{operation="count_points"} 1' in body
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,104 @@
+import pytest
+import os
+import sys
+import sqlite3
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from sitai.migrations import BatchStep, Migration, MigrationRunner, get_schema_version
+except ImportError:
+    pytest.skip("Módulo de migrações não encontrado", allow_module_level=True)
+
+
+@pytest.fixture
+def conn(temp_db_path):
+    """Fornece uma conexão com um banco contendo a tabela de teste."""
+    connection = sqlite3.connect(temp_db_path)
+    connection.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value INTEGER)")
+    connection.executemany("INSERT INTO items (value) VALUES (?)", [(i,) for i in range(1, 26)])
+    connection.commit()
+    yield connection
+    connection.close()
+
+
+def test_applies_migrations_in_order(conn):
+    """Testa a aplicação ordenada das migrações e o registro da versão."""
+    runner = MigrationRunner([
+        Migration(2, "Índice", ["CREATE INDEX idx_items_value ON items (value)"]),
+        Migration(1, "Nova coluna", ["ALTER TABLE items ADD COLUMN label TEXT"]),
+    ])
+
+    assert [m.version for m in runner.pending(conn)] == [1, 2]
+    assert runner.migrate(conn) == 2
+    assert get_schema_version(conn) == 2
+    assert runner.pending(conn) == []
+
+    # Executar novamente não aplica nada
+    assert runner.migrate(conn) == 2
+
+
+def test_migrate_up_to_target(conn):
+    """Testa a migração até uma versão específica."""
+    runner = MigrationRunner([
+        Migration(1, "Coluna a", ["ALTER TABLE items ADD COLUMN a TEXT"]),
+        Migration(2, "Coluna b", ["ALTER TABLE items ADD COLUMN b TEXT"]),
+    ])
+
+    assert runner.migrate(conn, target=1) == 1
+
+
+def test_resumes_interrupted_migration(conn):
+    """Testa se uma migração interrompida continua do passo em que parou."""
+    calls = []
+
+    def flaky_step(connection):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("falha simulada")
+        connection.execute("UPDATE items SET value = value * 10")
+
+    runner = MigrationRunner([
+        Migration(1, "Duas etapas", ["ALTER TABLE items ADD COLUMN label TEXT", flaky_step]),
+    ])
+
+    with pytest.raises(RuntimeError):
+        runner.migrate(conn)
+    assert get_schema_version(conn) == 0
+
+    # O primeiro passo já foi confirmado e não é executado de novo
+    assert runner.migrate(conn) == 1
+    assert conn.execute("SELECT value FROM items WHERE id = 1").fetchone()[0] == 10
+
+
+def test_batch_step_processes_all_rows_in_batches(conn):
+    """Testa a execução em lotes e a retomada a partir do último lote confirmado."""
+    conn.execute("CREATE TABLE copy (id INTEGER PRIMARY KEY, value INTEGER)")
+    conn.commit()
+    batches = []
+
+    def track(start, stop):
+        batches.append((start, stop))
+        if len(batches) == 3:
+            raise sqlite3.OperationalError("falha simulada")
+        return 1
+
+    conn.create_function("track", 2, track)
+    # A subconsulta escalar não correlacionada é avaliada uma vez por lote
+    sql = "INSERT OR REPLACE INTO copy SELECT id, value FROM items WHERE id >= ?1 AND id < ?2 AND (SELECT track(?1, ?2))"
+    runner = MigrationRunner([Migration(1, "Cópia em lotes", [BatchStep("items", sql, batch_size=10)])])
+
+    with pytest.raises(sqlite3.OperationalError):
+        runner.migrate(conn)
+    assert conn.execute("SELECT COUNT(*) FROM copy").fetchone()[0] == 20
+
+    assert runner.migrate(conn) == 1
+    assert batches == [(1, 11), (11, 21), (21, 31), (21, 31)]
+    assert conn.execute("SELECT COUNT(*) FROM copy").fetchone()[0] == 25
+
+
+def test_rejects_duplicate_versions():
+    """Testa a validação das versões das migrações."""
+    with pytest.raises(ValueError):
+        MigrationRunner([Migration(1, "a", []), Migration(1, "b", [])])
@@ -77,3 +77,44 @@ def test_longitude_validation():
             description="Test",
             responsible="Test"
         )
+
+
+def test_validate_points_in_batch():
+    """Testa a validação em lote, com a posição de cada item inválido."""
+    from pydantic import ValidationError
+    from sitai.models import validate_points
+
+    base = {"point_type": "Lítico", "longitude": -60.0, "altitude": 10.0, "description": "Lasca", "responsible": "Ana"}
+    existing = ExcavationPoint(latitude=-3.0, **base)
+    points = validate_points([dict(base, latitude="-3.5"), existing])
+    assert points[0].latitude == -3.5 and points[1] is existing
+
+    with pytest.raises(ValidationError) as info:
+        validate_points([dict(base, latitude=0.0), dict(base, latitude=120.0)])
+    assert [err["loc"][:2] for err in info.value.errors()] == [(1, "latitude")]
+
+
+def test_row_mapper_converts_rows_in_batch():
+    """Testa a conversão em lote de linhas do banco em pontos."""
+    from sitai.models import row_mapper
+
+    columns = ["id", "point_type", "latitude", "longitude", "altitude", "description",
+               "discovery_date", "responsible", "extra"]
+    to_points = row_mapper(columns)
+    points = to_points([
+        (7, "Cabana", -3.1, -60.0, 90.0, "Esteios", "2024-05-01T08:30:00", "Ana", "ignorado"),
+        (8, "Fogueira", -3.2, -60.1, 91.0, "Carvão", "2024-05-02T09:00:00", "Bruno", "ignorado"),
+    ])
+
+    assert points[0] == ExcavationPoint(
+        id=7, point_type="Cabana", latitude=-3.1, longitude=-60.0, altitude=90.0,
+        description="Esteios", discovery_date=datetime(2024, 5, 1, 8, 30), responsible="Ana"
+    )
+    assert [p.id for p in points] == [7, 8]
+    assert points[0].srid == "WGS84"  # valor padrão para a coluna ausente
+    assert points[0].model_fields_set == set(columns) - {"extra"}
+    assert points[0].model_copy(update={"description": "Alterada"}).description == "Alterada"
+    assert to_points([]) == []
+
+    with pytest.raises(ValueError):
+        row_mapper(["id", "point_type"])
@@ -0,0 +1,93 @@
+import pytest
+import os
+import sys
+import sqlite3
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from sitai.search import (
+        backfill_sql, build_match_query, create_search_index, fts5_available,
+        fts_table, search_index_exists, split_terms
+    )
+except ImportError:
+    pytest.skip("Módulo de pesquisa não encontrado", allow_module_level=True)
+
+
+@pytest.fixture
+def conn(temp_db_path):
+    """Fornece uma conexão com uma tabela de pontos simplificada."""
+    connection = sqlite3.connect(temp_db_path)
+    if not fts5_available(connection):
+        connection.close()
+        pytest.skip("SQLite sem suporte a FTS5")
+    connection.execute(
+        "CREATE TABLE points (id INTEGER PRIMARY KEY, point_type TEXT, "
+        "description TEXT, responsible TEXT)"
+    )
+    yield connection
+    connection.close()
+
+
+def _match(conn, expression):
+    rows = conn.execute(
+        f"SELECT rowid FROM {fts_table('points')} WHERE {fts_table('points')} MATCH ? ORDER BY rowid",
+        (expression,)
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def test_split_terms_keeps_quoted_phrases():
+    """Testa a separação de termos preservando trechos entre aspas."""
+    assert split_terms('ponta "de flecha"  pedra') == ["ponta", "de flecha", "pedra"]
+    assert split_terms("   ") == []
+
+
+def test_build_match_query():
+    """Testa a montagem da expressão MATCH com prefixos e colunas."""
+    assert build_match_query("cer frag") == '"cer"* "frag"*'
+    assert build_match_query("") is None
+    assert build_match_query("Ana", ["responsible"]) == '{responsible} : ("Ana"*)'
+
+    with pytest.raises(ValueError):
+        build_match_query("10", ["latitude"])
+
+
+def test_triggers_keep_index_in_sync(conn):
+    """Testa a sincronização do índice em inserções, alterações e exclusões."""
+    assert create_search_index(conn, "points") is True
+    assert search_index_exists(conn, "points")
+
+    conn.execute("INSERT INTO points VALUES (1, 'Cerâmica', 'Fragmento decorado', 'Ana')")
+    conn.execute("INSERT INTO points VALUES (2, 'Lítico', 'Ponta de flecha', 'Bruno')")
+    assert _match(conn, build_match_query("ceramica")) == [1]
+
+    conn.execute("UPDATE points SET point_type = 'Lítico lascado' WHERE id = 1")
+    assert _match(conn, build_match_query("ceramica")) == []
+    assert _match(conn, build_match_query("lit")) == [1, 2]
+
+    conn.execute("DELETE FROM points WHERE id = 2")
+    assert _match(conn, build_match_query("lit")) == [1]
+
+
+def test_backfill_is_idempotent(conn):
+    """Testa o preenchimento em lotes de linhas anteriores ao índice."""
+    conn.executemany(
+        "INSERT INTO points VALUES (?, 'Cerâmica', ?, 'Ana')",
+        [(i, f"Fragmento {i}") for i in range(1, 11)]
+    )
+    create_search_index(conn, "points")
+
+    conn.execute(backfill_sql("points"), (1, 6))
+    conn.execute(backfill_sql("points"), (1, 11))
+    assert _match(conn, build_match_query("ana")) == list(range(1, 11))
+    assert conn.execute(f"SELECT COUNT(*) FROM {fts_table('points')}").fetchone()[0] == 10
+
+
+def test_match_query_neutralizes_fts_syntax(conn):
+    """Testa se operadores do FTS5 digitados pelo usuário são tratados como texto."""
+    create_search_index(conn, "points")
+    conn.execute("INSERT INTO points VALUES (1, 'Cerâmica', 'Vaso OR tigela (inteiro)', 'Ana')")
+
+    assert _match(conn, build_match_query("OR (inteiro")) == [1]
@@ -0,0 +1,105 @@
+import pytest
+import os
+import sys
+import json
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from sitai.connection import ConnectionManager
+    from sitai.slowlog import SlowQueryTracer, parameter_shape, read_slow_log, summarize_slow_log
+except ImportError:
+    pytest.skip("Módulo de consultas lentas não encontrado", allow_module_level=True)
+
+
+def _entries(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def traced(tmp_path):
+    """Gerenciador de conexões cujas conexões gravam todos os comandos (limite 0)."""
+    tracer = SlowQueryTracer(str(tmp_path / "logs" / "lentas.log"), threshold_ms=0)
+    pool = ConnectionManager(factory=tracer.connection_factory())
+    with pool.connection(str(tmp_path / "x.db")) as conn:
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, nome TEXT)")
+    yield pool, tracer, str(tmp_path / "x.db")
+    pool.close_all()
+    tracer.close()
+
+
+def test_parameter_shape_hides_values():
+    """Testa se o formato dos parâmetros registra tipos e tamanhos, sem os valores."""
+    assert parameter_shape(("Dr. Ana", 1.5, None, 3)) == ["str[7]", "float", "null", "int"]
+    assert parameter_shape({"nome": b"abc"}) == {"nome": "bytes[3]"}
+    assert parameter_shape(()) == []
+
+
+def test_records_statements_with_plan(traced):
+    """Testa o registro dos comandos, com linhas lidas, parâmetros e plano."""
+    pool, tracer, path = traced
+    with pool.connection(path) as conn:
+        conn.executemany("INSERT INTO t (nome) VALUES (?)", [("Ana",), ("Bruno",), ("Carla",)])
+        assert conn.execute("SELECT nome FROM t WHERE id = ?", (2,)).fetchone() == ("Bruno",)
+        assert len(conn.execute("SELECT * FROM t WHERE nome LIKE ?", ("%r%",)).fetchall()) == 2
+        assert [row[0] for row in conn.execute("SELECT id FROM t ORDER BY id")] == [1, 2, 3]
+
+    entries = {e["sql"]: e for e in _entries(tracer.path)}
+    insert = entries["INSERT INTO t (nome) VALUES (?)"]
+    assert insert["many"] == 3 and insert["params"] == ["str[3]"]
+
+    lookup = entries["SELECT nome FROM t WHERE id = ?"]
+    assert lookup["rows"] == 1 and lookup["params"] == ["int"]
+    assert any("INTEGER PRIMARY KEY" in line for line in lookup["plan"])
+    assert entries["SELECT * FROM t WHERE nome LIKE ?"]["rows"] == 2
+    assert entries["SELECT id FROM t ORDER BY id"]["rows"] == 3
+    assert "Bruno" not in open(tracer.path, encoding="utf-8").read()
+
+
+def test_skips_fast_statements_and_records_errors(tmp_path):
+    """Testa o limite de duração e o registro de comandos que falham."""
+    tracer = SlowQueryTracer(str(tmp_path / "lentas.log"), threshold_ms=60_000)
+    pool = ConnectionManager(factory=tracer.connection_factory())
+    try:
+        with pool.connection(str(tmp_path / "x.db")) as conn:
+            conn.execute("SELECT 1").fetchone()
+        assert not os.path.exists(tracer.path)
+
+        tracer.threshold_s = 0
+        with pytest.raises(Exception):
+            with pool.connection(str(tmp_path / "x.db")) as conn:
+                conn.execute("SELECT * FROM inexistente")
+        failed = [e for e in _entries(tracer.path) if e["sql"] == "SELECT * FROM inexistente"]
+        assert "no such table" in failed[0]["error"]
+    finally:
+        pool.close_all()
+        tracer.close()
+
+
+def test_rotation_and_report(tmp_path):
+    """Testa a rotação do log e o resumo dos piores comandos."""
+    path = str(tmp_path / "lentas.log")
+    tracer = SlowQueryTracer(path, threshold_ms=0, max_bytes=400, backup_count=20)
+    pool = ConnectionManager(factory=tracer.connection_factory())
+    try:
+        with pool.connection(str(tmp_path / "x.db")) as conn:
+            for i in range(20):
+                conn.execute("SELECT ? + 1", (i,)).fetchone()
+            conn.execute("SELECT 'lenta'").fetchone()
+    finally:
+        pool.close_all()
+        tracer.close()
+
+    assert os.path.exists(path + ".1")
+    entries = list(read_slow_log(path))
+    assert entries[-1]["sql"] == "SELECT 'lenta'"
+
+    entries.append({"sql": "SELECT 'lenta'", "elapsed_ms": 900.0, "rows": 1, "params": [], "plan": ["SCAN"]})
+    by_max = summarize_slow_log(entries, sort="max")
+    assert by_max[0].sql == "SELECT 'lenta'" and by_max[0].plan == ["SCAN"]
+    by_count = summarize_slow_log(entries, sort="count")
+    assert by_count[0].sql == "SELECT ? + 1"
+    with pytest.raises(ValueError):
+        summarize_slow_log(entries, sort="rows")
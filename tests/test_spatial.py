@@ -0,0 +1,106 @@
+import pytest
+import os
+import sys
+import sqlite3
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from sitai.spatial import (
+        bbox_condition, create_spatial_index, haversine_distances, radius_bbox,
+        rtree_available, rtree_table, spatial_backfill_sql, spatial_index_exists, validate_bbox
+    )
+    import numpy as np
+except ImportError:
+    pytest.skip("Módulo espacial não encontrado", allow_module_level=True)
+
+
+@pytest.fixture
+def conn(temp_db_path):
+    """Fornece uma conexão com uma tabela de pontos simplificada."""
+    connection = sqlite3.connect(temp_db_path)
+    if not rtree_available(connection):
+        connection.close()
+        pytest.skip("SQLite sem suporte a R*Tree")
+    connection.execute("CREATE TABLE points (id INTEGER PRIMARY KEY, latitude REAL, longitude REAL)")
+    yield connection
+    connection.close()
+
+
+def _in_bbox(conn, bbox, use_index=True):
+    condition, params = bbox_condition("points", validate_bbox(*bbox), use_index=use_index)
+    rows = conn.execute(f"SELECT id FROM points WHERE {condition} ORDER BY id", params).fetchall()
+    return [r[0] for r in rows]
+
+
+def test_validate_bbox():
+    """Testa a validação dos limites do retângulo."""
+    assert validate_bbox(-4, -61, -3, -60) == (-4.0, -61.0, -3.0, -60.0)
+
+    with pytest.raises(ValueError):
+        validate_bbox(-3, -61, -4, -60)
+    with pytest.raises(ValueError):
+        validate_bbox(-4, -181, -3, -60)
+
+
+def test_triggers_keep_index_in_sync(conn):
+    """Testa a sincronização do índice em inserções, alterações e exclusões."""
+    assert create_spatial_index(conn, "points") is True
+    assert spatial_index_exists(conn, "points")
+
+    conn.executemany("INSERT INTO points VALUES (?, ?, ?)", [(1, -3.1, -60.0), (2, -3.5, -60.5), (3, 2.0, -55.0)])
+    assert _in_bbox(conn, (-4, -61, -3, -60)) == [1, 2]
+
+    conn.execute("UPDATE points SET latitude = 1.9 WHERE id = 2")
+    assert _in_bbox(conn, (-4, -61, -3, -60)) == [1]
+
+    conn.execute("DELETE FROM points WHERE id = 1")
+    assert _in_bbox(conn, (-4, -61, -3, -60)) == []
+    assert conn.execute(f"SELECT COUNT(*) FROM {rtree_table('points')}").fetchone()[0] == 2
+
+
+def test_bbox_is_exact_at_boundaries(conn):
+    """Testa se o arredondamento do R*Tree não altera o resultado nos limites."""
+    conn.executemany(
+        "INSERT INTO points VALUES (?, ?, ?)",
+        [(1, -3.1190001, -60.0217), (2, -3.1190000, -60.0217), (3, -3.1189999, -60.0217)]
+    )
+    create_spatial_index(conn, "points")
+    conn.execute(spatial_backfill_sql("points"), (1, 4))
+
+    bbox = (-3.1190000, -60.1, -3.0, -60.0)
+    assert _in_bbox(conn, bbox) == _in_bbox(conn, bbox, use_index=False) == [2, 3]
+
+
+def test_haversine_distances():
+    """Testa o cálculo vetorizado de distâncias."""
+    distances = haversine_distances(0.0, 0.0, [0.0, 1.0, 0.0], [0.0, 0.0, 180.0])
+    assert distances[0] == 0
+    assert distances[1] == pytest.approx(111195, rel=1e-4)
+    assert distances[2] == pytest.approx(np.pi * 6371008.8)
+
+
+@pytest.mark.parametrize("lat, lon, meters", [
+    (-3.1, -60.0, 200.0),
+    (-3.1, -60.0, 50000.0),
+    (60.0, 10.0, 300000.0),
+    (89.9, 0.0, 20000.0),
+    (0.0, 179.99, 5000.0),
+])
+def test_radius_bbox_contains_circle(lat, lon, meters):
+    """Testa se o retângulo contém todos os pontos da borda do círculo."""
+    min_lat, min_lon, max_lat, max_lon = radius_bbox(lat, lon, meters)
+
+    # Pontos na borda do círculo, calculados pelo destino geodésico
+    delta = meters / 6371008.8
+    bearings = np.radians(np.arange(0, 360, 0.5))
+    phi, lam = np.radians(lat), np.radians(lon)
+    phis = np.arcsin(np.sin(phi) * np.cos(delta) + np.cos(phi) * np.sin(delta) * np.cos(bearings))
+    lams = lam + np.arctan2(np.sin(bearings) * np.sin(delta) * np.cos(phi), np.cos(delta) - np.sin(phi) * np.sin(phis))
+    lats = np.degrees(phis)
+    lons = (np.degrees(lams) + 180) % 360 - 180
+
+    eps = 1e-9
+    assert np.all((lats >= min_lat - eps) & (lats <= max_lat + eps))
+    assert np.all((lons >= min_lon - eps) & (lons <= max_lon + eps))
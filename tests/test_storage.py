@@ -0,0 +1,81 @@
+import pytest
+import os
+import sys
+import sqlite3
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from sitai.storage import StorageProfile, retry_on_busy, is_busy_error
+except ImportError:
+    pytest.skip("Módulo de armazenamento não encontrado", allow_module_level=True)
+
+
+def test_profile_rejects_invalid_values():
+    """Testa a validação dos valores do perfil de armazenamento."""
+    with pytest.raises(ValueError):
+        StorageProfile(journal_mode="INVALIDO")
+
+    with pytest.raises(ValueError):
+        StorageProfile(synchronous="RAPIDO")
+
+
+def test_profile_applies_wal(temp_db_path):
+    """Testa se o perfil padrão ativa o modo WAL e as configurações da conexão."""
+    conn = sqlite3.connect(temp_db_path)
+    mode = StorageProfile(busy_timeout_ms=1234).apply(conn)
+
+    assert mode.upper() == "WAL"
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 1234
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    conn.close()
+
+
+def test_reader_runs_during_write_transaction(temp_db_path):
+    """Testa se um leitor não é bloqueado por uma transação de escrita aberta."""
+    writer = sqlite3.connect(temp_db_path)
+    StorageProfile().apply(writer)
+    writer.execute("CREATE TABLE t (v INTEGER)")
+    writer.execute("INSERT INTO t VALUES (1)")
+    writer.commit()
+
+    writer.execute("INSERT INTO t VALUES (2)")  # transação mantida aberta
+
+    reader = sqlite3.connect(temp_db_path, timeout=0)
+    assert reader.execute("SELECT v FROM t").fetchall() == [(1,)]
+
+    writer.commit()
+    reader.close()
+    writer.close()
+
+
+def test_retry_on_busy_retries_until_success():
+    """Testa se operações com SQLITE_BUSY são repetidas."""
+    calls = []
+
+    @retry_on_busy(attempts=3, base_delay=0.001)
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise sqlite3.OperationalError("database is locked")
+        return "ok"
+
+    assert flaky() == "ok"
+    assert len(calls) == 3
+
+
+def test_retry_on_busy_gives_up_and_ignores_other_errors():
+    """Testa o limite de tentativas e a propagação de outros erros."""
+    calls = []
+
+    @retry_on_busy(attempts=2, base_delay=0.001)
+    def always_busy():
+        calls.append(1)
+        raise sqlite3.OperationalError("database is locked")
+
+    with pytest.raises(sqlite3.OperationalError):
+        always_busy()
+    assert len(calls) == 2
+
+    assert not is_busy_error(sqlite3.OperationalError("no such table: t"))
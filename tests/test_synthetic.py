@@ -0,0 +1,65 @@
+import pytest
+import os
+import sys
+from collections import Counter
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from sitai.synthetic import CUSTOM_POINT_TYPES, POINT_TYPES, CatalogueGenerator, make_responsibles
+    from sitai.models import ExcavationPoint
+except ImportError:
+    pytest.skip("Gerador sintético não encontrado", allow_module_level=True)
+
+
+def test_same_seed_same_rows():
+    """Testa se a mesma semente produz as mesmas linhas."""
+    first = list(CatalogueGenerator(seed=7, site_count=50).iter_rows(500))
+    second = list(CatalogueGenerator(seed=7, site_count=50).iter_rows(500))
+    other = list(CatalogueGenerator(seed=8, site_count=50).iter_rows(500))
+    assert first == second
+    assert first != other
+
+
+def test_rows_are_valid_points():
+    """Testa se as linhas geradas passam pela validação do modelo."""
+    generator = CatalogueGenerator(seed=1, site_count=100)
+    points = list(generator.iter_points(2000))
+    assert len(points) == 2000
+    assert all(isinstance(p, ExcavationPoint) for p in points)
+
+    # Coordenadas na bacia amazônica
+    assert all(-15.5 <= p.latitude <= 5.5 and -75.5 <= p.longitude <= -43.5 for p in points)
+    assert {p.srid for p in points} <= {"WGS84", "SIRGAS2000", "SAD69"}
+    assert {p.point_type for p in points} <= {name for name, _ in POINT_TYPES} | set(CUSTOM_POINT_TYPES)
+
+
+def test_distributions_are_skewed():
+    """Testa o agrupamento em sítios e a concentração em datas recentes."""
+    generator = CatalogueGenerator(seed=3, site_count=200)
+    rows = list(generator.iter_rows(20000))
+
+    types = Counter(r[0] for r in rows)
+    assert types.most_common(1)[0][0] == "Artefato indígena"
+
+    years = [int(r[5][:4]) for r in rows]
+    recent = sum(1 for y in years if y >= 2010)
+    assert recent > len(years) / 2
+
+    # Muitos pontos compartilham coordenadas próximas (mesmo sítio)
+    cells = Counter((round(r[1], 1), round(r[2], 1)) for r in rows)
+    assert cells.most_common(1)[0][1] > 20000 / len(cells) * 5
+
+    lengths = {len(r[4]) for r in rows}
+    assert min(lengths) < 40 and max(lengths) > 200
+
+
+def test_make_responsibles_distinct():
+    """Testa a geração de nomes distintos de responsáveis."""
+    import numpy as np
+
+    names = make_responsibles(200, np.random.default_rng(0))
+    assert len(set(names)) == 200
+    with pytest.raises(ValueError):
+        make_responsibles(10 ** 6, np.random.default_rng(0))
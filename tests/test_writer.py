@@ -0,0 +1,122 @@
+import pytest
+import os
+import sys
+import sqlite3
+import functools
+import threading
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from sitai.aio import ExecutorClosedError
+    from sitai.connection import ConnectionManager
+    from sitai.metrics import MetricsRegistry
+    from sitai.writer import GroupCommitWriter
+except ImportError:
+    pytest.skip("Módulo da fila de escrita não encontrado", allow_module_level=True)
+
+
+def _insert(name, conn):
+    return conn.execute("INSERT INTO t (nome) VALUES (?)", (name,)).lastrowid
+
+
+@pytest.fixture
+def pool_and_path(tmp_path):
+    """Gerenciador de conexões e banco com uma tabela de nomes únicos."""
+    pool = ConnectionManager()
+    path = str(tmp_path / "x.db")
+    with pool.connection(path) as conn:
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, nome TEXT UNIQUE)")
+    yield pool, path
+    pool.close_all()
+
+
+def test_coalesces_concurrent_requests(pool_and_path):
+    """Testa se os pedidos de várias threads são gravados em poucos lotes, cada um com o próprio ID."""
+    pool, path = pool_and_path
+    commits = []
+    metrics = MetricsRegistry(enabled=True)
+    writer = GroupCommitWriter(
+        lambda: pool.connection(path), window_ms=50, max_batch=64, on_commit=commits.append, metrics=metrics
+    )
+    start = threading.Barrier(8)
+    futures = {}
+
+    def client(index):
+        start.wait()
+        for j in range(10):
+            name = f"{index}-{j}"
+            futures[name] = writer.submit(functools.partial(_insert, name))
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.shutdown()
+
+    with pool.connection(path) as conn:
+        stored = dict(conn.execute("SELECT nome, id FROM t"))
+    assert {name: f.result() for name, f in futures.items()} == stored
+    stats = writer.stats()
+    assert stats.requests == 80 and stats.errors == 0
+    assert stats.batches < 80 and stats.largest_batch <= 64
+    assert sum(commits) == 80
+    assert metrics.snapshot()["group_commit"].rows == 80
+
+
+def test_failed_request_does_not_affect_batch(pool_and_path):
+    """Testa se um pedido com erro é desfeito sozinho e recebe a própria exceção."""
+    pool, path = pool_and_path
+    with GroupCommitWriter(lambda: pool.connection(path), window_ms=100) as writer:
+        first = writer.submit(functools.partial(_insert, "Ana"))
+        duplicate = writer.submit(functools.partial(_insert, "Ana"))
+        partial = writer.submit(lambda conn: (_insert("Bruno", conn), 1 / 0))
+        last = writer.submit(functools.partial(_insert, "Carla"))
+
+    with pytest.raises(Exception, match="UNIQUE"):
+        duplicate.result()
+    with pytest.raises(ZeroDivisionError):
+        partial.result()
+    with pool.connection(path) as conn:
+        assert [r[0] for r in conn.execute("SELECT nome FROM t ORDER BY id")] == ["Ana", "Carla"]
+    assert (first.result(), last.result()) == (1, 2)
+    assert writer.stats().batches == 1 and writer.stats().errors == 2
+
+
+def test_failed_commit_fails_every_request(tmp_path):
+    """Testa se, quando a confirmação falha, todos os pedidos do lote recebem o erro."""
+    pool = ConnectionManager(on_connect=lambda conn: conn.execute("PRAGMA foreign_keys = ON"))
+    path = str(tmp_path / "x.db")
+    try:
+        with pool.connection(path) as conn:
+            conn.execute(
+                "CREATE TABLE t (id INTEGER PRIMARY KEY, nome TEXT, "
+                "pai INTEGER REFERENCES t (id) DEFERRABLE INITIALLY DEFERRED)"
+            )
+        writer = GroupCommitWriter(lambda: pool.connection(path), window_ms=100)
+        ok = writer.submit(functools.partial(_insert, "Ana"))
+        # A chave estrangeira adiada só é verificada na confirmação
+        orphan = writer.submit(lambda conn: conn.execute("INSERT INTO t (nome, pai) VALUES ('Bruno', 99)").lastrowid)
+        writer.shutdown()
+        for future in (ok, orphan):
+            with pytest.raises(sqlite3.IntegrityError, match="FOREIGN KEY"):
+                future.result()
+        assert writer.stats().errors == 2 and writer.stats().batches == 0
+        with pool.connection(path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    finally:
+        pool.close_all()
+
+
+def test_shutdown_and_validation(pool_and_path):
+    """Testa o encerramento da fila e a validação dos parâmetros."""
+    pool, path = pool_and_path
+    writer = GroupCommitWriter(lambda: pool.connection(path))
+    writer.shutdown()
+    writer.shutdown()
+    with pytest.raises(ExecutorClosedError):
+        writer.submit(functools.partial(_insert, "Ana"))
+    with pytest.raises(ValueError):
+        GroupCommitWriter(lambda: pool.connection(path), max_batch=0)